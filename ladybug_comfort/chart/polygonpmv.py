@@ -21,6 +21,11 @@ from ladybug_geometry.geometry2d.line import LineSegment2D
 from ladybug_geometry.geometry2d.polyline import Polyline2D
 from ladybug_geometry.intersection2d import intersect_line2d_infinite
 
+try:  # use the batched NumPy solver when NumPy is available
+    from ..map.pmv import calc_missing_pmv_input_np
+except ImportError:  # IronPython or an environment without NumPy
+    calc_missing_pmv_input_np = None
+
 
 class PolygonPMV(object):
     """Object to plot a PMV comfort polygon on a Psychrometric Chart.
@@ -106,8 +111,11 @@ class PolygonPMV(object):
 
         # create the left and right polylines
         _left, _right = [], []
-        for p in range(self._polygon_count):
-            min_poly, max_poly = self.comfort_polylines(p)
+        rel_humids = (0, 20, 40, 60, 80, 100)
+        all_air_temps = self._all_max_min_air_temperatures(rel_humids)
+        for air_temps in all_air_temps:
+            min_poly, max_poly = self._air_temperatures_to_polylines(
+                air_temps, rel_humids)
             _left.append(min_poly)
             _right.append(max_poly)
         self._left_comfort_lines, self._right_comfort_lines = tuple(_left), tuple(_right)
@@ -843,10 +851,14 @@ class PolygonPMV(object):
         Returns:
             The left and right Polyline2D that define the comfort range.
         """
-        # get the air temperature and humidity rations
         rel_humids = (0, 20, 40, 60, 80, 100)
-        pres = self.psychrometric_chart.average_pressure
         air_temps = self.max_min_air_temperatures(polygon_index, rel_humids)
+        return self._air_temperatures_to_polylines(air_temps, rel_humids)
+
+    def _air_temperatures_to_polylines(self, air_temps, rel_humids):
+        """Get the left and right Polyline2D from max and min air temperatures."""
+        # get the air temperature and humidity rations
+        pres = self.psychrometric_chart.average_pressure
         humid_ratios = []
         for i, temp in enumerate(air_temps):
             hr_min = humid_ratio_from_db_rh(temp[0], rel_humids[i], pres)
@@ -972,6 +984,42 @@ class PolygonPMV(object):
                 comfort_vals.append(0)
         return tuple(comfort_vals)
 
+    def _all_max_min_air_temperatures(self, rel_humid):
+        """Get the max and min air temperatures for all comfort polygons at once.
+
+        When NumPy is available, the temperatures of all polygons are solved
+        together with the NumPy PMV model, which is much faster than calling
+        max_min_air_temperatures for each polygon when there are many polygons.
+        """
+        if calc_missing_pmv_input_np is None:  # IronPython or no NumPy
+            return [self.max_min_air_temperatures(p, rel_humid)
+                    for p in range(self._polygon_count)]
+
+        # get the PPD thresholds and the relative humidity of each PMV target
+        sat = self._comfort_par.still_air_threshold
+        pmv_min, pmv_max = pmv_from_ppd(self._comfort_par.ppd_comfort_thresh) if \
+            self._comfort_par.ppd_comfort_thresh != 10 else (-0.5, 0.5)
+        rh_count = len(rel_humid)
+        target_pmv = [pmv_min] * rh_count + [pmv_max] * rh_count
+
+        # solve polygons with and without a radiant temperature in separate batches
+        air_temperatures = [None] * self._polygon_count
+        for has_tr in (False, True):
+            polygons = [p for p in range(self._polygon_count)
+                        if (self._rad_temperature[p] is not None) is has_tr]
+            if len(polygons) == 0:
+                continue
+            pmv_dicts = [self._pmv_dict(p) for p in polygons]
+            pmv_inputs = {'rh': list(rel_humid) * 2}
+            for key in ('ta', 'tr', 'vel', 'met', 'clo', 'wme'):
+                vals = [[pmv_dict[key]] for pmv_dict in pmv_dicts]
+                pmv_inputs[key] = None if vals[0][0] is None else vals
+            air_temps = calc_missing_pmv_input_np(
+                target_pmv, pmv_inputs, still_air_threshold=sat)['ta']
+            for p, temps in zip(polygons, air_temps.tolist()):
+                air_temperatures[p] = list(zip(temps[:rh_count], temps[rh_count:]))
+        return air_temperatures
+
     def _pmv_dict(self, polygon_index):
         """Get a PMV dictionary for on set of inputs."""
         return {'ta': None,
@@ -10,11 +10,20 @@ from ladybug.analysisperiod import AnalysisPeriod
 from ladybug.header import Header
 from ladybug.datacollection import HourlyContinuousCollection
 from ladybug.futil import preparedir
+from ladybug.datatype.temperature import OperativeTemperature, \
+    StandardEffectiveTemperature, UniversalThermalClimateIndex, \
+    PhysiologicalEquivalentTemperature
+from ladybug.datatype.thermalcondition import PredictedMeanVote, \
+    ThermalCondition, ThermalConditionElevenPoint, ThermalConditionNinePoint
+from ladybug.datatype.temperaturedelta import OperativeTemperatureDelta
 
 from ladybug_comfort.parameter.pmv import PMVParameter
 from ladybug_comfort.parameter.adaptive import AdaptiveParameter
 from ladybug_comfort.parameter.utci import UTCIParameter
+from ladybug_comfort.parameter.pet import PETParameter
 from ladybug_comfort.parameter.solarcal import SolarCalParameter
+from ladybug_comfort.map._output import ThermalMapWriter, write_text_matrix
+from ladybug_comfort.map._parallel import run_sensor_chunks, chunk_output_specs
 
 
 def load_data(values, base_data, data_type, data_units):
@@ -124,6 +133,18 @@ def load_utci_par_str(comfort_par_str):
     return UTCIParameter()
 
 
+def load_pet_par_str(comfort_par_str):
+    """Load a PETParameter from a string.
+
+    Args:
+        comfort_par_str: A string of a PETParameter to be loaded.
+    """
+    if comfort_par_str is not None and comfort_par_str != '' \
+            and comfort_par_str != 'None':
+        return PETParameter.from_string(comfort_par_str)
+    return PETParameter()
+
+
 def load_solarcal_par_str(solarcal_par_str):
     """Load a SolarCalParameter from a string.
 
@@ -147,43 +168,188 @@ def csv_to_num_matrix(csv_file_path):
         )
 
 
-def _data_to_csv(data, csv_path):
-    """Write a list of data collections into a CSV file."""
-    with open(csv_path, 'w') as csv_file:
-        for dat in data:
-            str_data = (str(v) for v in dat)
-            csv_file.write(','.join(str_data) + '\n')
+def thermal_map_headers(comfort_model, run_period=None, qualifier=()):
+    """Get the Headers of the temperature, condition and intensity of a thermal map.
 
+    Args:
+        comfort_model: Text for the comfort model of the thermal map.
+            Choose from: pmv, adaptive, utci, pet.
+        run_period: The AnalysisPeriod of the thermal map. If None, it will be
+            assumed that the results are for a full year. (Default: None).
+        qualifier: A list of text for any options used on the comfort map
+            simulation that change the output data type of results (eg. the
+            write-set-map text of the pmv map for SET). (Default: ()).
 
-def _data_to_ill(data, ill_path):
-    """Write a list of data collections into an ill file."""
-    with open(ill_path, 'w') as ill_file:
-        for dat in data:
-            str_data = ('{:.7e}'.format(v) for v in dat)
-            ill_file.write(' '.join(str_data) + '\n')
+    Returns:
+        A dictionary with a Header for each of the temperature, condition
+        and condition_intensity.
+    """
+    run_period = run_period if run_period is not None else AnalysisPeriod()
+    comfort_model = comfort_model.lower()
+    cond, cond_units = ThermalCondition(), 'condition'
+    if comfort_model == 'pmv':
+        temp, temp_units = OperativeTemperature(), 'C'
+        if 'write-set-map' in qualifier:
+            temp = StandardEffectiveTemperature()
+        cond_i, cond_i_units = PredictedMeanVote(), 'PMV'
+    elif comfort_model == 'adaptive':
+        temp, temp_units = OperativeTemperature(), 'C'
+        cond_i, cond_i_units = OperativeTemperatureDelta(), 'dC'
+    elif comfort_model == 'utci':
+        temp, temp_units = UniversalThermalClimateIndex(), 'C'
+        cond_i, cond_i_units = ThermalConditionElevenPoint(), 'condition'
+    elif comfort_model == 'pet':
+        temp, temp_units = PhysiologicalEquivalentTemperature(), 'C'
+        cond_i, cond_i_units = ThermalConditionNinePoint(), 'condition'
+    else:
+        raise ValueError(
+            'Comfort model "{}" not recognized. Choose from: {}.'.format(
+                comfort_model, ('pmv', 'adaptive', 'utci', 'pet')))
+    return {
+        'temperature': Header(temp, temp_units, run_period),
+        'condition': Header(cond, cond_units, run_period),
+        'condition_intensity': Header(cond_i, cond_i_units, run_period)
+    }
+
+
+def thermal_map_metadata(comfort_model, run_period=None, qualifier=(), grid=None):
+    """Get the metadata of each binary file of a thermal map.
+
+    Args:
+        comfort_model: Text for the comfort model of the thermal map.
+            Choose from: pmv, adaptive, utci, pet.
+        run_period: The AnalysisPeriod of the thermal map. If None, it will be
+            assumed that the results are for a full year. (Default: None).
+        qualifier: A list of text for any options used on the comfort map
+            simulation that change the output data type of results. (Default: ()).
+        grid: Optional text for the identifier of the sensor grid. (Default: None).
+
+    Returns:
+        A dictionary with the metadata of each of the temperature, condition
+        and condition_intensity, which includes the dictionary of the Header
+        of the results and the identifier of the sensor grid.
+    """
+    headers = thermal_map_headers(comfort_model, run_period, qualifier)
+    metadata = {}
+    for output, header in headers.items():
+        metadata[output] = {'header': header.to_dict()}
+        if grid is not None:
+            metadata[output]['grid'] = grid
+    return metadata
+
+
+def grid_id(file_path):
+    """Get the identifier of a sensor grid from the path to one of its files.
+
+    Args:
+        file_path: Path to a file of a sensor grid that is named with the
+            identifier of the grid (eg. the enclosure info JSON of the grid).
+    """
+    return os.path.splitext(os.path.basename(file_path))[0]
 
 
 def thermal_map_csv(folder, temperature, condition, condition_intensity,
-                    plain_text=True):
-    """Write out the thermal mapping CSV files associated with every comfort map."""
+                    plain_text=True, metadata=None, precision=None):
+    """Write out the thermal mapping CSV files associated with every comfort map.
+
+    When plain_text is True, the precision can be used to set the number of
+    decimal places of the temperature and condition_intensity values, which is
+    much faster to write than the default shortest text of each value.
+    When plain_text is False, the results are written in blocks of sensors to
+    .npy files with the smallest possible dtype and a JSON file of metadata is
+    written next to each of them. The metadata is a dictionary with the metadata
+    of each output under the temperature, condition and condition_intensity keys
+    (eg. from the thermal_map_metadata function).
+    """
+    result_file_dict = _thermal_map_files(folder)
+    if plain_text:
+        write_text_matrix(temperature, result_file_dict['temperature'],
+                          precision=precision)
+        write_text_matrix(condition, result_file_dict['condition'])
+        write_text_matrix(condition_intensity, result_file_dict['condition_intensity'],
+                          precision=precision)
+    else:
+        metadata = {} if metadata is None else metadata
+        results = (temperature, condition, condition_intensity)
+        for (output, npy_path), data in zip(result_file_dict.items(), results):
+            _data_to_npy(data, npy_path, metadata.get(output))
+    return result_file_dict
+
+
+def run_thermal_map(folder, function, arrays, args=(), workers=1, chunk_size=None,
+                    plain_text=True, metadata=None, precision=None):
+    """Evaluate a thermal map over chunks of sensors and write out its files.
+
+    When plain_text is False, the .npy files are preallocated before the map
+    is evaluated and each chunk of sensors is written straight into the files
+    as it is computed. Since the dtype of the files must be known before
+    the results, floating point results are written as float32 and integer
+    results (eg. conditions) are written as int8.
+
+    Args:
+        folder: The folder into which the files of the thermal map will be written.
+        function: A function that returns the temperature, condition and
+            condition_intensity for a chunk of sensors (eg. utci_mtx_chunk).
+        arrays: A list of (sensors x time) NumPy arrays to be passed to the function.
+        args: A tuple of additional arguments to be passed to the function.
+        workers: An integer for the number of processes over which the chunks
+            will be evaluated. (Default: 1).
+        chunk_size: An integer for the number of sensors in each chunk. (Default:
+            None).
+        plain_text: Boolean to note whether the files should be plain text
+            CSVs or binary .npy files. (Default: True).
+        metadata: A dictionary with the metadata of each output of a binary
+            thermal map (eg. from the thermal_map_metadata function). (Default: None).
+        precision: An optional integer for the number of decimal places of
+            the plain text files. (Default: None).
+
+    Returns:
+        A dictionary with the path to the file of each output of the thermal map.
+    """
+    if plain_text:
+        temperature, condition, condition_intensity = run_sensor_chunks(
+            function, arrays, args, workers, chunk_size)
+        return thermal_map_csv(folder, temperature, condition, condition_intensity,
+                               precision=precision)
+
+    result_file_dict = _thermal_map_files(folder)
+    metadata = {} if metadata is None else metadata
+    out_specs = chunk_output_specs(function, arrays, args)
+    writers = []
+    try:
+        for (output, npy_path), (dtype, shape) in \
+                zip(result_file_dict.items(), out_specs):
+            dtype = np.int8 if np.issubdtype(dtype, np.integer) else np.float32
+            writers.append(
+                ThermalMapWriter(npy_path, shape, dtype, metadata.get(output)))
+        run_sensor_chunks(function, arrays, args, workers, chunk_size,
+                          out=tuple(writer.array for writer in writers))
+        for writer in writers:
+            writer.sensors_written = writer.shape[0]
+    finally:
+        for writer in writers:
+            writer.close()
+    return result_file_dict
+
+
+def _thermal_map_files(folder):
+    """Get a dictionary with the path to each file of a thermal map in a folder."""
     preparedir(folder, remove_content=False)
-    result_file_dict = {
+    return {
         'temperature': os.path.join(folder, 'temperature.csv'),
         'condition': os.path.join(folder, 'condition.csv'),
         'condition_intensity': os.path.join(folder, 'condition_intensity.csv')
     }
-    if plain_text:
-        _data_to_csv(temperature, result_file_dict['temperature'])
-        _data_to_csv(condition, result_file_dict['condition'])
-        _data_to_csv(condition_intensity, result_file_dict['condition_intensity'])
-    else:
-        with open(result_file_dict['temperature'], 'wb') as fp:
-            np.save(fp, set_smallest_dtype(np.array(temperature)))
-        with open(result_file_dict['condition'], 'wb') as fp:
-            np.save(fp, set_smallest_dtype(np.array(condition)))
-        with open(result_file_dict['condition_intensity'], 'wb') as fp:
-            np.save(fp, set_smallest_dtype(np.array(condition_intensity)))
-    return result_file_dict
+
+
+def _data_to_npy(data, npy_path, metadata=None):
+    """Write a matrix of data into a .npy file in blocks with the smallest dtype."""
+    array = np.asarray(data)
+    block_size = max(1000000 // max(int(np.prod(array.shape[1:])), 1), 1)
+    with ThermalMapWriter(npy_path, array.shape, smallest_dtype(array),
+                          metadata) as writer:
+        for st in range(0, len(array), block_size):
+            writer.append(array[st:st + block_size])
 
 
 def smallest_integer_dtype(array: np.ndarray):
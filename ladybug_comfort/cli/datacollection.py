@@ -6,9 +6,9 @@ from pathlib import Path
 import click
 import json
 
-from ladybug.datacollection import HourlyContinuousCollection, HourlyDiscontinuousCollection
 from ladybug.header import Header
-from ladybug.datautil import collections_to_csv
+
+from ladybug_comfort.map._output import write_collections_csv
 
 
 _logger = logging.getLogger(__name__)
@@ -46,27 +46,17 @@ def folder_to_datacollections(folder, data_type, sub_folder):
         grid_list = json.load(json_file)
     with open(data_type) as json_file:
         data_header = Header.from_dict(json.load(json_file))
-    a_per = data_header.analysis_period
-    continuous = True if a_per.st_hour == 0 and a_per.end_hour == 23 else False
-    if not continuous:
-        dates = a_per.datetimes
     try:
+        out_folder = Path(folder, sub_folder)
+        if not out_folder.is_dir():
+            out_folder.mkdir(parents=True)
         for grid in grid_list:
             grid_name = grid['full_id'] if 'full_id' in grid else 'id'
             metadata = {'grid': grid_name}
             grid_file = Path(folder, '{}.npy'.format(grid_name))
-            data_matrix = np.load(grid_file).tolist()
-            grid_data = []
-            for i, row in enumerate(data_matrix):
-                header = data_header.duplicate()
-                header.metadata = metadata.copy()
-                header.metadata['sensor_index'] = i
-                data = HourlyContinuousCollection(header, row) if continuous else \
-                    HourlyDiscontinuousCollection(header, row, dates)
-                grid_data.append(data)
-
-            file_name = grid_name + '.csv'
-            collections_to_csv(grid_data, Path(folder, sub_folder), file_name)
+            data_matrix = np.load(grid_file, mmap_mode='r')
+            csv_file = Path(out_folder, '{}.csv'.format(grid_name))
+            write_collections_csv(data_matrix, data_header, str(csv_file), metadata)
     except Exception:
         _logger.exception('Failed to convert folder of files to data collections.')
         sys.exit(1)
@@ -7,7 +7,6 @@ import os
 import shutil
 import numpy as np
 
-from ladybug.epw import EPW
 from ladybug.legend import LegendParameters
 from ladybug.color import Colorset
 from ladybug.datacollection import HourlyContinuousCollection, \
@@ -16,11 +15,7 @@ from ladybug.header import Header
 from ladybug.analysisperiod import AnalysisPeriod
 from ladybug.datatype.energyflux import MetabolicRate
 from ladybug.datatype.rvalue import ClothingInsulation
-from ladybug.datatype.temperature import OperativeTemperature, \
-    StandardEffectiveTemperature, Temperature, UniversalThermalClimateIndex
-from ladybug.datatype.thermalcondition import PredictedMeanVote, \
-    ThermalCondition, ThermalConditionElevenPoint
-from ladybug.datatype.temperaturedelta import OperativeTemperatureDelta
+from ladybug.datatype.temperature import Temperature
 from ladybug.datatype.fraction import Fraction
 from ladybug.datatype.temperature import AirTemperature, \
     MeanRadiantTemperature, RadiantTemperature
@@ -31,23 +26,35 @@ from ladybug_comfort.map.irr import irradiance_contrib_map
 from ladybug_comfort.map.mrt import shortwave_mrt_map, longwave_mrt_map
 from ladybug_comfort.map.air import air_map
 from ladybug_comfort.map.tcp import tcp_model_schedules, tcp_total
-from ladybug_comfort.map._enclosure import _parse_enclosure_info, _values_to_data
+from ladybug_comfort.map._enclosure import _parse_enclosure_info, _values_to_data, \
+    _values_to_array, _data_to_matrix, _align_epw_data
 from ladybug_comfort.map._helper import restore_original_distribution
-from ladybug_comfort.collection.pmv import PMV, _PMVnoSET
-from ladybug_comfort.collection.adaptive import Adaptive, PrevailingTemperature
-from ladybug_comfort.collection.utci import UTCI
+from ladybug_comfort.map._cache import set_cache_dir, cached_epw
+from ladybug_comfort.map._output import write_text_matrix, ThermalMapWriter
+from ladybug_comfort.map._parallel import pmv_map_chunk, adaptive_map_chunk, \
+    utci_map_chunk, pet_mtx_chunk
+from ladybug_comfort.collection.adaptive import PrevailingTemperature
 
 from ._helper import load_values, load_analysis_period_str, \
-    load_pmv_par_str, load_adaptive_par_str, load_utci_par_str, \
-    load_solarcal_par_str, thermal_map_csv, _data_to_ill, set_smallest_dtype
+    load_pmv_par_str, load_adaptive_par_str, load_utci_par_str, load_pet_par_str, \
+    load_solarcal_par_str, thermal_map_headers, thermal_map_metadata, \
+    run_thermal_map, grid_id, set_smallest_dtype
 
 
 _logger = logging.getLogger(__name__)
 
 
 @click.group(help='Commands for creating spatial thermal maps.')
-def map():
-    pass
+@click.option('--cache-dir', '-cd', help='Optional path to a directory in which '
+              'the data parsed from EnergyPlus SQLite files and EPW files will be '
+              'cached as NumPy arrays. When several commands are run over the same '
+              'inputs with the same cache directory, only the first command parses '
+              'the files and the others load the cached arrays.', default=None,
+              type=click.Path(file_okay=False, dir_okay=True, resolve_path=True))
+@click.pass_context
+def map(ctx, cache_dir):
+    set_cache_dir(cache_dir)
+    ctx.call_on_close(lambda: set_cache_dir(None))
 
 
 @map.command('pmv')
@@ -104,6 +111,13 @@ def map():
               'the assumptions of the SolarCal model.', default=None, type=str)
 @click.option('--comfort-par', '-cp', help='A PMVParameter string to customize the '
               'assumptions of the PMV model.', default=None, type=str)
+@click.option('--workers', '-w', help='An integer for the number of processes over '
+              'which the sensors will be split in order to run the comfort model '
+              'in parallel.', default=1, type=int, show_default=True)
+@click.option('--chunk-size', '-cs', help='An integer for the number of sensors in '
+              'each chunk that is evaluated by a worker process. If unspecified, the '
+              'sensors will be split evenly between the workers with roughly one '
+              'million values in each chunk at most.', default=None, type=int)
 @click.option('--folder', '-f', help='Folder into which the result CSV files will be '
               'written. If None, files will be written to a "thermal_map" sub-folder in'
               'same directory as the result-sql.', default=None, show_default=True,
@@ -114,7 +128,7 @@ def map():
 def pmv(result_sql, enclosure_info, epw_file,
         total_irradiance, direct_irradiance, ref_irradiance, sun_up_hours,
         air_speed, met_rate, clo_value, write_op_map,
-        run_period, comfort_par, solarcal_par, folder, log_file):
+        run_period, comfort_par, solarcal_par, workers, chunk_size, folder, log_file):
     """Get CSV files with maps of PMV comfort from EnergyPlus and Radiance results.
 
     \b
@@ -129,7 +143,7 @@ def pmv(result_sql, enclosure_info, epw_file,
     """
     try:
         # load the EPW object, run period, air speed, and other parameters
-        epw_obj = EPW(epw_file)
+        epw_obj = cached_epw(epw_file)
         run_period = load_analysis_period_str(run_period)
         air_speed = load_values(air_speed)
         met_rate = load_values(met_rate)
@@ -160,24 +174,21 @@ def pmv(result_sql, enclosure_info, epw_file,
             clo_value = clo_value.filter_by_analysis_period(run_period) \
                 if isinstance(clo_value, HourlyContinuousCollection) else clo_value
 
-        # run the collections through the PMV model and output results
-        comf_class = _PMVnoSET if write_op_map else PMV
-        temperature, condition, condition_intensity = [], [], []
-        for t_a, rh, t_r, vel in zip(pt_air_temps, pt_humids, pt_rad_temps, pt_speeds):
-            pmv_obj = comf_class(
-                t_a, rh, t_r, vel, met_rate, clo_value, comfort_parameter=comfort_par)
-            condition.append(pmv_obj.thermal_condition)
-            condition_intensity.append(pmv_obj.predicted_mean_vote)
-            if write_op_map:
-                temperature.append(pmv_obj.operative_temperature)
-            else:
-                temperature.append(pmv_obj.standard_effective_temperature)
+        # convert the data collections into matrices of values
+        calc_len = len(pt_air_temps[0])
+        air_temp = _data_to_matrix(pt_air_temps, calc_len)
+        rad_temp = _data_to_matrix(pt_rad_temps, calc_len)
+        rel_h = _data_to_matrix(pt_humids, calc_len)
+        vel = _data_to_matrix(pt_speeds, calc_len, 0.1)
+        met_rate = _values_to_array(met_rate, calc_len, 1.1)
+        clo_value = _values_to_array(clo_value, calc_len, 0.7)
 
-        # write out the final results to CSV files
+        # run the matrices through the PMV model and write the results to CSV files
         if folder is None:
             folder = os.path.join(os.path.dirname(result_sql), 'thermal_map')
-        result_file_dict = thermal_map_csv(
-            folder, temperature, condition, condition_intensity)
+        result_file_dict = run_thermal_map(
+            folder, pmv_map_chunk, (air_temp, rad_temp, rel_h, vel),
+            (met_rate, clo_value, write_op_map, comfort_par), workers, chunk_size)
         log_file.write(json.dumps(result_file_dict))
     except Exception as e:
         _logger.exception('Failed to run PMV model comfort map.\n{}'.format(e))
@@ -225,6 +236,13 @@ def pmv(result_sql, enclosure_info, epw_file,
               'the assumptions of the SolarCal model.', default=None, type=str)
 @click.option('--comfort-par', '-cp', help='An AdaptiveParameter string to customize '
               'the assumptions of the Adaptive comfort model.', default=None, type=str)
+@click.option('--workers', '-w', help='An integer for the number of processes over '
+              'which the sensors will be split in order to run the comfort model '
+              'in parallel.', default=1, type=int, show_default=True)
+@click.option('--chunk-size', '-cs', help='An integer for the number of sensors in '
+              'each chunk that is evaluated by a worker process. If unspecified, the '
+              'sensors will be split evenly between the workers with roughly one '
+              'million values in each chunk at most.', default=None, type=int)
 @click.option('--folder', '-f', help='Folder into which the result CSV files will be '
               'written. If None, files will be written to a "thermal_map" sub-folder in'
               'same directory as the result-sql.', default=None, show_default=True,
@@ -234,7 +252,8 @@ def pmv(result_sql, enclosure_info, epw_file,
               type=click.File('w'), default='-', show_default=True)
 def adaptive(result_sql, enclosure_info, epw_file,
              total_irradiance, direct_irradiance, ref_irradiance, sun_up_hours,
-             air_speed, run_period, comfort_par, solarcal_par, folder, log_file):
+             air_speed, run_period, comfort_par, solarcal_par, workers, chunk_size,
+             folder, log_file):
     """Get CSV files with maps of Adaptive comfort from EnergyPlus and Radiance results.
 
     \b
@@ -250,7 +269,7 @@ def adaptive(result_sql, enclosure_info, epw_file,
     """
     try:
         # load the EPW object, run period, air speed, and other parameters
-        epw_obj = EPW(epw_file)
+        epw_obj = cached_epw(epw_file)
         run_period = load_analysis_period_str(run_period)
         air_speed = load_values(air_speed)
         solarcal_par = load_solarcal_par_str(solarcal_par)
@@ -275,20 +294,16 @@ def adaptive(result_sql, enclosure_info, epw_file,
         prev_obj = PrevailingTemperature(epw_obj.dry_bulb_temperature, avg_month)
         prevail_temp = prev_obj.get_aligned_prevailing(pt_air_temps[0])
 
-        # run the collections through the Adaptive model and output results
-        temperature, condition, condition_intensity = [], [], []
-        for t_air, t_rad, vel in zip(pt_air_temps, pt_rad_temps, pt_speeds):
-            adaptive_obj = Adaptive.from_air_and_rad_temp(
-                prevail_temp, t_air, t_rad, vel, comfort_parameter=comfort_par)
-            temperature.append(adaptive_obj.operative_temperature)
-            condition.append(adaptive_obj.thermal_condition)
-            condition_intensity.append(adaptive_obj.degrees_from_neutral)
-
-        # write out the final results to CSV files
+        # run the matrices through the Adaptive model and write the results to CSVs
         if folder is None:
             folder = os.path.join(os.path.dirname(result_sql), 'thermal_map')
-        result_file_dict = thermal_map_csv(
-            folder, temperature, condition, condition_intensity)
+        calc_len = len(pt_air_temps[0])
+        result_file_dict = run_thermal_map(
+            folder, adaptive_map_chunk,
+            (_data_to_matrix(pt_air_temps, calc_len),
+             _data_to_matrix(pt_rad_temps, calc_len),
+             _data_to_matrix(pt_speeds, calc_len, 0.1)),
+            (np.array(prevail_temp.values), comfort_par), workers, chunk_size)
         log_file.write(json.dumps(result_file_dict))
     except Exception as e:
         _logger.exception('Failed to run Adaptive model comfort map.\n{}'.format(e))
@@ -337,6 +352,13 @@ def adaptive(result_sql, enclosure_info, epw_file,
               'the assumptions of the SolarCal model.', default=None, type=str)
 @click.option('--comfort-par', '-cp', help='An UTCIParameter string to customize the '
               'assumptions of the Adaptrive comfort model.', default=None, type=str)
+@click.option('--workers', '-w', help='An integer for the number of processes over '
+              'which the sensors will be split in order to run the comfort model '
+              'in parallel.', default=1, type=int, show_default=True)
+@click.option('--chunk-size', '-cs', help='An integer for the number of sensors in '
+              'each chunk that is evaluated by a worker process. If unspecified, the '
+              'sensors will be split evenly between the workers with roughly one '
+              'million values in each chunk at most.', default=None, type=int)
 @click.option('--folder', '-f', help='Folder into which the result CSV files will be '
               'written. If None, files will be written to a "thermal_map" sub-folder in'
               'same directory as the result-sql.', default=None, show_default=True,
@@ -350,8 +372,8 @@ def adaptive(result_sql, enclosure_info, epw_file,
               default=True, show_default=True)
 def utci(result_sql, enclosure_info, epw_file,
          total_irradiance, direct_irradiance, ref_irradiance, sun_up_hours,
-         wind_speed, run_period, comfort_par, solarcal_par, folder, log_file,
-         plain_text):
+         wind_speed, run_period, comfort_par, solarcal_par, workers, chunk_size,
+         folder, log_file, plain_text):
     """Get CSV files with maps of UTCI comfort from EnergyPlus and Radiance results.
 
     \b
@@ -366,7 +388,7 @@ def utci(result_sql, enclosure_info, epw_file,
     """
     try:
         # load the EPW object, run period, air speed, and other parameters
-        epw_obj = EPW(epw_file)
+        epw_obj = cached_epw(epw_file)
         run_period = load_analysis_period_str(run_period)
         wind_speed = load_values(wind_speed)
         solarcal_par = load_solarcal_par_str(solarcal_par)
@@ -386,19 +408,20 @@ def utci(result_sql, enclosure_info, epw_file,
                 total_irradiance, direct_irradiance, ref_irradiance,
                 solarcal_par=solarcal_par, indirect_is_total=True)
 
-        # run the collections through the UTCI model and output results
-        temperature, condition, condition_intensity = [], [], []
-        for t_a, rh, t_r, vel in zip(pt_air_temps, pt_humids, pt_rad_temps, pt_speeds):
-            utci_obj = UTCI(t_a, rh, t_r, vel, comfort_parameter=comfort_par)
-            temperature.append(utci_obj.universal_thermal_climate_index)
-            condition.append(utci_obj.thermal_condition)
-            condition_intensity.append(utci_obj.thermal_condition_eleven_point)
-
-        # write out the final results to CSV files
+        # run the matrices through the UTCI model and write the results to files
         if folder is None:
             folder = os.path.join(os.path.dirname(result_sql), 'thermal_map')
-        result_file_dict = thermal_map_csv(
-            folder, temperature, condition, condition_intensity, plain_text)
+        metadata = thermal_map_metadata(
+            'utci', pt_air_temps[0].header.analysis_period, grid=grid_id(enclosure_info))
+        calc_len = len(pt_air_temps[0])
+        headers = (pt_air_temps[0].header, pt_humids[0].header, pt_rad_temps[0].header)
+        result_file_dict = run_thermal_map(
+            folder, utci_map_chunk,
+            (_data_to_matrix(pt_air_temps, calc_len),
+             _data_to_matrix(pt_humids, calc_len),
+             _data_to_matrix(pt_rad_temps, calc_len),
+             _data_to_matrix(pt_speeds, calc_len, 0.5)),
+            (headers, comfort_par), workers, chunk_size, plain_text, metadata)
         log_file.write(json.dumps(result_file_dict))
     except Exception as e:
         _logger.exception('Failed to run UTCI model comfort map.\n{}'.format(e))
@@ -407,6 +430,143 @@ def utci(result_sql, enclosure_info, epw_file,
         sys.exit(0)
 
 
+@map.command('pet')
+@click.argument('result-sql', type=click.Path(
+    exists=True, file_okay=True, dir_okay=False, resolve_path=True))
+@click.argument('enclosure-info', type=click.Path(
+    exists=True, file_okay=True, dir_okay=False, resolve_path=True))
+@click.argument('epw-file', type=click.Path(
+    exists=True, file_okay=True, dir_okay=False, resolve_path=True))
+@click.option('--total-irradiance', '-tr', help='Path to an .ill file output by '
+              'Radiance containing total irradiance for each sensor in the '
+              'enclosure-info. If unspecified, no shortwave solar will be '
+              'assumed for the study.', default=None,
+              type=click.Path(exists=True, file_okay=True, dir_okay=False,
+                              resolve_path=True))
+@click.option('--direct-irradiance', '-dr', help='Path to an .ill file output by '
+              'Radiance containing direct irradiance for each sensor in the '
+              'enclosure-info. If unspecified, all shortwave will be assumed '
+              'to be indirect.', default=None,
+              type=click.Path(file_okay=True, dir_okay=False, resolve_path=True))
+@click.option('--ref-irradiance', '-rr', help='Path to an .ill file output by Radiance '
+              'containing total ground-reflected irradiance for each sensor in the '
+              'enclosure-info. If unspecified, a default ground reflectance of 0.25 '
+              'will be assumed for the study.', default=None,
+              type=click.Path(file_okay=True, dir_okay=False, resolve_path=True))
+@click.option('--sun-up-hours', '-sh', help='Path to a sun-up-hours.txt file output by '
+              'Radiance. Required if any irradiance options are provided.', default=None,
+              type=click.Path(exists=True, file_okay=True, dir_okay=False,
+                              resolve_path=True))
+@click.option('--air-speed', '-v', help='A single number for air speed in m/s or a '
+              'string of a JSON array with numbers that align with the result-sql '
+              'reporting period. This will be used for all indoor comfort evaluation '
+              'while the EPW wind speed will be used for the outdoors. If '
+              'unspecified, 0.1 m/s will be used.', default=None, type=str)
+@click.option('--met-rate', '-m', help='A single number for metabolic rate in met '
+              'or a string of a JSON array with numbers that align with the '
+              'result-sql reporting period. If unspecified, 2.4 met will be used.',
+              default=None, type=str)
+@click.option('--clo-value', '-c', help='A single number for clothing level in clo '
+              'or a string of a JSON array with numbers that align with the '
+              'result-sql reporting period. If unspecified, 0.7 clo will be used.',
+              default=None, type=str)
+@click.option('--run-period', '-rp', help='An AnalysisPeriod string to dictate the '
+              'start and end of the analysis (eg. "6/21 to 9/21 between 8 and 16 @1"). '
+              'If unspecified, results will be generated for the entire run period of '
+              'the result-sql.', default=None, type=str)
+@click.option('--solarcal-par', '-sp', help='A SolarCalParameter string to customize '
+              'the assumptions of the SolarCal model.', default=None, type=str)
+@click.option('--comfort-par', '-cp', help='A PETParameter string to customize the '
+              'assumptions of the PET comfort model.', default=None, type=str)
+@click.option('--folder', '-f', help='Folder into which the result CSV files will be '
+              'written. If None, files will be written to a "thermal_map" sub-folder in'
+              'same directory as the result-sql.', default=None, show_default=True,
+              type=click.Path(file_okay=False, dir_okay=True, resolve_path=True))
+@click.option('--log-file', '-log', help='Optional log file to output the paths to the '
+              'generated CSV files. By default this will be printed out to stdout',
+              type=click.File('w'), default='-', show_default=True)
+@click.option('--plain-text/--binary', ' /-b', help='Flag to note whether the '
+              'output should be formatted as a plain text CSV or whether it '
+              'should be formatted as a binary numpy array.',
+              default=True, show_default=True)
+def pet(result_sql, enclosure_info, epw_file,
+        total_irradiance, direct_irradiance, ref_irradiance, sun_up_hours,
+        air_speed, met_rate, clo_value, run_period, comfort_par, solarcal_par,
+        folder, log_file, plain_text):
+    """Get CSV files with maps of PET comfort from EnergyPlus and Radiance results.
+
+    \b
+    Args:
+        result_sql: Path to an SQLite file that was generated by EnergyPlus.
+            This file must contain hourly or sub-hourly results for zone comfort
+            variables.
+        enclosure_info: Path to a JSON file containing information about the radiant
+            enclosure that sensor points belong to.
+        epw_file: Path to an .epw file, used to estimate conditions for any outdoor
+            sensors and to provide sun positions. The atmospheric station pressure
+            of the EPW is used for all sensors.
+    """
+    try:
+        # load the EPW object, run period, air speed, and other parameters
+        epw_obj = cached_epw(epw_file)
+        run_period = load_analysis_period_str(run_period)
+        air_speed = load_values(air_speed)
+        met_rate = load_values(met_rate)
+        clo_value = load_values(clo_value)
+        solarcal_par = load_solarcal_par_str(solarcal_par)
+        comfort_par = load_pet_par_str(comfort_par)
+
+        # load and align the thermal results from the result_sql file
+        pt_air_temps, pt_rad_temps, pt_humids, pt_speeds, a_per = _parse_enclosure_info(
+            enclosure_info, result_sql, epw_obj, run_period, air_speed,
+            include_humidity=True)
+
+        # adjust the radiant temperature for shortwave solar
+        if total_irradiance is not None and os.path.isfile(total_irradiance):
+            assert sun_up_hours is not None and os.path.isfile(sun_up_hours), \
+                'Sun up hours must be specified when total irradiance is specified.'
+            pt_rad_temps = shortwave_mrt_map(
+                epw_obj.location, pt_rad_temps, sun_up_hours,
+                total_irradiance, direct_irradiance, ref_irradiance,
+                solarcal_par=solarcal_par, indirect_is_total=True)
+
+        # convert any input lists of clothing or met to data collections
+        met_rate = _values_to_data(met_rate, a_per, MetabolicRate, 'met')
+        clo_value = _values_to_data(clo_value, a_per, ClothingInsulation, 'clo')
+        if run_period is not None and a_per != run_period:
+            met_rate = met_rate.filter_by_analysis_period(run_period) \
+                if isinstance(met_rate, HourlyContinuousCollection) else met_rate
+            clo_value = clo_value.filter_by_analysis_period(run_period) \
+                if isinstance(clo_value, HourlyContinuousCollection) else clo_value
+
+        # convert the data collections into matrices of values
+        calc_len = len(pt_air_temps[0])
+        air_temp = _data_to_matrix(pt_air_temps, calc_len)
+        rad_temp = _data_to_matrix(pt_rad_temps, calc_len)
+        rel_h = _data_to_matrix(pt_humids, calc_len)
+        vel = _data_to_matrix(pt_speeds, calc_len, 0.1)
+        met_rate = _values_to_array(met_rate, calc_len, 2.4)
+        clo_value = _values_to_array(clo_value, calc_len, 0.7)
+        b_press = _values_to_array(_align_epw_data(
+            epw_obj.atmospheric_station_pressure, a_per, run_period), calc_len)
+
+        # run the matrices through the PET model and write the results to files
+        if folder is None:
+            folder = os.path.join(os.path.dirname(result_sql), 'thermal_map')
+        metadata = thermal_map_metadata(
+            'pet', pt_air_temps[0].header.analysis_period, grid=grid_id(enclosure_info))
+        result_file_dict = run_thermal_map(
+            folder, pet_mtx_chunk, (air_temp, rad_temp, rel_h, vel),
+            (met_rate, clo_value, comfort_par, b_press), plain_text=plain_text,
+            metadata=metadata)
+        log_file.write(json.dumps(result_file_dict))
+    except Exception as e:
+        _logger.exception('Failed to run PET model comfort map.\n{}'.format(e))
+        sys.exit(1)
+    else:
+        sys.exit(0)
+
+
 @map.command('irradiance-contrib')
 @click.argument('result-sql', type=click.Path(
     exists=True, file_okay=True, dir_okay=False, resolve_path=True))
@@ -478,9 +638,9 @@ def irradiance_contrib(
 
         # write the irradiance matrices into CSV files
         if plain_text:
-            _data_to_ill(direct_mtx, direct_file)
-            _data_to_ill(indirect_mtx, indirect_file)
-            _data_to_ill(ref_mtx, ref_file)
+            write_text_matrix(direct_mtx, direct_file, ' ', 7, True)
+            write_text_matrix(indirect_mtx, indirect_file, ' ', 7, True)
+            write_text_matrix(ref_mtx, ref_file, ' ', 7, True)
         else:
             with open(direct_file, 'wb') as fp:
                 np.save(fp, set_smallest_dtype(np.array(direct_mtx)))
@@ -569,7 +729,7 @@ def shortwave_mrt(
     """
     try:
         # load the EPW object, run period, and other parameters
-        epw_obj = EPW(epw_file)
+        epw_obj = cached_epw(epw_file)
         run_period = load_analysis_period_str(run_period)
         run_period = run_period if run_period is not None else AnalysisPeriod()
         solarcal_par = load_solarcal_par_str(solarcal_par)
@@ -598,12 +758,7 @@ def shortwave_mrt(
 
         # write out the final results to CSV files
         if plain_text:
-            if len(d_mrt_temps) == 0:
-                output_file.write('')
-            else:
-                for mrt_d in d_mrt_temps:
-                    output_file.write(','.join(str(v) for v in mrt_d))
-                    output_file.write('\n')
+            write_text_matrix(d_mrt_temps, output_file)
         else:
             if len(d_mrt_temps) == 0:  # no sun-up hours; just create a blank file
                 output_file.write('')
@@ -665,12 +820,10 @@ def longwave_mrt(result_sql, view_factors, modifiers, enclosure_info, epw_file,
 
         # write out the final results to CSV files
         if plain_text:
-            for mrt_d in mrt_temps:
-                output_file.write(','.join(str(v) for v in mrt_d))
-                output_file.write('\n')
+            write_text_matrix(mrt_temps, output_file)
         else:
             with open(output_file.name, 'wb') as fp:
-                np.save(fp, set_smallest_dtype(np.array(mrt_temps)))
+                np.save(fp, set_smallest_dtype(mrt_temps))
     except Exception as e:
         _logger.exception('Failed to run Longwave MRT map.\n{}'.format(e))
         sys.exit(1)
@@ -725,9 +878,7 @@ def air_temperature(result_sql, enclosure_info, epw_file, run_period,
 
         # write out the final results to CSV files
         if plain_text:
-            for air_d in air_data:
-                output_file.write(','.join(str(v) for v in air_d))
-                output_file.write('\n')
+            write_text_matrix(air_data, output_file)
         else:
             with open(output_file.name, 'wb') as fp:
                 np.save(fp, set_smallest_dtype(np.array(air_data)))
@@ -764,41 +915,14 @@ def map_result_info(comfort_model, run_period, qualifier, folder, log_file):
     \b
     Args:
         comfort_model: Text for the comfort model of the thermal mapping simulation.
-            Choose from: pmv, adaptive, utci.
+            Choose from: pmv, adaptive, utci, pet.
     """
     try:
-        # parse the run period
+        # get the data type and units of the results from the comfort model
         run_period = load_analysis_period_str(run_period)
-        run_period = run_period if run_period is not None else AnalysisPeriod()
-
-        # get the data type and units from the comfort model
-        comfort_model = comfort_model.lower()
-        cond, cond_units = ThermalCondition(), 'condition'
-        if comfort_model == 'pmv':
-            temp, temp_units = OperativeTemperature(), 'C'
-            if 'write-set-map' in qualifier:
-                temp = StandardEffectiveTemperature()
-            cond_i, cond_i_units = PredictedMeanVote(), 'PMV'
-        elif comfort_model == 'adaptive':
-            temp, temp_units = OperativeTemperature(), 'C'
-            cond_i, cond_i_units = OperativeTemperatureDelta(), 'dC'
-        elif comfort_model == 'utci':
-            temp, temp_units = UniversalThermalClimateIndex(), 'C'
-            cond_i, cond_i_units = ThermalConditionElevenPoint(), 'condition'
-        else:
-            raise ValueError(
-                'Comfort model "{}" not recognized. Choose from: {}.'.format(
-                    comfort_model, ('pmv', 'adaptive', 'utci')))
-
-        # build up the dictionary of data headers
-        temp_header = Header(temp, temp_units, run_period)
-        cond_header = Header(cond, cond_units, run_period)
-        cond_i_header = Header(cond_i, cond_i_units, run_period)
+        headers = thermal_map_headers(comfort_model, run_period, qualifier)
         result_info_dict = {
-            'temperature': temp_header.to_dict(),
-            'condition': cond_header.to_dict(),
-            'condition_intensity': cond_i_header.to_dict()
-        }
+            metric: header.to_dict() for metric, header in headers.items()}
 
         # build up dictionaries of visualization metadata
         tcp_lpar = LegendParameters(colors=Colorset.annual_comfort())
@@ -909,15 +1033,9 @@ def tcp(condition_csv, enclosure_info, schedule, occ_schedule_json, folder, log_
         tcp_file = os.path.join(folder, 'tcp.csv')
         hsp_file = os.path.join(folder, 'hsp.csv')
         csp_file = os.path.join(folder, 'csp.csv')
-        with open(tcp_file, 'w') as fp:
-            fp.write('\n'.join([str(v) for v in tcp_list]))
-            fp.write('\n')
-        with open(hsp_file, 'w') as fp:
-            fp.write('\n'.join([str(v) for v in hsp_list]))
-            fp.write('\n')
-        with open(csp_file, 'w') as fp:
-            fp.write('\n'.join([str(v) for v in csp_list]))
-            fp.write('\n')
+        write_text_matrix(tcp_list, tcp_file)
+        write_text_matrix(hsp_list, hsp_file)
+        write_text_matrix(csp_list, csp_file)
         log_file.write(json.dumps([tcp_file, hsp_file, csp_file]))
     except Exception as e:
         _logger.exception('Failed to compute TCP.\n{}'.format(e))
@@ -936,7 +1054,15 @@ def tcp(condition_csv, enclosure_info, schedule, occ_schedule_json, folder, log_
 @click.argument(
     'sub-path', type=click.STRING
 )
-def restructure_env_conditions(folder, dest_folder, sub_path):
+@click.option('--workers', '-w', help='An integer for the number of processes over '
+              'which the sensor grids will be restructured in parallel.',
+              default=1, type=int, show_default=True)
+@click.option('--plain-text/--binary', ' /-b', help='Flag to note whether the '
+              'output should be formatted as plain text CSV files or whether it '
+              'should be formatted as binary numpy arrays. Binary outputs have a '
+              'JSON file next to each array with the header of the data.',
+              default=True, show_default=True)
+def restructure_env_conditions(folder, dest_folder, sub_path, workers, plain_text):
     """Read an npy file and convert every row to a data collection.
 
     This command reads a NumPy array from a npy file and sends it to stdout.
@@ -964,23 +1090,25 @@ def restructure_env_conditions(folder, dest_folder, sub_path):
         # restructure the results to align with the sensor grids
         dist_info = os.path.join(folder, '_redist_info.json')
         for src_f, dst_f in zip(source_folders, dest_folders):
+            data_header = create_result_header(folder, os.path.split(dst_f)[-1])
             if not os.path.isdir(dst_f):
                 os.makedirs(dst_f)
+                metadata = None if plain_text else {'header': data_header.to_dict()}
                 restore_original_distribution(
                     src_f, dst_f, extension='csv', dist_info=dist_info,
-                    output_extension='csv', as_text=True, fmt='%.12f',
-                    delimiter='comma')
+                    output_extension='csv', as_text=plain_text, fmt='%.12f',
+                    delimiter='comma', workers=workers, metadata=metadata)
                 grid_info_src = os.path.join(folder, 'grids_info.json')
                 grid_info_dst = os.path.join(dst_f, 'grids_info.json')
                 shutil.copyfile(grid_info_src, grid_info_dst)
-            data_header = create_result_header(folder, os.path.split(dst_f)[-1])
             result_info_path = os.path.join(dst_f, 'results_info.json')
             with open(result_info_path, 'w') as fp:
                 json.dump(data_header.to_dict(), fp, indent=4)
         # if MRT was requested, sum together the longwave and shortwave
         if sub_path == 'mrt':
-            sum_matrices(dest_folders[0], dest_folders[1], dest_folder)
             data_header = create_result_header(folder, sub_path)
+            sum_matrices(dest_folders[0], dest_folders[1], dest_folder,
+                         {'header': data_header.to_dict()})
             result_info_path = os.path.join(dest_folder, 'results_info.json')
             with open(result_info_path, 'w') as fp:
                 json.dump(data_header.to_dict(), fp, indent=4)
@@ -1007,19 +1135,34 @@ def create_result_header(env_conds, sub_path):
         return Header(RelativeHumidity(), '%', base_head.analysis_period)
 
 
-def sum_matrices(mtxs_1, mtxs_2, dest_dir):
-    """Sum together matrices of two folders."""
+def sum_matrices(mtxs_1, mtxs_2, dest_dir, metadata=None):
+    """Sum together matrices of two folders.
+
+    CSV files are summed into CSV files while NumPy files are memory-mapped and
+    summed in blocks of sensors into NumPy files with the metadata next to them.
+    """
     if not os.path.isdir(dest_dir):
         os.makedirs(dest_dir)
     for mtx_file in os.listdir(mtxs_1):
+        mtx_file1 = os.path.join(mtxs_1, mtx_file)
+        mtx_file2 = os.path.join(mtxs_2, mtx_file)
         if mtx_file.endswith('.csv'):
-            mtx_file1 = os.path.join(mtxs_1, mtx_file)
-            mtx_file2 = os.path.join(mtxs_2, mtx_file)
             matrix_1 = np.loadtxt(mtx_file1, dtype=np.float32, delimiter=',')
             matrix_2 = np.loadtxt(mtx_file2, dtype=np.float32, delimiter=',')
             data = matrix_1 + matrix_2
             csv_path = os.path.join(dest_dir, mtx_file)
-            np.savetxt(csv_path, data, fmt='%.12f', delimiter=',')
+            write_text_matrix(data, csv_path, fmt='%.12f')
+        elif mtx_file.endswith('.npy'):
+            matrix_1 = np.load(mtx_file1, mmap_mode='r')
+            matrix_2 = np.load(mtx_file2, mmap_mode='r')
+            npy_path = os.path.join(dest_dir, mtx_file)
+            block_size = max(1000000 // max(int(np.prod(matrix_1.shape[1:])), 1), 1)
+            with ThermalMapWriter(npy_path, matrix_1.shape, np.float32,
+                                  metadata) as writer:
+                for st in range(0, len(matrix_1), block_size):
+                    end = st + block_size
+                    writer.append(matrix_1[st:end].astype(np.float32) +
+                                  matrix_2[st:end].astype(np.float32))
         elif mtx_file == 'grids_info.json':
             shutil.copyfile(
                 os.path.join(mtxs_1, mtx_file),
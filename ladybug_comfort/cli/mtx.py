@@ -6,16 +6,12 @@ import json
 import os
 import numpy as np
 
-from ladybug_comfort.pmv import predicted_mean_vote, predicted_mean_vote_no_set
-from ladybug_comfort.adaptive import adaptive_comfort_ashrae55, \
-    adaptive_comfort_en15251, adaptive_comfort_conditioned_function, \
-    cooling_effect_ashrae55, cooling_effect_en16798, cooling_effect_en15251
-
 from ..map._helper import load_matrix
-from ..map.utci import universal_thermal_climate_index_np, thermal_condition_np, \
-    thermal_condition_eleven_point_np
-from ._helper import load_value_list, thermal_map_csv, csv_to_num_matrix, \
-    load_pmv_par_str, load_adaptive_par_str, load_utci_par_str
+from ..map._parallel import pmv_map_chunk, adaptive_map_chunk, utci_mtx_chunk, \
+    pet_mtx_chunk
+from ._helper import load_value_list, load_analysis_period_str, csv_to_num_matrix, \
+    load_pmv_par_str, load_adaptive_par_str, load_utci_par_str, load_pet_par_str, \
+    thermal_map_metadata, run_thermal_map, grid_id
 
 _logger = logging.getLogger(__name__)
 
@@ -79,6 +75,14 @@ def mtx():
               '"feels-like" temperature for the PMV model.', default=True)
 @click.option('--comfort-par', '-cp', help='A PMVParameter string to customize the '
               'assumptions of the PMV model.', default=None, type=str)
+@click.option('--workers', '-w', help='An integer for the number of processes over '
+              'which the rows of the matrices will be split in order to run the '
+              'comfort model in parallel.', default=1, type=int, show_default=True)
+@click.option('--chunk-size', '-cs', help='An integer for the number of matrix rows '
+              'in each chunk that is run through the comfort model at once. If '
+              'unspecified, the rows will be split evenly between the workers with '
+              'roughly one million values in each chunk at most.',
+              default=None, type=int)
 @click.option('--folder', '-f', help='Folder into which the result CSV files will be '
               'written. If None, files will be written to a "thermal_mtx" sub-folder in'
               'same directory as the temperature-mtx.', default=None, show_default=True,
@@ -90,10 +94,22 @@ def mtx():
               'output should be formatted as a plain text CSV or whether it '
               'should be formatted as a binary numpy array.',
               default=True, show_default=True)
+@click.option('--precision', '-p', help='An optional integer for the number of '
+              'decimal places to which the temperature and condition intensity '
+              'values of plain text CSV files are written. Writing values with a '
+              'precision is much faster than the default, which writes the '
+              'shortest text that exactly represents each value.',
+              default=None, type=int)
+@click.option('--run-period', '-rp', help='The AnalysisPeriod string that dictates '
+              'the start and end of the matrix columns (eg. "6/21 to 9/21 between 8 '
+              'and 16 @1"). This is written into the metadata of binary outputs. If '
+              'unspecified, it will be assumed results are for a full year.',
+              default=None, type=str)
 def pmv_mtx(
     temperature_mtx, rel_humidity_mtx, rad_temperature_mtx, rad_delta_mtx,
     air_speed_mtx, air_speed_json, air_speed,
-    met_rate, clo_value, write_op_map, comfort_par, folder, log_file, plain_text
+    met_rate, clo_value, write_op_map, comfort_par, workers, chunk_size, folder,
+    log_file, plain_text, precision, run_period
 ):
     """Get CSV files with matrices of PMV comfort from matrices of PMV inputs.
 
@@ -106,9 +122,9 @@ def pmv_mtx(
     """
     try:
         # load up the matrices of values
-        air_temp = load_matrix(temperature_mtx)
-        rel_h = load_matrix(rel_humidity_mtx)
-        rad_temp = load_matrix(rad_temperature_mtx) \
+        air_temp = load_matrix(temperature_mtx, mmap_mode='r')
+        rel_h = load_matrix(rel_humidity_mtx, mmap_mode='r')
+        rad_temp = load_matrix(rad_temperature_mtx, mmap_mode='r') \
             if rad_temperature_mtx is not None else air_temp
         if rad_delta_mtx is not None and not os.path.getsize(rad_delta_mtx) == 0:
             d_rad_temp = load_matrix(rad_delta_mtx)
@@ -118,59 +134,35 @@ def pmv_mtx(
         # process any of the other inputs for air speed
         a_speed = None
         if air_speed_mtx is not None and os.path.isfile(air_speed_mtx):
-            a_speed = load_matrix(air_speed_mtx).tolist()
+            a_speed = load_matrix(air_speed_mtx, mmap_mode='r')
         if a_speed is None and air_speed_json is not None \
                 and os.path.isfile(air_speed_json):
             with open(air_speed_json) as json_file:
                 a_speed_dict = json.load(json_file)
             speeds = a_speed_dict['air_speeds']
             a_speed = tuple(speeds[i] for i in a_speed_dict['speed_indices'])
-        if a_speed is None:
-            air_speed = load_value_list(air_speed, mtx_len, 0.1)
-            a_speed = [air_speed] * len(air_temp)
+        if a_speed is None:  # the same air speeds are used for all rows
+            a_speed = load_value_list(air_speed, mtx_len, 0.1)
+        a_speed = np.asanyarray(a_speed, dtype=np.float64)
 
         # load the met rate, clo value, and comfort parameters
         met_rate = load_value_list(met_rate, mtx_len, 1.1)
         clo_value = load_value_list(clo_value, mtx_len, 0.7)
         comfort_par = load_pmv_par_str(comfort_par)
-        sa_thresh = comfort_par.still_air_threshold
-
-        # run the collections through the PMV model and output results
-        temper, cond, cond_intensity = [], [], []
-        if write_op_map:
-            for sat, srt, sas, srh in zip(air_temp, rad_temp, a_speed, rel_h):
-                s_temper, s_cond, s_cond_intensity = [], [], []
-                for ta, tr, vel, rh, met, clo in \
-                        zip(sat, srt, sas, srh, met_rate, clo_value):
-                    result = predicted_mean_vote_no_set(
-                        ta, tr, vel, rh, met, clo, 0, sa_thresh)
-                    s_cond_intensity.append(result['pmv'])
-                    s_cond.append(
-                        comfort_par.thermal_condition(result['pmv'], result['ppd']))
-                    s_temper.append((ta + tr) / 2)
-                temper.append(s_temper)
-                cond.append(s_cond)
-                cond_intensity.append(s_cond_intensity)
-        else:
-            for sat, srt, sas, srh in zip(air_temp, rad_temp, a_speed, rel_h):
-                s_temper, s_cond, s_cond_intensity = [], [], []
-                for ta, tr, vel, rh, met, clo in \
-                        zip(sat, srt, sas, srh, met_rate, clo_value):
-                    result = predicted_mean_vote(
-                        ta, tr, vel, rh, met, clo, 0, sa_thresh)
-                    s_cond_intensity.append(result['pmv'])
-                    s_cond.append(
-                        comfort_par.thermal_condition(result['pmv'], result['ppd']))
-                    s_temper.append(result['set'])
-                temper.append(s_temper)
-                cond.append(s_cond)
-                cond_intensity.append(s_cond_intensity)
 
-        # write out the final results to CSV files
+        # run the matrices through the PMV model and write the results to files
         if folder is None:
             folder = os.path.join(os.path.dirname(temperature_mtx), 'thermal_mtx')
-        result_file_dict = thermal_map_csv(
-            folder, temper, cond, cond_intensity, plain_text=plain_text)
+        qualifier = () if write_op_map else ('write-set-map',)
+        metadata = thermal_map_metadata(
+            'pmv', load_analysis_period_str(run_period), qualifier,
+            grid_id(temperature_mtx))
+        met_rate, clo_value = np.array(met_rate), np.array(clo_value)
+        result_file_dict = run_thermal_map(
+            folder, pmv_map_chunk,
+            (air_temp, rad_temp, rel_h, a_speed, met_rate, clo_value),
+            (write_op_map, comfort_par), workers, chunk_size, plain_text, metadata,
+            precision)
         log_file.write(json.dumps(result_file_dict))
     except Exception as e:
         _logger.exception('Failed to run PMV matrix.\n{}'.format(e))
@@ -212,6 +204,14 @@ def pmv_mtx(
               'If unspecified or "None", 0.1 m/s will be used.', default='0.1', type=str)
 @click.option('--comfort-par', '-cp', help='A AdaptiveParameter string to customize the '
               'assumptions of the Adaptive model.', default=None, type=str)
+@click.option('--workers', '-w', help='An integer for the number of processes over '
+              'which the rows of the matrices will be split in order to run the '
+              'comfort model in parallel.', default=1, type=int, show_default=True)
+@click.option('--chunk-size', '-cs', help='An integer for the number of matrix rows '
+              'in each chunk that is run through the comfort model at once. If '
+              'unspecified, the rows will be split evenly between the workers with '
+              'roughly one million values in each chunk at most.',
+              default=None, type=int)
 @click.option('--folder', '-f', help='Folder into which the result CSV files will be '
               'written. If None, files will be written to a "thermal_mtx" sub-folder in'
               'same directory as the temperature-mtx.', default=None, show_default=True,
@@ -223,10 +223,21 @@ def pmv_mtx(
               'output should be formatted as a plain text CSV or whether it '
               'should be formatted as a binary numpy array.',
               default=True, show_default=True)
+@click.option('--precision', '-p', help='An optional integer for the number of '
+              'decimal places to which the temperature and condition intensity '
+              'values of plain text CSV files are written. Writing values with a '
+              'precision is much faster than the default, which writes the '
+              'shortest text that exactly represents each value.',
+              default=None, type=int)
+@click.option('--run-period', '-rp', help='The AnalysisPeriod string that dictates '
+              'the start and end of the matrix columns (eg. "6/21 to 9/21 between 8 '
+              'and 16 @1"). This is written into the metadata of binary outputs. If '
+              'unspecified, it will be assumed results are for a full year.',
+              default=None, type=str)
 def adaptive_mtx(
     temperature_mtx, prevail_temp, rad_temperature_mtx, rad_delta_mtx,
-    air_speed_mtx, air_speed_json, air_speed, comfort_par, folder, log_file,
-    plain_text
+    air_speed_mtx, air_speed_json, air_speed, comfort_par, workers, chunk_size,
+    folder, log_file, plain_text, precision, run_period
 ):
     """Get CSV files with matrices of Adaptive comfort from matrices of Adaptive inputs.
 
@@ -239,9 +250,9 @@ def adaptive_mtx(
     """
     try:
         # load up the matrices of values
-        air_temp = load_matrix(temperature_mtx)
+        air_temp = load_matrix(temperature_mtx, mmap_mode='r')
         prevail_temp = csv_to_num_matrix(prevail_temp)[0]
-        rad_temp = load_matrix(rad_temperature_mtx) \
+        rad_temp = load_matrix(rad_temperature_mtx, mmap_mode='r') \
             if rad_temperature_mtx is not None else air_temp
         if rad_delta_mtx is not None and not os.path.getsize(rad_delta_mtx) == 0:
             d_rad_temp = load_matrix(rad_delta_mtx)
@@ -251,55 +262,30 @@ def adaptive_mtx(
         # process any of the other inputs for air speed
         a_speed = None
         if air_speed_mtx is not None and os.path.isfile(air_speed_mtx):
-            a_speed = load_matrix(air_speed_mtx).tolist()
+            a_speed = load_matrix(air_speed_mtx, mmap_mode='r')
         if a_speed is None and air_speed_json is not None \
                 and os.path.isfile(air_speed_json):
             with open(air_speed_json) as json_file:
                 a_speed_dict = json.load(json_file)
             speeds = a_speed_dict['air_speeds']
             a_speed = tuple(speeds[i] for i in a_speed_dict['speed_indices'])
-        if a_speed is None:
-            air_speed = load_value_list(air_speed, mtx_len, 0.1)
-            a_speed = [air_speed] * len(air_temp)
+        if a_speed is None:  # the same air speeds are used for all rows
+            a_speed = load_value_list(air_speed, mtx_len, 0.1)
+        a_speed = np.asanyarray(a_speed, dtype=np.float64)
 
         # load the comfort parameters
         comfort_par = load_adaptive_par_str(comfort_par)
-        # determine the comfort function to use
-        if comfort_par.conditioning != 0:
-            comf_funct = adaptive_comfort_conditioned_function(
-                comfort_par.conditioning, comfort_par.standard)
-        elif comfort_par.ashrae_or_en is True:
-            comf_funct = adaptive_comfort_ashrae55
-        else:
-            comf_funct = adaptive_comfort_en15251
-        # determine the cooling effect function to use
-        if not comfort_par.discrete_or_continuous_air_speed:
-            cooling_funct = cooling_effect_en15251
-        elif comfort_par.ashrae_or_en:
-            cooling_funct = cooling_effect_ashrae55
-        else:
-            cooling_funct = cooling_effect_en16798
 
-        # run the collections through the PMV model and output results
-        temper, cond, cond_intensity = [], [], []
-        for sat, srt, sas in zip(air_temp, rad_temp, a_speed):
-            s_temper, s_cond, s_cond_intensity = [], [], []
-            for tp, ta, tr, vel in zip(prevail_temp, sat, srt, sas):
-                to = (ta + tr) / 2
-                result = comf_funct(tp, to)
-                ce = cooling_funct(vel, to, tp)
-                s_cond_intensity.append(result['deg_comf'])
-                s_cond.append(comfort_par.thermal_condition(result, ce))
-                s_temper.append(to)
-            temper.append(s_temper)
-            cond.append(s_cond)
-            cond_intensity.append(s_cond_intensity)
-
-        # write out the final results to CSV files
+        # run the matrices through the Adaptive model and write the results to files
         if folder is None:
             folder = os.path.join(os.path.dirname(temperature_mtx), 'thermal_mtx')
-        result_file_dict = thermal_map_csv(
-            folder, temper, cond, cond_intensity, plain_text=plain_text)
+        metadata = thermal_map_metadata(
+            'adaptive', load_analysis_period_str(run_period),
+            grid=grid_id(temperature_mtx))
+        result_file_dict = run_thermal_map(
+            folder, adaptive_map_chunk,
+            (air_temp, rad_temp, a_speed, np.array(prevail_temp)),
+            (comfort_par,), workers, chunk_size, plain_text, metadata, precision)
         log_file.write(json.dumps(result_file_dict))
     except Exception as e:
         _logger.exception('Failed to run PMV matrix.\n{}'.format(e))
@@ -344,6 +330,14 @@ def adaptive_mtx(
               default=None, type=str)
 @click.option('--comfort-par', '-cp', help='A UTCIParameter string to customize the '
               'assumptions of the UTCI model.', default=None, type=str)
+@click.option('--chunk-size', '-cs', help='An integer for the number of matrix rows '
+              'to be run through the UTCI model at once. Lower values reduce the peak '
+              'memory used by the calculation, which is useful for very large '
+              'matrices. If unspecified, the number of rows will be chosen such that '
+              'each chunk has roughly one million values.', default=None, type=int)
+@click.option('--workers', '-w', help='An integer for the number of processes over '
+              'which the rows of the matrices will be split in order to run the '
+              'comfort model in parallel.', default=1, type=int, show_default=True)
 @click.option('--folder', '-f', help='Folder into which the result CSV files will be '
               'written. If None, files will be written to a "thermal_mtx" sub-folder in'
               'same directory as the temperature-mtx.', default=None, show_default=True,
@@ -355,10 +349,21 @@ def adaptive_mtx(
               'output should be formatted as a plain text CSV or whether it '
               'should be formatted as a binary numpy array.',
               default=True, show_default=True)
+@click.option('--precision', '-p', help='An optional integer for the number of '
+              'decimal places to which the temperature and condition intensity '
+              'values of plain text CSV files are written. Writing values with a '
+              'precision is much faster than the default, which writes the '
+              'shortest text that exactly represents each value.',
+              default=None, type=int)
+@click.option('--run-period', '-rp', help='The AnalysisPeriod string that dictates '
+              'the start and end of the matrix columns (eg. "6/21 to 9/21 between 8 '
+              'and 16 @1"). This is written into the metadata of binary outputs. If '
+              'unspecified, it will be assumed results are for a full year.',
+              default=None, type=str)
 def utci_mtx(
     temperature_mtx, rel_humidity_mtx, rad_temperature_mtx, rad_delta_mtx,
-    air_speed_mtx, wind_speed_json, wind_speed, comfort_par, folder, log_file,
-    plain_text
+    air_speed_mtx, wind_speed_json, wind_speed, comfort_par, workers, chunk_size,
+    folder, log_file, plain_text, precision, run_period
 ):
     """Get CSV files with matrices of UTCI comfort from matrices of UTCI inputs.
 
@@ -371,11 +376,11 @@ def utci_mtx(
     """
     try:
         # load up the matrices of values
-        air_temp = load_matrix(temperature_mtx)
-        rel_h = load_matrix(rel_humidity_mtx)
+        air_temp = load_matrix(temperature_mtx, mmap_mode='r')
+        rel_h = load_matrix(rel_humidity_mtx, mmap_mode='r')
 
         if rad_temperature_mtx is not None:
-            rad_temp = load_matrix(rad_temperature_mtx)
+            rad_temp = load_matrix(rad_temperature_mtx, mmap_mode='r')
         else:
             rad_temp = air_temp
         if rad_delta_mtx is not None and not os.path.getsize(rad_delta_mtx) == 0:
@@ -396,24 +401,164 @@ def utci_mtx(
             w_speed = np.array([speeds[i] for i in w_speed_dict['speed_indices']], dtype=np.float32)
         if w_speed is None:
             wind_speed = load_value_list(wind_speed, mtx_len, 0.5)
-            w_speed = np.array([[wind_speed] * len(air_temp)], dtype=np.float32)
+            w_speed = np.array(wind_speed, dtype=np.float32)  # broadcast to rows
 
         # load the comfort parameters
         comfort_par = load_utci_par_str(comfort_par)
 
-        # run the collections through the UTCI model and output results
-        temper = universal_thermal_climate_index_np(air_temp, rad_temp, w_speed, rel_h)
-        cond = thermal_condition_np(temper, comfort_par)
-        cond_intensity = thermal_condition_eleven_point_np(temper, comfort_par)
-
-        # write out the final results to CSV files
+        # run the matrices through the UTCI model and write the results to files
         if folder is None:
             folder = os.path.join(os.path.dirname(temperature_mtx), 'thermal_mtx')
-        result_file_dict = thermal_map_csv(folder, temper, cond, cond_intensity,
-                                           plain_text=plain_text)
+        metadata = thermal_map_metadata(
+            'utci', load_analysis_period_str(run_period),
+            grid=grid_id(temperature_mtx))
+        result_file_dict = run_thermal_map(
+            folder, utci_mtx_chunk, (air_temp, rad_temp, rel_h, w_speed),
+            (comfort_par,), workers, chunk_size, plain_text, metadata, precision)
         log_file.write(json.dumps(result_file_dict))
     except Exception as e:
         _logger.exception('Failed to run UTCI matrix.\n{}'.format(e))
         sys.exit(1)
     else:
         sys.exit(0)
+
+
+@mtx.command('pet')
+@click.argument('temperature-mtx', type=click.Path(
+    exists=True, file_okay=True, dir_okay=False, resolve_path=True))
+@click.argument('rel-humidity-mtx', type=click.Path(
+    exists=True, file_okay=True, dir_okay=False, resolve_path=True))
+@click.option('--rad-temperature-mtx', '-rm', help='Path to a CSV file with with a '
+              'matrix of MRT values. If unspecified, the radiant and the air '
+              'temperature will be assumed to be the same.', default=None,
+              type=click.Path(exists=True, file_okay=True, dir_okay=False,
+                              resolve_path=True))
+@click.option('--rad-delta-mtx', '-dm', help='Path to a CSV file with with a matrix '
+              'of MRT deltas to be added to the base MRT values. This can be used to '
+              'account for shortwave solar.', default=None,
+              type=click.Path(exists=True, file_okay=True, dir_okay=False,
+                              resolve_path=True))
+@click.option('--air-speed-mtx', '-vm', help='Path to a CSV file with with a matrix '
+              'of air speed values in m/s. If specified, this overrides both the '
+              '--air-speed-json and the --air-speed inputs.', default=None,
+              type=click.Path(exists=False, file_okay=True, dir_okay=False,
+                              resolve_path=True))
+@click.option('--air-speed-json', '-vj', help='Path to a JSON file conaining a '
+              'simplified set of air speed values for each row of the matrix in m/s. '
+              'If specified, this overrides the the --air-speed input.', default=None,
+              type=click.Path(exists=False, file_okay=True, dir_okay=False,
+                              resolve_path=True))
+@click.option('--air-speed', '-v', help='A single number for air speed in m/s or '
+              'the path to a CSV file containing a single number per row and a number '
+              'of rows that aligns with the width of the matrix. This can also '
+              'be a string of a JSON array with that aligns with the matrix width, '
+              'though this is only recommended for narrow matrices. '
+              'If unspecified or "None", 0.1 m/s will be used.', default='0.1', type=str)
+@click.option('--met-rate', '-m', help='A single number for metabolic rate in met or '
+              'the path to a CSV file containing a single number per row and a number '
+              'of rows that aligns with the width of the matrix. This can also '
+              'be a string of a JSON array with that aligns with the matrix width, '
+              'though this is only recommended for narrow matrices. '
+              'If unspecified or "None", 2.4 met will be used.',
+              default='2.4', type=str)
+@click.option('--clo-value', '-c', help='A single number for clothing level in clo or '
+              'the path to a CSV file containing a single number per row and a number '
+              'of rows that aligns with the width of the matrix. This can also '
+              'be a string of a JSON array with that aligns with the matrix width, '
+              'though this is only recommended for narrow matrices. '
+              'If unspecified or "None", 0.7 clo will be used.',
+              default='0.7', type=str)
+@click.option('--comfort-par', '-cp', help='A PETParameter string to customize the '
+              'assumptions of the PET model.', default=None, type=str)
+@click.option('--workers', '-w', help='An integer for the number of processes over '
+              'which the rows of the matrices will be split in order to run the '
+              'comfort model in parallel.', default=1, type=int, show_default=True)
+@click.option('--chunk-size', '-cs', help='An integer for the number of matrix rows '
+              'in each chunk that is run through the comfort model at once. If '
+              'unspecified, the rows will be split evenly between the workers with '
+              'roughly one million values in each chunk at most.',
+              default=None, type=int)
+@click.option('--folder', '-f', help='Folder into which the result CSV files will be '
+              'written. If None, files will be written to a "thermal_mtx" sub-folder in'
+              'same directory as the temperature-mtx.', default=None, show_default=True,
+              type=click.Path(file_okay=False, dir_okay=True, resolve_path=True))
+@click.option('--log-file', '-log', help='Optional log file to output the paths to the '
+              'generated CSV files. By default this will be printed out to stdout',
+              type=click.File('w'), default='-', show_default=True)
+@click.option('--plain-text/--binary', ' /-b', help='Flag to note whether the '
+              'output should be formatted as a plain text CSV or whether it '
+              'should be formatted as a binary numpy array.',
+              default=True, show_default=True)
+@click.option('--precision', '-p', help='An optional integer for the number of '
+              'decimal places to which the temperature and condition intensity '
+              'values of plain text CSV files are written. Writing values with a '
+              'precision is much faster than the default, which writes the '
+              'shortest text that exactly represents each value.',
+              default=None, type=int)
+@click.option('--run-period', '-rp', help='The AnalysisPeriod string that dictates '
+              'the start and end of the matrix columns (eg. "6/21 to 9/21 between 8 '
+              'and 16 @1"). This is written into the metadata of binary outputs. If '
+              'unspecified, it will be assumed results are for a full year.',
+              default=None, type=str)
+def pet_mtx(
+    temperature_mtx, rel_humidity_mtx, rad_temperature_mtx, rad_delta_mtx,
+    air_speed_mtx, air_speed_json, air_speed,
+    met_rate, clo_value, comfort_par, workers, chunk_size, folder, log_file,
+    plain_text, precision, run_period
+):
+    """Get CSV files with matrices of PET comfort from matrices of PET inputs.
+
+    \b
+    Args:
+        temperature_mtx: Path to a CSV file with with a matrix of temperature
+            values in Celsius.
+        rel_humidity_mtx: Path to a CSV file with with a matrix of relative humidity
+            values in Percent.
+    """
+    try:
+        # load up the matrices of values
+        air_temp = load_matrix(temperature_mtx, mmap_mode='r')
+        rel_h = load_matrix(rel_humidity_mtx, mmap_mode='r')
+        rad_temp = load_matrix(rad_temperature_mtx, mmap_mode='r') \
+            if rad_temperature_mtx is not None else air_temp
+        if rad_delta_mtx is not None and not os.path.getsize(rad_delta_mtx) == 0:
+            d_rad_temp = load_matrix(rad_delta_mtx)
+            rad_temp = rad_temp + d_rad_temp
+        mtx_len = len(air_temp[0])
+
+        # process any of the other inputs for air speed
+        a_speed = None
+        if air_speed_mtx is not None and os.path.isfile(air_speed_mtx):
+            a_speed = load_matrix(air_speed_mtx, mmap_mode='r')
+        if a_speed is None and air_speed_json is not None \
+                and os.path.isfile(air_speed_json):
+            with open(air_speed_json) as json_file:
+                a_speed_dict = json.load(json_file)
+            speeds = a_speed_dict['air_speeds']
+            a_speed = tuple(speeds[i] for i in a_speed_dict['speed_indices'])
+        if a_speed is None:  # the same air speeds are used for all rows
+            a_speed = load_value_list(air_speed, mtx_len, 0.1)
+        a_speed = np.asanyarray(a_speed, dtype=np.float64)
+
+        # load the met rate, clo value, and comfort parameters
+        met_rate = load_value_list(met_rate, mtx_len, 2.4)
+        clo_value = load_value_list(clo_value, mtx_len, 0.7)
+        comfort_par = load_pet_par_str(comfort_par)
+
+        # run the matrices through the PET model and write the results to files
+        if folder is None:
+            folder = os.path.join(os.path.dirname(temperature_mtx), 'thermal_mtx')
+        metadata = thermal_map_metadata(
+            'pet', load_analysis_period_str(run_period),
+            grid=grid_id(temperature_mtx))
+        met_rate, clo_value = np.array(met_rate), np.array(clo_value)
+        result_file_dict = run_thermal_map(
+            folder, pet_mtx_chunk,
+            (air_temp, rad_temp, rel_h, a_speed, met_rate, clo_value),
+            (comfort_par,), workers, chunk_size, plain_text, metadata, precision)
+        log_file.write(json.dumps(result_file_dict))
+    except Exception as e:
+        _logger.exception('Failed to run PET matrix.\n{}'.format(e))
+        sys.exit(1)
+    else:
+        sys.exit(0)
@@ -20,6 +20,12 @@ from ladybug.datatype.speed import Speed, AirSpeed
 from ladybug.datatype.thermalcondition import ThermalComfort, ThermalCondition
 from ladybug.datatype.temperaturedelta import OperativeTemperatureDelta
 
+try:  # use the batched NumPy adaptive comfort model when NumPy is available
+    from ..map.adaptive import adaptive_comfort_np, \
+        weighted_running_mean_hourly_np, weighted_running_mean_daily_np
+except ImportError:  # IronPython or an environment without NumPy
+    adaptive_comfort_np = None
+
 
 class Adaptive(ComfortCollection):
     """Adaptive comfort DataCollection object.
@@ -134,6 +140,9 @@ class Adaptive(ComfortCollection):
 
     def _calculate_adaptive(self):
         """Compute Adaptive comfort for each step of the Data Collection."""
+        if adaptive_comfort_np is not None:
+            return self._calculate_adaptive_np()
+
         # empty properties to be calculated
         self._neutral_temperature = []
         self._degrees_from_neutral = []
@@ -174,6 +183,16 @@ class Adaptive(ComfortCollection):
             self._thermal_condition.append(condit)
             self._cooling_effect.append(ce)
 
+    def _calculate_adaptive_np(self):
+        """Compute Adaptive comfort for all steps of the Data Collection at once."""
+        result = adaptive_comfort_np(
+            self._prevail_temp, self._op_temp, self._air_speed, self._comfort_par)
+        self._neutral_temperature = result['t_comf'].tolist()
+        self._degrees_from_neutral = result['deg_comf'].tolist()
+        self._is_comfortable = result['is_comfortable'].tolist()
+        self._thermal_condition = result['thermal_condition'].tolist()
+        self._cooling_effect = result['ce'].tolist()
+
     @property
     def prevailing_outdoor_temperature(self):
         """Data Collection of prevailing outdoor temperature in degrees C."""
@@ -328,9 +347,18 @@ class PrevailingTemperature(object):
                 self._monthly_prevail = self._t_out.values
         else:
             if isinstance(self._t_out, HourlyContinuousCollection):
-                self._hourly_prevail = weighted_running_mean_hourly(self._t_out.values)
+                if adaptive_comfort_np is not None:
+                    self._hourly_prevail = weighted_running_mean_hourly_np(
+                        self._t_out.values).tolist()
+                else:
+                    self._hourly_prevail = \
+                        weighted_running_mean_hourly(self._t_out.values)
             elif isinstance(self._t_out, DailyCollection):
-                self._daily_prevail = weighted_running_mean_daily(self._t_out.values)
+                if adaptive_comfort_np is not None:
+                    self._daily_prevail = weighted_running_mean_daily_np(
+                        self._t_out.values).tolist()
+                else:
+                    self._daily_prevail = weighted_running_mean_daily(self._t_out.values)
                 for val in self._daily_prevail:
                     self._hourly_prevail.extend([val] * 24)
             else:
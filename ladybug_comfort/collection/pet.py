@@ -26,6 +26,11 @@ try:
 except ImportError:
     pass
 
+try:  # use the batched NumPy solver when NumPy is available
+    from ..map.pet import physiologic_equivalent_temperature_np
+except ImportError:  # IronPython or an environment without NumPy
+    physiologic_equivalent_temperature_np = None
+
 
 class PET(ComfortCollection):
     """PET comfort DataCollection object.
@@ -230,6 +235,19 @@ class PET(ComfortCollection):
     def _calculate_pet(self):
         """Compute PET for each step of the Data Collection."""
         self._setup_list_attributes()
+        if physiologic_equivalent_temperature_np is not None:
+            results = physiologic_equivalent_temperature_np(
+                self._air_temperature, self._rad_temperature, self._air_speed,
+                self._rel_humidity, self._met_rate, self._clo_value,
+                self._body_par.age, self._body_par.sex, self._body_par.height,
+                self._body_par.body_mass, self._body_par.posture,
+                self._barometric_pressure)
+            keys = ('pet', 't_core', 't_skin', 't_clo')
+            for vals in zip(*(results[key].tolist() for key in keys)):
+                result = dict(zip(keys, vals))
+                self._append_results_to_lists(result)
+                self._assess_comfort(result)
+            return
         for ta, tr, vel, rh, met, clo, pr in \
             zip(self._air_temperature, self._rad_temperature,
                 self._air_speed, self._rel_humidity,
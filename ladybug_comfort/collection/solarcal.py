@@ -10,7 +10,8 @@ from .base import ComfortCollection
 
 from ladybug.location import Location
 from ladybug.sunpath import Sunpath
-from ladybug.datacollection import HourlyDiscontinuousCollection
+from ladybug.datacollection import HourlyContinuousCollection, \
+    HourlyDiscontinuousCollection
 
 from ladybug.datatype.temperature import Temperature, MeanRadiantTemperature
 from ladybug.datatype.temperaturedelta import RadiantTemperatureDelta
@@ -20,6 +21,12 @@ from ladybug.datatype.energyflux import Irradiance, EffectiveRadiantField, \
 from ladybug.datatype.energyintensity import Radiation
 from ladybug.datatype.fraction import Fraction
 
+try:  # use the batched NumPy solar positions when NumPy is available
+    from ..map.sunpath import sun_positions_np, sun_positions_from_moys_np
+    from ..map.solarcal import sharp_from_solar_and_body_azimuth_np
+except ImportError:  # IronPython or an environment without NumPy
+    sun_positions_np = None
+
 
 class _SolarCalBase(ComfortCollection):
     """Base class used by all objects that use SolarCal with Data Collections."""
@@ -109,6 +116,8 @@ class _SolarCalBase(ComfortCollection):
 
     def _get_altitudes_and_sharps(self):
         """Get altitudes and sharps from solar position."""
+        if sun_positions_np is not None:
+            return self._get_altitudes_and_sharps_np()
         sp = Sunpath.from_location(self._location)
         _altitudes = []
         if self._body_par.body_azimuth is None:
@@ -126,6 +135,22 @@ class _SolarCalBase(ComfortCollection):
                 _altitudes.append(sun.altitude)
         return _altitudes, _sharps
 
+    def _get_altitudes_and_sharps_np(self):
+        """Get altitudes and sharps from solar positions computed with NumPy."""
+        a_per = self._base_collection.header.analysis_period
+        if isinstance(self._base_collection, HourlyContinuousCollection):
+            _altitudes, _azimuths = sun_positions_np(self._location, a_per)
+        else:
+            moys = [t_date.moy for t_date in self._base_collection.datetimes]
+            _altitudes, _azimuths = sun_positions_from_moys_np(
+                self._location, moys, a_per.is_leap_year)
+        if self._body_par.body_azimuth is None:
+            _sharps = [self._body_par.sharp] * self._calc_length
+        else:
+            _sharps = sharp_from_solar_and_body_azimuth_np(
+                _azimuths, self._body_par.body_azimuth).tolist()
+        return _altitudes.tolist(), _sharps
+
 
 class OutdoorSolarCal(_SolarCalBase):
     """Outdoor SolarCal Collection object.
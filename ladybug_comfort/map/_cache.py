@@ -0,0 +1,210 @@
+# coding=utf-8
+"""Methods for caching parsed thermal map inputs as NumPy arrays on disk.
+
+When a cache directory is set, the arrays extracted from EnergyPlus SQLite files
+and EPW files are written to sub-folders of the directory that are keyed by a
+hash of the file contents and the extraction options. Subsequent extractions
+of the same inputs (eg. by the other commands of a thermal mapping workflow)
+memory-map the cached .npy files instead of parsing the input files again.
+"""
+from __future__ import division
+
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import numpy as np
+
+from ladybug.epw import EPW
+from ladybug.location import Location
+from ladybug.header import Header
+from ladybug.datacollection import HourlyContinuousCollection
+
+_CACHE = {'dir': None}  # the directory in which inputs are cached
+_FILE_HASHES = {}  # file hashes that have already been computed in this process
+EPW_CACHE_FIELDS = (
+    'dry_bulb_temperature', 'relative_humidity', 'wind_speed', 'sky_temperature',
+    'atmospheric_station_pressure')
+
+
+def set_cache_dir(cache_dir):
+    """Set the directory in which parsed thermal map inputs are cached.
+
+    Args:
+        cache_dir: Path to a directory in which parsed inputs will be cached.
+            The directory will be created if it does not exist. If None, the
+            caching of inputs will be turned off.
+    """
+    if cache_dir is not None and not os.path.isdir(cache_dir):
+        os.makedirs(cache_dir)
+    _CACHE['dir'] = cache_dir
+
+
+def get_cache_dir():
+    """Get the directory in which parsed thermal map inputs are cached (or None)."""
+    return _CACHE['dir']
+
+
+def file_hash(file_path):
+    """Get a SHA-256 hash of the contents of a file.
+
+    Hashes are remembered for the duration of the process using the size and
+    modification time of the file such that each file is only read once.
+
+    Args:
+        file_path: Path to a file.
+    """
+    stat = os.stat(file_path)
+    mem_key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+    try:
+        return _FILE_HASHES[mem_key]
+    except KeyError:
+        sha = hashlib.sha256()
+        with open(file_path, 'rb') as inf:
+            for chunk in iter(lambda: inf.read(1 << 20), b''):
+                sha.update(chunk)
+        _FILE_HASHES[mem_key] = sha.hexdigest()
+        return _FILE_HASHES[mem_key]
+
+
+def cache_key(*key_parts):
+    """Get a text key for a cache entry from a list of JSON-serializable key parts."""
+    key_str = json.dumps(key_parts, sort_keys=True)
+    return hashlib.sha256(key_str.encode('utf-8')).hexdigest()[:32]
+
+
+def load_cached(key):
+    """Load the arrays and the info of a cache entry.
+
+    Args:
+        key: Text for the key of the cache entry, typically from the cache_key function.
+
+    Returns:
+        A tuple with a dictionary of read-only memory-mapped arrays and a dictionary
+        of info about the arrays. This will be None if no cache directory
+        is set or the entry is not in the cache.
+    """
+    if _CACHE['dir'] is None:
+        return None
+    entry_dir = os.path.join(_CACHE['dir'], key)
+    info_file = os.path.join(entry_dir, 'info.json')
+    if not os.path.isfile(info_file):
+        return None
+    with open(info_file) as inf:
+        info = json.load(inf)
+    arrays = {name: np.load(os.path.join(entry_dir, '{}.npy'.format(name)),
+                            mmap_mode='r')
+              for name in info['arrays']}
+    return arrays, info
+
+
+def save_cached(key, arrays, info=None):
+    """Save arrays and info to a cache entry if a cache directory is set.
+
+    The entry is written to a temporary folder that is renamed once it is
+    complete such that other processes never load partially-written entries.
+
+    Args:
+        key: Text for the key of the cache entry, typically from the cache_key function.
+        arrays: A dictionary of NumPy arrays to be cached.
+        info: An optional dictionary of JSON-serializable info about the arrays.
+    """
+    if _CACHE['dir'] is None:
+        return
+    info = {} if info is None else dict(info)
+    info['arrays'] = sorted(arrays.keys())
+    temp_dir = tempfile.mkdtemp(prefix='.{}_'.format(key), dir=_CACHE['dir'])
+    os.chmod(temp_dir, 0o755)
+    try:
+        for name, array in arrays.items():
+            np.save(os.path.join(temp_dir, '{}.npy'.format(name)), array)
+        with open(os.path.join(temp_dir, 'info.json'), 'w') as outf:
+            json.dump(info, outf)
+        os.rename(temp_dir, os.path.join(_CACHE['dir'], key))
+    except OSError:  # another process already cached the entry
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def cached_epw(epw_file):
+    """Get an EPW object that uses the cache directory if it is set.
+
+    Args:
+        epw_file: Path to an .epw file.
+
+    Returns:
+        A ladybug EPW object if no cache directory is set. Otherwise, an object
+        with the location and the data collections of EPW_CACHE_FIELDS, which
+        are loaded from the cache whenever the epw_file has already been parsed.
+    """
+    if _CACHE['dir'] is None:
+        return EPW(epw_file)
+    key = cache_key('epw', file_hash(epw_file), EPW_CACHE_FIELDS)
+    cached = load_cached(key)
+    if cached is None:
+        epw_obj = EPW(epw_file)
+        arrays, headers = {}, {}
+        for field in EPW_CACHE_FIELDS:
+            data = getattr(epw_obj, field)
+            arrays[field] = np.array(data.values, dtype=np.float64)
+            headers[field] = data.header.to_dict()
+        info = {'location': epw_obj.location.to_dict(), 'headers': headers}
+        save_cached(key, arrays, info)
+        return epw_obj
+    return _CachedEPW(*cached)
+
+
+class _CachedEPW(object):
+    """Stand-in for an EPW object with the data that is used by thermal maps.
+
+    Args:
+        arrays: A dictionary with an array of values for each of EPW_CACHE_FIELDS.
+        info: A dictionary with the location and the header of each field.
+    """
+    __slots__ = ('_arrays', '_info', '_location', '_data')
+
+    def __init__(self, arrays, info):
+        self._arrays = arrays
+        self._info = info
+        self._location = Location.from_dict(info['location'])
+        self._data = {}
+
+    @property
+    def location(self):
+        """Get a Ladybug Location object from the EPW."""
+        return self._location
+
+    @property
+    def dry_bulb_temperature(self):
+        """Get a data collection of dry bulb temperature from the EPW."""
+        return self._get_data('dry_bulb_temperature')
+
+    @property
+    def relative_humidity(self):
+        """Get a data collection of relative humidity from the EPW."""
+        return self._get_data('relative_humidity')
+
+    @property
+    def wind_speed(self):
+        """Get a data collection of wind speed from the EPW."""
+        return self._get_data('wind_speed')
+
+    @property
+    def sky_temperature(self):
+        """Get a data collection of sky temperature from the EPW."""
+        return self._get_data('sky_temperature')
+
+    @property
+    def atmospheric_station_pressure(self):
+        """Get a data collection of atmospheric station pressure from the EPW."""
+        return self._get_data('atmospheric_station_pressure')
+
+    def _get_data(self, field):
+        """Get a data collection for one of the EPW_CACHE_FIELDS."""
+        try:
+            return self._data[field]
+        except KeyError:
+            header = Header.from_dict(self._info['headers'][field])
+            data = HourlyContinuousCollection(header, self._arrays[field].tolist())
+            self._data[field] = data
+            return data
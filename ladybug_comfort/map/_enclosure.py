@@ -3,12 +3,15 @@
 from __future__ import division
 
 import json
+import numpy as np
 
-from ladybug.sql import SQLiteResult
+from ladybug._datacollectionbase import BaseCollection
 from ladybug.datacollection import HourlyContinuousCollection
 from ladybug.header import Header
 from ladybug.datatype.speed import AirSpeed
 
+from ._sql import sql_output_arrays, sql_output_data
+
 
 def _parse_enclosure_info(enclosure_info, result_sql, epw, analysis_period=None,
                           default_air_speed=0.1, include_humidity=False,
@@ -48,19 +51,16 @@ def _parse_enclosure_info(enclosure_info, result_sql, epw, analysis_period=None,
         * base_a_per - The AnalysisPeriod of the data in the result_sql.
     """
     # load all comfort-related outputs from the result_sql
-    sql_obj = SQLiteResult(result_sql)
-    air_temps = sql_obj.data_collections_by_output_name('Zone Mean Air Temperature')
-    rad_temps = sql_obj.data_collections_by_output_name('Zone Mean Radiant Temperature')
-    if include_humidity:
-        humids = sql_obj.data_collections_by_output_name('Zone Air Relative Humidity')
+    air_outp = 'Zone Mean Air Temperature'
+    rad_outp = 'Zone Mean Radiant Temperature'
+    hum_outp = 'Zone Air Relative Humidity'
+    outputs = [air_outp, rad_outp, hum_outp] if include_humidity \
+        else [air_outp, rad_outp]
+    sql_arrays, base_a_per = sql_output_arrays(result_sql, outputs)
 
     # check that EnergyPlus sql data is correct and note the analysis period
-    assert len(air_temps) != 0, \
+    assert air_outp in sql_arrays, \
         'Input result-sql does not contain thermal comfort outputs.'
-    assert isinstance(air_temps[0], HourlyContinuousCollection), 'EnergyPlus ' \
-        'reporting frequency must be Hourly or Timestep to use thermal mapping. ' \
-        'Not {}'.format(air_temps[0])
-    base_a_per = air_temps[0].header.analysis_period
 
     # convert default air speed into a data collection if it's a list
     default_air_speed = _values_to_data(default_air_speed, base_a_per, AirSpeed, 'm/s')
@@ -72,20 +72,10 @@ def _parse_enclosure_info(enclosure_info, result_sql, epw, analysis_period=None,
     # order the sql data based on the relevant zones from the enclosure_info
     rel_air_temps, rel_rad_temps, rel_humids, rel_speeds = [], [], [], []
     for zone_id in enclosure_dict['mapper']:
-        zone_id = zone_id.upper()  # capitalize to match the output of EnergyPlus
-        for data in air_temps:
-            if data.header.metadata['Zone'] == zone_id:
-                rel_air_temps.append(data)
-                break
-        for data in rad_temps:
-            if data.header.metadata['Zone'] == zone_id:
-                rel_rad_temps.append(data)
-                break
+        rel_air_temps.append(sql_output_data(sql_arrays[air_outp], zone_id, 'Zone'))
+        rel_rad_temps.append(sql_output_data(sql_arrays[rad_outp], zone_id, 'Zone'))
         if include_humidity:
-            for data in humids:
-                if data.header.metadata['System'] == zone_id:
-                    rel_humids.append(data)
-                    break
+            rel_humids.append(sql_output_data(sql_arrays[hum_outp], zone_id, 'System'))
         rel_speeds.append(default_air_speed)
 
     # if the enclosure info includes outdoor sensors, ensure epw data is added
@@ -133,6 +123,32 @@ def _values_to_data(values, base_period, data_type, data_units):
     return values
 
 
+def _values_to_array(values, calc_len, default=None):
+    """Load a data collection, a single number or None to a NumPy array.
+
+    Args:
+        values: A data collection, a single number or None.
+        calc_len: Integer for the length of the array to be returned.
+        default: Default value to be used when the values are None.
+    """
+    if values is None:
+        values = default
+    if isinstance(values, BaseCollection):
+        return np.array(values.values, dtype=np.float64)
+    return np.full(calc_len, values, dtype=np.float64)
+
+
+def _data_to_matrix(data, calc_len, default=None):
+    """Load a list of data collections, numbers or None to a NumPy matrix.
+
+    Args:
+        data: A list with one data collection, single number or None per sensor.
+        calc_len: Integer for the number of values of each row of the matrix.
+        default: Default value to be used when any item of the data is None.
+    """
+    return np.array([_values_to_array(d, calc_len, default) for d in data])
+
+
 def _add_epw_data(epw, rel_air_temps, rel_rad_temps, rel_humids, rel_speeds,
                   base_a_per, use_10m_wind_speed):
     """Add EPW data to zone data collections and align it with these collections."""
@@ -144,14 +160,23 @@ def _add_epw_data(epw, rel_air_temps, rel_rad_temps, rel_humids, rel_speeds,
         rel_speeds.append(epw.wind_speed)
     else:
         rel_speeds.append(epw.wind_speed * (2 / 3))  # conversion used by UTCI
+    for rel_data in (rel_air_temps, rel_rad_temps, rel_humids, rel_speeds):
+        rel_data[-1] = _align_epw_data(rel_data[-1], base_a_per)
+
+
+def _align_epw_data(data, base_a_per, analysis_period=None):
+    """Align an annual EPW data collection with the data of a thermal map.
+
+    Args:
+        data: An annual hourly data collection from an EPW.
+        base_a_per: The AnalysisPeriod of the data in the result_sql.
+        analysis_period: An optional AnalysisPeriod for the thermal map, which
+            will be applied after the data is aligned with the base_a_per.
+    """
     if not base_a_per.is_annual:  # apply sim analysis period to the annual EPW data
-        rel_air_temps[-1] = rel_air_temps[-1].filter_by_analysis_period(base_a_per)
-        rel_rad_temps[-1] = rel_rad_temps[-1].filter_by_analysis_period(base_a_per)
-        rel_humids[-1] = rel_humids[-1].filter_by_analysis_period(base_a_per)
-        rel_speeds[-1] = rel_speeds[-1].filter_by_analysis_period(base_a_per)
+        data = data.filter_by_analysis_period(base_a_per)
     if base_a_per.timestep != 1:  # interpolate the EPW data to timestep
-        t_step = base_a_per.timestep
-        rel_air_temps[-1] = rel_air_temps[-1].interpolate_to_timestep(t_step)
-        rel_rad_temps[-1] = rel_rad_temps[-1].interpolate_to_timestep(t_step)
-        rel_humids[-1] = rel_humids[-1].interpolate_to_timestep(t_step)
-        rel_speeds[-1] = rel_speeds[-1].interpolate_to_timestep(t_step)
+        data = data.interpolate_to_timestep(base_a_per.timestep)
+    if analysis_period is not None and base_a_per != analysis_period:
+        data = data.filter_by_analysis_period(analysis_period)
+    return data
@@ -1,8 +1,13 @@
 """A collection of helper functions for the map sub-package."""
+import os
 import json
+import shutil
+import tempfile
 from pathlib import Path
 import numpy as np
 
+from ._output import write_text_matrix, ThermalMapWriter
+
 
 def binary_mtx_dimension(filepath):
     """Return binary Radiance matrix dimensions if exist.
@@ -16,49 +21,59 @@ def binary_mtx_dimension(filepath):
     Returns:
         nrows, ncols, ncomp, line_count, fmt
     """
-    try:
-        inf = open(filepath, 'rb', encoding='utf-8')
-    except Exception:
-        inf = open(filepath, 'rb')
-    try:
-        first_line = next(inf).rstrip().decode('utf-8')
-        if first_line[:10] != '#?RADIANCE':
-            error_message = (
-                f'File with Radiance header must start with #?RADIANCE not '
-                f'{first_line}.'
-            )
-            raise ValueError(error_message)
-
-        header_lines = [first_line]
-        nrows = ncols = ncomp = None
-        for line in inf:
-            line = line.rstrip().decode('utf-8')
-            header_lines.append(line)
-            if line[:6] == 'NROWS=':
-                nrows = int(line.split('=')[-1])
-            if line[:6] == 'NCOLS=':
-                ncols = int(line.split('=')[-1])
-            if line[:6] == 'NCOMP=':
-                ncomp = int(line.split('=')[-1])
-            if line[:7] == 'FORMAT=':
-                fmt = line.split('=')[-1]
-                break
+    with open(filepath, 'rb') as inf:
+        return _read_radiance_header(inf)
 
-        if not nrows or not ncols:
-            error_message = (
-                f'NROWS or NCOLS was not found in the Radiance header. NROWS '
-                f'is {nrows} and NCOLS is {ncols}. The header must have both '
-                f'elements.'
-            )
-            raise ValueError(error_message)
-        return nrows, ncols, ncomp, len(header_lines) + 1, fmt
-    finally:
-        inf.close()
+
+def _read_radiance_header(inf):
+    """Read the header of a Radiance matrix from a file object opened in binary mode.
+
+    The file object is left at the start of the values after the header such
+    that the position of the values can be obtained with inf.tell().
+
+    Args:
+        inf: A file object of a Radiance matrix file that was opened with 'rb'.
+
+    Returns:
+        nrows, ncols, ncomp, line_count, fmt
+    """
+    first_line = inf.readline().rstrip().decode('utf-8')
+    if first_line[:10] != '#?RADIANCE':
+        error_message = (
+            f'File with Radiance header must start with #?RADIANCE not '
+            f'{first_line}.'
+        )
+        raise ValueError(error_message)
+
+    line_count = 1
+    nrows = ncols = ncomp = fmt = None
+    for line in iter(inf.readline, b''):
+        line = line.rstrip().decode('utf-8')
+        line_count += 1
+        if not line:  # the white line at the end of the header
+            break
+        if line[:6] == 'NROWS=':
+            nrows = int(line.split('=')[-1])
+        elif line[:6] == 'NCOLS=':
+            ncols = int(line.split('=')[-1])
+        elif line[:6] == 'NCOMP=':
+            ncomp = int(line.split('=')[-1])
+        elif line[:7] == 'FORMAT=':
+            fmt = line.split('=')[-1]
+
+    if not nrows or not ncols:
+        error_message = (
+            f'NROWS or NCOLS was not found in the Radiance header. NROWS '
+            f'is {nrows} and NCOLS is {ncols}. The header must have both '
+            f'elements.'
+        )
+        raise ValueError(error_message)
+    return nrows, ncols, ncomp, line_count, fmt
 
 
 def binary_to_array(
         binary_file, nrows=None, ncols=None, ncomp=None, fmt=None,
-        line_count=0):
+        line_count=0, mmap_mode=None):
     """Read a Radiance binary file as a NumPy array.
 
     Args:
@@ -69,34 +84,46 @@ def binary_to_array(
         fmt: Format of the Radiance file. Can be either "ascii", "float", or "double.
         line_count: Number of lines to skip in the input file. Usually used to
             skip the header.
+        mmap_mode: An optional memory-map mode (eg. "r") to be used for files
+            with a "float" or "double" format. When specified, the result is a
+            np.memmap of the values after the header, which can be sliced by
+            rows without loading the whole matrix into memory. This is ignored
+            for "ascii" files, which are always parsed into memory. (Default: None).
 
     Returns:
         A NumPy array.
     """
-    if (nrows or ncols or ncomp or fmt) is None:
-        # get nrows, ncols and header line count
-        nrows, ncols, ncomp, line_count, fmt = binary_mtx_dimension(binary_file)
     with open(binary_file, 'rb') as reader:
-        # skip first n lines from reader
-        for i in range(line_count):
-            reader.readline()
+        if (nrows or ncols or ncomp or fmt) is None:
+            # get nrows, ncols and format from the header
+            nrows, ncols, ncomp, line_count, fmt = _read_radiance_header(reader)
+        else:  # skip first n lines from reader
+            for i in range(line_count):
+                reader.readline()
+        shape = (nrows, ncols) if ncomp in (None, 1) else (nrows, ncols, ncomp)
 
         if fmt == 'ascii':
-            array = np.loadtxt(reader, dtype=np.float32)
-        elif fmt == 'float':
-            array = np.fromfile(reader, dtype=np.float32)
-        elif fmt == 'double':
-            array = np.fromfile(reader, dtype=np.float64)
-
-        if ncomp != 1:
-            array = array.reshape(nrows, ncols, ncomp)
-        else:
-            array = array.reshape(nrows, ncols)
+            array = np.loadtxt(reader, dtype=np.float32, ndmin=2)
+            return array.reshape(shape)
+        dtype = np.float32 if fmt == 'float' else np.float64
+        if mmap_mode is None:
+            return np.fromfile(reader, dtype=dtype).reshape(shape)
+        offset = reader.tell()
+    return np.memmap(binary_file, dtype=dtype, mode=mmap_mode, offset=offset,
+                     shape=shape)
 
-    return array
 
+def load_matrix(matrix_file, delimiter=',', mmap_mode=None):
+    """Load a matrix from a CSV file or a binary NumPy .npy file.
 
-def load_matrix(matrix_file, delimiter=','):
+    Args:
+        matrix_file: Path to a CSV file or a NumPy .npy file with a matrix.
+        delimiter: The delimiter of the values in the CSV file. (Default: ,).
+        mmap_mode: An optional memory-map mode (eg. "r") to be used when the
+            matrix_file is a NumPy .npy file. This allows the matrix to be read
+            lazily and shared between processes without loading it into
+            memory. (Default: None).
+    """
     with open(matrix_file, 'rb') as inf:
         first_char = inf.read(1)
         second_char = inf.read(1)
@@ -112,20 +139,155 @@ def load_matrix(matrix_file, delimiter=','):
             # this may happen if the CSV has trailing commas
             array = array[:, :-1]
     else:
-        array = np.load(matrix_file)
+        array = np.load(matrix_file, mmap_mode=mmap_mode)
 
     return array
 
 
+def analysis_period_moys(analysis_period):
+    """Get an array of the minutes of the year of an analysis period.
+
+    For analysis periods covering whole days, the minutes are computed without
+    building the DateTimes of the analysis period.
+
+    Args:
+        analysis_period: A ladybug AnalysisPeriod.
+    """
+    if analysis_period.st_hour != 0 or analysis_period.end_hour != 23:
+        return np.array(analysis_period.moys, dtype=np.int64)
+    doys = np.array(analysis_period.doys_int, dtype=np.int64)
+    day_mins = np.arange(0, 1440, 60 // analysis_period.timestep)
+    return (((doys - 1) * 1440)[:, None] + day_mins).ravel()
+
+
+def analysis_period_indices(base_period, analysis_period):
+    """Get the indices of the timesteps of a base period that are in an analysis period.
+
+    Args:
+        base_period: The AnalysisPeriod of the base data (eg. an EnergyPlus run period).
+        analysis_period: An AnalysisPeriod for the timesteps to be selected.
+
+    Returns:
+        A NumPy array of integers, which can be used to select the columns of
+        a (items x time) array that fall within the analysis_period.
+    """
+    return np.flatnonzero(np.isin(
+        analysis_period_moys(base_period), analysis_period_moys(analysis_period)))
+
+
+def secant_np(a, b, fn, epsilon, max_iter=100):
+    """Solve for many roots at once using the secant method with NumPy arrays.
+
+    This is the same as the ladybug.rootfinding secant function but each
+    element of the input arrays is treated as its own root-finding problem.
+    Only the elements that have not yet converged are passed to the fn on
+    each iteration.
+
+    Args:
+        a: A NumPy array for the lowest possible boundary of the values you are
+            tying to find.
+        b: A NumPy array for the highest possible boundary of the values you
+            are tying to find. Must be the same length as a.
+        fn: A function representing the relationship between the values you are
+            trying to find and the target condition you are trying to satisfy.
+            It must accept two arguments. The first is a NumPy array of guesses
+            and the second is a NumPy array of integers for the indices of the
+            elements of a and b that the guesses correspond to. It should return
+            a NumPy array of errors with the same length as the guesses.
+        epsilon: The acceptable error in the target_desired_from_funct.
+        max_iter: The maximum number of secant iterations. (Default: 100).
+
+    Returns:
+        root -- A NumPy array with the values that return 0 from the fn. Any
+        elements that failed to converge will be NaN.
+    """
+    a = np.array(a, dtype=np.float64).ravel()
+    b = np.array(b, dtype=np.float64).ravel()
+    root = np.full(a.shape, np.nan)
+    idx = np.arange(a.size)
+
+    with np.errstate(all='ignore'):
+        f1 = fn(a, idx)
+        done = np.abs(f1) <= epsilon
+        root[idx[done]] = a[done]
+        idx, a, b, f1 = idx[~done], a[~done], b[~done], f1[~done]
+        f2 = fn(b, idx)
+        done = np.abs(f2) <= epsilon
+        root[idx[done]] = b[done]
+        idx, a, b, f1, f2 = idx[~done], a[~done], b[~done], f1[~done], f2[~done]
+
+        for _ in range(max_iter):
+            if idx.size == 0:
+                break
+            c = b - f2 / ((f2 - f1) / (b - a))
+            # elements with an undefined slope have failed to converge
+            valid = np.isfinite(c)
+            idx, b, c, f2 = idx[valid], b[valid], c[valid], f2[valid]
+            f3 = fn(c, idx)
+            done = np.abs(f3) < epsilon
+            root[idx[done]] = c[done]
+            keep = ~done & np.isfinite(f3)
+            idx, a, b, f1, f2 = idx[keep], b[keep], c[keep], f2[keep], f3[keep]
+    return root
+
+
+def bisect_np(a, b, fn, epsilon, target=0):
+    """Solve for many roots at once using the bisection method with NumPy arrays.
+
+    This is the same as the ladybug.rootfinding bisect function but each
+    element of the input arrays is treated as its own root-finding problem.
+
+    Args:
+        a: A NumPy array for the lower guesses of the values you are tying to find.
+        b: A NumPy array for the higher guesses of the values you are tying
+            to find. Must be the same length as a.
+        fn: A function representing the relationship between the values you are
+            trying to find and the target condition you are trying to satisfy.
+            It must accept a NumPy array of guesses and a NumPy array of indices
+            in the same manner as the fn of the secant_np function.
+        epsilon: The acceptable error in the target_desired_from_funct.
+        target: The target slope (typically 0 for a local minima or maxima).
+
+    Returns:
+        root -- A NumPy array with the values that give the target_desired_from_funct.
+    """
+    a = np.array(a, dtype=np.float64).ravel()
+    b = np.array(b, dtype=np.float64).ravel()
+    root = (a + b) / 2
+    idx = np.arange(a.size)
+    max_e = 2 * epsilon
+
+    with np.errstate(all='ignore'):
+        active = np.abs(b - a) > max_e
+        idx, a, b = idx[active], a[active], b[active]
+        a_t, b_t = fn(a, idx) - target, fn(b, idx) - target
+        while idx.size != 0:
+            mid = (b + a) / 2
+            mid_t = fn(mid, idx) - target
+            root[idx] = mid
+            to_low = a_t * mid_t < 0
+            to_high = ~to_low & (b_t * mid_t < 0)
+            b = np.where(to_low, mid, b)
+            b_t = np.where(to_low, mid_t, b_t)
+            a = np.where(to_high, mid, a)
+            a_t = np.where(to_high, mid_t, a_t)
+            # elements without a sign change on either side have been found
+            keep = (to_low | to_high) & (np.abs(b - a) > max_e)
+            idx, a, b, a_t, b_t = idx[keep], a[keep], b[keep], a_t[keep], b_t[keep]
+    return root
+
+
 def restore_original_distribution(
         input_folder, output_folder, extension='npy', dist_info=None,
         output_extension='ill', as_text=False, fmt='%.2f', input_delimiter=',',
-        delimiter='tab'):
+        delimiter='tab', workers=1, metadata=None):
     """Restructure files to the original distribution based on the distribution info.
-    
-    It will assume that the files in the input folder are NumPy files. However,
-    if it fails to load the files as arrays it will try to load from binary
-    Radiance files to array.
+
+    The format of each file in the input folder is detected from its first bytes.
+    NumPy files and binary Radiance files are memory-mapped such that only the
+    rows of each output file are read from them while text files are loaded
+    into memory once. The rows are written directly into each output file
+    without concatenating them in memory.
 
     Args:
         input_folder: Path to input folder.
@@ -143,6 +305,12 @@ def restore_original_distribution(
         input_delimiter: Delimiter for the input files. This is used only if the
             input files are text files.
         delimiter: Delimiter for the output files when saved as text.
+        workers: An integer for the number of processes over which the output
+            files will be written in parallel. (Default: 1).
+        metadata: An optional dictionary of JSON-serializable metadata (eg. the
+            header of the data) to be written next to each output NumPy file,
+            which can be loaded with the load_thermal_map function. This is
+            not used when as_text is True. (Default: None).
     """
     if not dist_info:
         _redist_info_file = Path(input_folder, '_redist_info.json')
@@ -159,49 +327,136 @@ def restore_original_distribution(
     if not output_folder.is_dir():
         output_folder.mkdir(parents=True, exist_ok=True)
 
-    src_file = Path()
+    # get the path of each output file and each of the input files
+    if output_extension.startswith('.'):
+        output_extension = output_extension[1:]
+    delimiter = {'tab': '\t', 'space': ' ', 'comma': ','}.get(delimiter, delimiter)
+    output_files, src_files = [], {}
     for f in data:
         output_file = Path(output_folder, f['identifier'])
         # ensure the new folder is created. in case the identifier has a subfolder
         parent_folder = output_file.parent
         if not parent_folder.is_dir():
-            parent_folder.mkdir()
-
-        out_arrays = []
+            parent_folder.mkdir(parents=True, exist_ok=True)
+        if as_text:
+            output_file = output_file.with_suffix(f'.{output_extension}')
+        elif output_file.suffix != '.npy':  # match the extension added by np.save
+            output_file = Path(f'{output_file}.npy')
+        output_files.append(str(output_file))
         for src_info in f['dist_info']:
-            st = src_info['st_ln']
-            end = src_info['end_ln']
-            new_file = Path(input_folder, '%s.%s' % (src_info['identifier'], extension))
-            if not new_file.samefile(src_file):
-                src_file = new_file
-                try:
-                    array = np.load(src_file)
-                except:
-                    try:
-                        array = binary_to_array(src_file)
-                    except:
-                        try:
-                            array = np.loadtxt(
-                                src_file, delimiter=input_delimiter)
-                        except Exception:
-                            raise RuntimeError(
-                                f'Failed to load input file "{src_file}"')
-            slice_array = array[st:end+1,:]
-
-            out_arrays.append(slice_array)
-
-        out_array = np.concatenate(out_arrays)
-        # save numpy array, .npy extension is added automatically
-        if not as_text:
-            np.save(output_file, out_array)
-        else:
-            if output_extension.startswith('.'):
-                output_extension = output_extension[1:]
-            if delimiter == 'tab':
-                delimiter = '\t'
-            elif delimiter == 'space':
-                delimiter = ' '
-            elif delimiter == 'comma':
-                delimiter = ','
-            np.savetxt(output_file.with_suffix(f'.{output_extension}'),
-                       out_array, fmt=fmt, delimiter=delimiter)
+            src_id = src_info['identifier']
+            if src_id not in src_files:
+                src_files[src_id] = str(Path(input_folder, f'{src_id}.{extension}'))
+
+    text_args = (as_text, fmt, delimiter, input_delimiter, metadata)
+    workers = max(int(workers), 1)
+    if workers == 1 or len(data) <= 1:
+        sources = {}
+        for f, output_file in zip(data, output_files):
+            _restore_grid(f['dist_info'], src_files, output_file, *text_args,
+                          sources=sources)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    temp_dir = tempfile.mkdtemp(prefix='comfort_redist_')
+    try:
+        # parse text files once and share them with the workers as .npy files
+        for src_id, src_file in src_files.items():
+            if _matrix_file_format(src_file) == 'text':
+                npy_file = os.path.join(temp_dir, f'{len(os.listdir(temp_dir))}.npy')
+                np.save(npy_file, _load_source_matrix(src_file, input_delimiter))
+                src_files[src_id] = npy_file
+        with ProcessPoolExecutor(max_workers=min(workers, len(data))) as pool:
+            futures = [pool.submit(_restore_grid, f['dist_info'], src_files,
+                                   output_file, *text_args)
+                       for f, output_file in zip(data, output_files)]
+            for future in futures:
+                future.result()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def _restore_grid(grid_dist_info, src_files, output_file, as_text, fmt, delimiter,
+                  input_delimiter, metadata=None, sources=None):
+    """Write the rows of one output file of restore_original_distribution.
+
+    Args:
+        grid_dist_info: A list of dictionaries with the identifier of an input
+            file and the st_ln and end_ln of the rows taken from it.
+        src_files: A dictionary with the path to each input file by identifier.
+        output_file: The path to the output file.
+        as_text: Boolean to note whether the output file is a text file.
+        fmt: Format for the values of the text output file.
+        delimiter: Delimiter for the values of the text output file.
+        input_delimiter: Delimiter for the input files that are text files.
+        metadata: An optional dictionary of metadata to be written next to
+            the output file when it is a NumPy file.
+        sources: An optional dictionary of input file arrays that have already
+            been loaded, which will be updated with any newly loaded files.
+    """
+    sources = {} if sources is None else sources
+    slices = []
+    for src_info in grid_dist_info:
+        src_file = src_files[src_info['identifier']]
+        if src_file not in sources:
+            # only keep the last text file in memory
+            for key in [k for k, v in sources.items() if not isinstance(v, np.memmap)]:
+                del sources[key]
+            sources[src_file] = _load_source_matrix(src_file, input_delimiter)
+        slices.append(sources[src_file][src_info['st_ln']:src_info['end_ln'] + 1])
+
+    if as_text:
+        with open(output_file, 'w') as outf:
+            for slice_array in slices:
+                write_text_matrix(slice_array, outf, delimiter, fmt=fmt)
+        return
+    shape = (sum(len(sl) for sl in slices),) + slices[0].shape[1:]
+    dtype = np.result_type(*[sl.dtype for sl in slices])
+    if metadata is not None:
+        with ThermalMapWriter(output_file, shape, dtype, metadata) as writer:
+            for slice_array in slices:
+                writer.append(slice_array)
+        return
+    out_array = np.lib.format.open_memmap(
+        output_file, mode='w+', dtype=dtype, shape=shape)
+    st = 0
+    for slice_array in slices:
+        out_array[st:st + len(slice_array)] = slice_array
+        st += len(slice_array)
+    out_array.flush()
+    del out_array
+
+
+def _matrix_file_format(file_path):
+    """Get the format of a matrix file from the first bytes in the file.
+
+    Returns:
+        Text for the format of the file, which is either "npy" for NumPy files,
+        "radiance" for Radiance matrix files with a header or "text" for
+        files of delimited values.
+    """
+    with open(file_path, 'rb') as inf:
+        first_bytes = inf.read(10)
+    if first_bytes.startswith(b'\x93NUMPY'):
+        return 'npy'
+    elif first_bytes.startswith(b'#?RADIANCE'):
+        return 'radiance'
+    return 'text'
+
+
+def _load_source_matrix(file_path, delimiter=','):
+    """Load a matrix for restore_original_distribution, memory-mapping it if possible.
+
+    Args:
+        file_path: Path to a NumPy file, a Radiance matrix file or a text file.
+        delimiter: Delimiter for the values if the file is a text file.
+    """
+    file_format = _matrix_file_format(file_path)
+    if file_format == 'npy':
+        return np.load(file_path, mmap_mode='r')
+    elif file_format == 'radiance':
+        return binary_to_array(file_path, mmap_mode='r')
+    try:
+        return np.loadtxt(file_path, delimiter=delimiter, ndmin=2)
+    except Exception:
+        raise RuntimeError(f'Failed to load input file "{file_path}"')
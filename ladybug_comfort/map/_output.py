@@ -0,0 +1,299 @@
+# coding=utf-8
+"""Methods for writing thermal map results to files in blocks of sensors.
+
+Text thermal maps are written by formatting whole blocks of rows with a single
+string formatting operation rather than formatting each value separately.
+
+Binary thermal maps are written to standard .npy files such that they can be
+loaded (or memory-mapped) with np.load. The files are preallocated for all
+sensors, which allows blocks of sensors to be written as soon as they are
+computed rather than holding the whole map in memory. Metadata about each map
+is written to a JSON file next to the .npy file since the header of .npy files
+cannot carry any information besides the dtype and shape of the array.
+"""
+from __future__ import division
+
+import os
+import json
+import gzip
+import numpy as np
+
+BLOCK_SIZE = 1000000  # the approximate number of values formatted at once
+
+
+def write_text_matrix(data, file_path, delimiter=',', precision=None,
+                      scientific=False, compress=False, fmt=None):
+    """Write a matrix of values to a text file with one row of values per line.
+
+    Args:
+        data: A (rows x columns) NumPy array or a list of rows of numbers to be
+            written. One-dimensional data will be written with one value per line.
+        file_path: Path to the text file to be written. This can also be a
+            writable text file object (eg. from click.File).
+        delimiter: Text for the delimiter between the values of each row. (Default: ,).
+        precision: An optional integer for the number of decimal places to which
+            the values are written. If None, the values will be written with
+            the shortest text that represents them exactly, which matches str(v)
+            for each value. Writing with a precision is significantly faster
+            and results in smaller files. (Default: None).
+        scientific: Boolean to note whether the values should be written in
+            scientific notation when a precision is specified. (Default: False).
+        compress: Boolean to note whether the file should be compressed with
+            gzip. Note that this is not applied when the file_path is a file
+            object. (Default: False).
+        fmt: An optional %-format string for each value (eg. %.12f), which
+            overrides the precision and scientific inputs. (Default: None).
+    """
+    try:
+        array = np.asarray(data)
+    except ValueError:  # rows with different numbers of values
+        array = np.empty(len(data), dtype=object)
+        array[:] = [list(row) for row in data]
+    if array.ndim == 1 and array.dtype != object:
+        array = array.reshape(-1, 1)
+    if hasattr(file_path, 'write'):
+        _write_text_blocks(array, file_path, delimiter, precision, scientific, fmt)
+    elif compress:
+        with gzip.open(file_path, 'wt') as outf:
+            _write_text_blocks(array, outf, delimiter, precision, scientific, fmt)
+    else:
+        with open(file_path, 'w') as outf:
+            _write_text_blocks(array, outf, delimiter, precision, scientific, fmt)
+
+
+def _write_text_blocks(array, outf, delimiter, precision, scientific, fmt=None):
+    """Write the rows of an array to a text file object in blocks of rows."""
+    if array.dtype == object or array.ndim != 2:  # ragged rows of values
+        for row in array:
+            outf.write(delimiter.join(str(v) for v in row) + '\n')
+        return
+    if fmt is not None:
+        val_fmt = fmt
+    elif precision is not None:
+        val_fmt = '%.{}{}'.format(int(precision), 'e' if scientific else 'f')
+    elif np.issubdtype(array.dtype, np.integer):
+        val_fmt = '%d'
+    else:  # the shortest text of floats is no faster with a block format
+        for row in array:
+            outf.write(delimiter.join(map(str, row)) + '\n')
+        return
+    row_fmt = delimiter.join([val_fmt] * array.shape[1]) + '\n'
+    block_size = max(BLOCK_SIZE // max(array.shape[1], 1), 1)
+    for st in range(0, len(array), block_size):
+        block = array[st:st + block_size]
+        outf.write((row_fmt * len(block)) % tuple(block.ravel().tolist()))
+
+
+def write_collections_csv(array, header, file_path, metadata=None):
+    """Write a (sensors x time) array to a CSV file of data collections in blocks.
+
+    The CSV file matches the output of the ladybug collections_to_csv function
+    with one hourly data collection for each sensor such that it can be loaded
+    with the collections_from_csv function. However, the CSV is written straight
+    from the array without building a data collection for each sensor and the
+    datetimes of the analysis period are only computed once.
+
+    Args:
+        array: A (sensors x time) NumPy array with one column for each datetime
+            of the analysis period of the header. This can be memory-mapped.
+        header: A ladybug Header for the data collections. The collections will
+            be continuous if the analysis period covers whole days and
+            discontinuous otherwise.
+        file_path: Path to the CSV file to be written.
+        metadata: An optional dictionary of metadata for the data collections,
+            which replaces any metadata of the header. The index of each sensor
+            is added to it under the sensor_index key. (Default: None).
+    """
+    a_per = header.analysis_period
+    coll_type = 'HourlyContinuous' if a_per.st_hour == 0 and a_per.end_hour == 23 \
+        else 'HourlyDiscontinuous'
+    dt_strings = [str(dt) for dt in a_per.datetimes]
+    sensor_count = len(array)
+    assert array.ndim == 2 and array.shape[1] == len(dt_strings), 'Array of shape ' \
+        '{} does not align with the {} datetimes of the analysis period.'.format(
+            array.shape, len(dt_strings))
+    metadata = {} if metadata is None else metadata
+    head_strs = [header.data_type.to_string(), header.unit] + \
+        ['{}: {}'.format(k, v) for k, v in metadata.items()]
+    dt_column = [''] * (len(head_strs) - 1) + [coll_type, str(a_per)]
+
+    with open(file_path, 'w') as outf:
+        # write the header rows, which are the same for all sensors but the index
+        for dt_str, head_str in zip(dt_column, head_strs):
+            outf.write(','.join([dt_str] + [head_str] * sensor_count) + '\n')
+        index_strs = ['sensor_index: {}'.format(i) for i in range(sensor_count)]
+        outf.write(','.join([dt_column[-1]] + index_strs) + '\n')
+        # write the values with one row per datetime in blocks of datetimes
+        block_size = max(BLOCK_SIZE // max(sensor_count, 1), 1)
+        for st in range(0, len(dt_strings), block_size):
+            block = np.asarray(array[:, st:st + block_size]).T.tolist()
+            for dt_str, values in zip(dt_strings[st:st + block_size], block):
+                outf.write(dt_str + ',' + ','.join(map(str, values)) + '\n')
+
+
+def thermal_map_info_path(file_path):
+    """Get the path to the JSON file with the metadata of a binary thermal map.
+
+    Args:
+        file_path: Path to a binary thermal map file.
+    """
+    return '{}_info.json'.format(os.path.splitext(file_path)[0])
+
+
+def load_thermal_map(file_path, mmap_mode='r'):
+    """Load a binary thermal map and its metadata.
+
+    Args:
+        file_path: Path to a binary thermal map file.
+        mmap_mode: The mmap_mode to be used to load the array. Use None to load
+            the whole array into memory. (Default: r).
+
+    Returns:
+        A tuple with two elements.
+
+        -   array: A (sensors x time) NumPy array of the thermal map. Only the
+            sensors that have been written will be included.
+        -   info: A dictionary with the metadata of the thermal map. This will
+            be an empty dictionary if the map has no metadata file.
+    """
+    array = np.load(file_path, mmap_mode=mmap_mode)
+    info_path = thermal_map_info_path(file_path)
+    if not os.path.isfile(info_path):
+        return array, {}
+    with open(info_path) as inf:
+        info = json.load(inf)
+    return array[:info['sensors_written']], info
+
+
+class ThermalMapWriter(object):
+    """Writer of a (sensors x time) thermal map to a .npy file in blocks of sensors.
+
+    Args:
+        file_path: Path to the .npy file to be written. The extension of the file
+            is not changed such that the files can keep the names of the
+            text thermal map files (eg. temperature.csv).
+        shape: A tuple for the (sensors x time) shape of the whole thermal map.
+        dtype: The NumPy dtype of the values in the file. (Default: float32).
+        metadata: An optional dictionary of JSON-serializable metadata about
+            the thermal map (eg. the data type, unit and analysis period from the
+            header of the data and the identifier of the sensor grid).
+        append: Boolean to note whether an existing file should be re-opened
+            such that the writer continues after the sensors that have already
+            been written to it. If False, any existing file will be overwritten
+            with a new preallocated file. (Default: False).
+
+    Properties:
+        * file_path
+        * info_path
+        * array
+        * shape
+        * dtype
+        * metadata
+        * sensors_written
+    """
+    __slots__ = ('_file_path', '_array', '_metadata', '_sensors_written')
+
+    def __init__(self, file_path, shape, dtype=np.float32, metadata=None,
+                 append=False):
+        self._file_path = file_path
+        if append and os.path.isfile(file_path):
+            self._array = np.load(file_path, mmap_mode='r+')
+            assert self._array.shape == tuple(shape), 'Existing thermal map shape ' \
+                '{} does not match {}.'.format(self._array.shape, tuple(shape))
+            _, info = load_thermal_map(file_path)
+            self._sensors_written = info.get('sensors_written', 0)
+            self._metadata = info.get('metadata', {}) if metadata is None \
+                else metadata
+        else:
+            self._array = np.lib.format.open_memmap(
+                file_path, mode='w+', dtype=dtype, shape=tuple(shape))
+            self._sensors_written = 0
+            self._metadata = {} if metadata is None else metadata
+        self._write_info()
+
+    @property
+    def file_path(self):
+        """Get the path to the .npy file of the thermal map."""
+        return self._file_path
+
+    @property
+    def info_path(self):
+        """Get the path to the JSON file with the metadata of the thermal map."""
+        return thermal_map_info_path(self._file_path)
+
+    @property
+    def array(self):
+        """Get the writable memory-mapped array of the whole thermal map.
+
+        This can be used to write sensors in any order (eg. by the run_sensor_chunks
+        function) after which the sensors_written should be set.
+        """
+        return self._array
+
+    @property
+    def shape(self):
+        """Get a tuple for the (sensors x time) shape of the thermal map."""
+        return self._array.shape
+
+    @property
+    def dtype(self):
+        """Get the NumPy dtype of the thermal map."""
+        return self._array.dtype
+
+    @property
+    def metadata(self):
+        """Get a dictionary of metadata about the thermal map."""
+        return self._metadata
+
+    @property
+    def sensors_written(self):
+        """Get or set an integer for the number of sensors written to the file."""
+        return self._sensors_written
+
+    @sensors_written.setter
+    def sensors_written(self, value):
+        assert 0 <= value <= self.shape[0], 'sensors_written must be between ' \
+            '0 and {}. Got {}.'.format(self.shape[0], value)
+        self._sensors_written = int(value)
+
+    def append(self, block):
+        """Append a block of sensors after the sensors that have been written.
+
+        Args:
+            block: A (sensors x time) array for the next sensors of the thermal map.
+        """
+        st = self._sensors_written
+        end = st + len(block)
+        assert end <= self.shape[0], 'Block of {} sensors exceeds the {} ' \
+            'sensors of the thermal map.'.format(len(block), self.shape[0] - st)
+        self._array[st:end] = block
+        self._sensors_written = end
+
+    def close(self):
+        """Flush the values to the .npy file and write the metadata file."""
+        if self._array is not None:
+            self._array.flush()
+            self._write_info()
+            self._array = None
+
+    def _write_info(self):
+        """Write the JSON file with the metadata of the thermal map."""
+        info = {
+            'shape': list(self._array.shape),
+            'dtype': self._array.dtype.str,
+            'sensors_written': self._sensors_written,
+            'metadata': self._metadata
+        }
+        with open(self.info_path, 'w') as outf:
+            json.dump(info, outf)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __repr__(self):
+        return 'ThermalMapWriter: {} [{}/{} sensors]'.format(
+            self._file_path, self._sensors_written,
+            self.shape[0] if self._array is not None else '-')
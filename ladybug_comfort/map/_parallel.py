@@ -0,0 +1,318 @@
+# coding=utf-8
+"""Methods for evaluating thermal maps over chunks of sensors in parallel.
+
+Thermal maps and matrices are embarrassingly parallel across sensors. The functions
+here split (sensors x time) matrices into chunks of rows and evaluate each chunk
+in a pool of worker processes. Inputs are shared with the workers through
+memory-mapped .npy files rather than pickled data collections and the workers
+write their results into preallocated memory-mapped outputs.
+"""
+from __future__ import division
+
+import os
+import math
+import shutil
+import tempfile
+import numpy as np
+
+from ladybug.header import Header
+from ladybug.datatype.speed import AirSpeed
+from ladybug.datacollection import HourlyContinuousCollection
+
+from ..collection.utci import UTCI
+from .adaptive import adaptive_comfort_np
+from .pmv import predicted_mean_vote_np, predicted_mean_vote_no_set_np, \
+    thermal_condition_np as thermal_condition_pmv_np
+from .utci import universal_thermal_climate_index_np, thermal_condition_np, \
+    thermal_condition_eleven_point_np
+from .pet import physiologic_equivalent_temperature_np, pet_category_np, \
+    thermal_condition_np as thermal_condition_pet_np
+
+
+def run_sensor_chunks(function, arrays, args=(), workers=1, chunk_size=None,
+                      out=None):
+    """Evaluate a function over chunks of sensors and assemble the results in order.
+
+    Args:
+        function: A module-level function that accepts one (sensors x time) array
+            for each of the input arrays followed by the args. It must return
+            a tuple of arrays that each have one row per input sensor.
+        arrays: A list of (sensors x time) NumPy arrays, which all have the
+            same number of rows. One-dimensional arrays can also be included
+            and these will be passed in full to the function for each chunk
+            (eg. for values with one item per time that are shared by all sensors).
+            Arrays that are memory-mapped from .npy files (eg. from np.load with
+            mmap_mode='r') are shared with the worker processes without being copied.
+        args: A tuple of additional arguments to be passed to the function
+            for each chunk. These must be picklable when workers is greater
+            than 1. (Default: ()).
+        workers: An integer for the number of processes over which the chunks
+            will be evaluated. (Default: 1).
+        chunk_size: An integer for the number of sensors in each chunk. If None,
+            the sensors will be split evenly between the workers while keeping
+            each chunk to roughly one million values in order to bound the
+            memory of the calculation. (Default: None).
+        out: An optional tuple with a preallocated (sensors x time) array for each
+            output of the function into which the results will be written as
+            each chunk is computed (eg. the arrays of ThermalMapWriters). When
+            these are memory-mapped .npy files, the worker processes write
+            directly into the files. (Default: None).
+
+    Returns:
+        A tuple with a (sensors x time) NumPy array for each output of the function.
+        This will be the out arrays if they are specified.
+    """
+    arrays, args = tuple(arrays), tuple(args)
+    sensor_count = len(arrays[0])
+    workers = max(int(workers), 1)
+    if chunk_size is None:
+        sensor_size = int(np.prod(arrays[0].shape[1:]))
+        chunk_size = min(int(math.ceil(sensor_count / workers)),
+                         1000000 // max(sensor_size, 1)) or 1
+    chunks = [(st, min(st + chunk_size, sensor_count))
+              for st in range(0, sensor_count, chunk_size)]
+    if len(chunks) <= 1 and out is None:
+        return tuple(function(*(arrays + args)))
+
+    # get the arrays into which the results of each chunk will be written
+    if out is None:
+        out_specs = chunk_output_specs(function, arrays, args)
+    else:
+        out = tuple(out)
+        out_specs = [(res.dtype, res.shape) for res in out]
+    if workers == 1 or len(chunks) <= 1:
+        results = out or \
+            tuple(np.empty(shape, dtype=dtype) for dtype, shape in out_specs)
+        for st, end in chunks:
+            chunk_res = function(*(_chunk_arrays(arrays, st, end) + args))
+            for result, res in zip(results, chunk_res):
+                result[st:end] = res
+        return results
+
+    from concurrent.futures import ProcessPoolExecutor
+    temp_dir = tempfile.mkdtemp(prefix='comfort_map_')
+    try:
+        # get .npy files of the inputs that the workers will memory-map
+        in_files, saved_files = [], {}
+        for i, array in enumerate(arrays):
+            in_file = _memmap_file(array) or saved_files.get(id(array))
+            if in_file is None:
+                in_file = os.path.join(temp_dir, 'input_{}.npy'.format(i))
+                np.save(in_file, np.ascontiguousarray(array))
+                saved_files[id(array)] = in_file
+            in_files.append(in_file)
+
+        # preallocate the .npy files into which the workers will write the outputs
+        out_files = []
+        for i, (dtype, shape) in enumerate(out_specs):
+            out_file = _memmap_file(out[i]) if out is not None else None
+            if out_file is not None:
+                out[i].flush()
+                out_files.append(out_file)
+                continue
+            out_file = os.path.join(temp_dir, 'output_{}.npy'.format(i))
+            out_array = np.lib.format.open_memmap(
+                out_file, mode='w+', dtype=dtype, shape=shape)
+            del out_array  # close the file before the workers open it
+            out_files.append(out_file)
+
+        # evaluate each chunk in the process pool
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            futures = [pool.submit(_run_chunk, function, in_files, out_files,
+                                   st, end, args) for st, end in chunks]
+            for future in futures:
+                future.result()
+
+        # load the outputs into memory before the files are removed
+        if out is None:
+            results = tuple(np.array(np.load(fp, mmap_mode='r')) for fp in out_files)
+        else:
+            for result, out_file in zip(out, out_files):
+                if _memmap_file(result) != out_file:
+                    result[:] = np.load(out_file, mmap_mode='r')
+            results = out
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    return results
+
+
+def chunk_output_specs(function, arrays, args=()):
+    """Get the dtype and shape of each output of a function evaluated over all sensors.
+
+    This is useful for preallocating the out arrays of run_sensor_chunks
+    (eg. with ThermalMapWriters) and it only evaluates the function for the
+    first sensor.
+
+    Args:
+        function: A module-level function that accepts one (sensors x time) array
+            for each of the input arrays followed by the args.
+        arrays: A list of (sensors x time) NumPy arrays as they would be passed
+            to run_sensor_chunks.
+        args: A tuple of additional arguments to be passed to the function.
+
+    Returns:
+        A list with a tuple of (dtype, shape) for each output of the function.
+    """
+    arrays, args = tuple(arrays), tuple(args)
+    probe = function(*(_chunk_arrays(arrays, 0, 1) + args))
+    return [(res.dtype, (len(arrays[0]),) + res.shape[1:]) for res in probe]
+
+
+def _run_chunk(function, in_files, out_files, start, stop, args):
+    """Evaluate a function over one chunk of sensors within a worker process."""
+    arrays = _chunk_arrays([np.load(fp, mmap_mode='r') for fp in in_files], start, stop)
+    for out_file, result in zip(out_files, function(*(arrays + args))):
+        out_array = np.load(out_file, mmap_mode='r+')
+        out_array[start:stop] = result
+        out_array.flush()
+        del out_array
+
+
+def _chunk_arrays(arrays, start, stop):
+    """Get the rows of a chunk of sensors from a list of input arrays."""
+    return tuple(a[start:stop] if a.ndim > 1 else a for a in arrays)
+
+
+def _memmap_file(array):
+    """Get the path to the .npy file of an array if it is a whole memory-mapped file.
+
+    This will be None if the array is not memory-mapped or it is only a part of
+    the array in the file.
+    """
+    if not isinstance(array, np.memmap) or not array.flags.c_contiguous:
+        return None
+    file_path = array.filename
+    if file_path is None:
+        return None
+    try:  # the array may be memory-mapped from a file that is not a .npy file
+        ref_array = np.load(file_path, mmap_mode='r')
+    except (ValueError, OSError):
+        return None
+    if ref_array.shape == array.shape and ref_array.dtype == array.dtype and \
+            ref_array.offset == array.offset:
+        return file_path
+    return None
+
+
+def pmv_map_chunk(air_temp, rad_temp, rel_h, vel, met_rate, clo_value,
+                  write_op_map, comfort_par):
+    """Get the temperature, condition and intensity for a chunk of a PMV map.
+
+    Args:
+        air_temp: A (sensors x time) array of air temperatures in Celsius.
+        rad_temp: A (sensors x time) array of mean radiant temperatures in Celsius.
+        rel_h: A (sensors x time) array of relative humidity in percent.
+        vel: A (sensors x time) array of air speeds in m/s.
+        met_rate: An array of metabolic rates in met with one value per time.
+        clo_value: An array of clothing levels in clo with one value per time.
+        write_op_map: Boolean to note whether the temperature should be the
+            operative temperature (True) or the SET (False).
+        comfort_par: A PMVParameter to set the assumptions of the PMV model.
+    """
+    sa_thresh = comfort_par.still_air_threshold
+    if write_op_map:
+        result = predicted_mean_vote_no_set_np(
+            air_temp, rad_temp, vel, rel_h, met_rate, clo_value, 0, sa_thresh)
+        temperature = (air_temp + rad_temp) / 2
+    else:
+        result = predicted_mean_vote_np(
+            air_temp, rad_temp, vel, rel_h, met_rate, clo_value, 0, sa_thresh)
+        temperature = result['set']
+    condition = thermal_condition_pmv_np(result['pmv'], result['ppd'], comfort_par)
+    return temperature, condition, result['pmv']
+
+
+def adaptive_map_chunk(air_temp, rad_temp, vel, prevail_temp, comfort_par):
+    """Get the temperature, condition and intensity for a chunk of an Adaptive map.
+
+    Args:
+        air_temp: A (sensors x time) array of air temperatures in Celsius.
+        rad_temp: A (sensors x time) array of mean radiant temperatures in Celsius.
+        vel: A (sensors x time) array of air speeds in m/s or an array
+            with one air speed per time to be used for all sensors.
+        prevail_temp: An array of prevailing outdoor temperatures in Celsius
+            with one value per time.
+        comfort_par: An AdaptiveParameter to set the assumptions of the model.
+    """
+    temperature = (np.asarray(air_temp) + np.asarray(rad_temp)) / 2
+    result = adaptive_comfort_np(prevail_temp, temperature, vel, comfort_par)
+    return temperature, result['thermal_condition'], result['deg_comf']
+
+
+def utci_map_chunk(air_temp, rel_h, rad_temp, vel, headers, comfort_par):
+    """Get the temperature, condition and intensity for a chunk of a UTCI map.
+
+    Args:
+        air_temp: A (sensors x time) array of air temperatures in Celsius.
+        rel_h: A (sensors x time) array of relative humidity in percent.
+        rad_temp: A (sensors x time) array of mean radiant temperatures in Celsius.
+        vel: A (sensors x time) array of meteorological wind speeds in m/s.
+        headers: A tuple with the Headers of the air temperature, relative
+            humidity and radiant temperature.
+        comfort_par: A UTCIParameter to set the assumptions of the UTCI model.
+    """
+    air_head, hum_head, rad_head = headers
+    spd_head = Header(AirSpeed(), 'm/s', air_head.analysis_period)
+    temperature, condition, condition_intensity = [], [], []
+    for t_a, rh, t_r, spd in zip(air_temp, rel_h, rad_temp, vel):
+        utci_obj = UTCI(
+            _row_to_data(air_head, t_a), _row_to_data(hum_head, rh),
+            _row_to_data(rad_head, t_r), _row_to_data(spd_head, spd),
+            comfort_parameter=comfort_par)
+        temperature.append(utci_obj.universal_thermal_climate_index.values)
+        condition.append(utci_obj.thermal_condition.values)
+        condition_intensity.append(utci_obj.thermal_condition_eleven_point.values)
+    return np.array(temperature), np.array(condition), np.array(condition_intensity)
+
+
+def utci_mtx_chunk(air_temp, rad_temp, rel_h, wind_speed, comfort_par):
+    """Get the temperature, condition and intensity for a chunk of a UTCI matrix.
+
+    Args:
+        air_temp: A (sensors x time) array of air temperatures in Celsius.
+        rad_temp: A (sensors x time) array of mean radiant temperatures in Celsius.
+        rel_h: A (sensors x time) array of relative humidity in percent.
+        wind_speed: A (sensors x time) array of meteorological wind speeds in m/s
+            or an array with one wind speed per time to be used for all sensors.
+        comfort_par: A UTCIParameter to set the assumptions of the UTCI model.
+    """
+    out = np.empty(np.broadcast(air_temp, rad_temp, wind_speed, rel_h).shape)
+    temper = universal_thermal_climate_index_np(
+        air_temp, rad_temp, wind_speed, rel_h, out=out)
+    cond = thermal_condition_np(temper, comfort_par)
+    cond_intensity = thermal_condition_eleven_point_np(temper, comfort_par)
+    return temper, cond, cond_intensity
+
+
+def pet_mtx_chunk(air_temp, rad_temp, rel_h, air_speed, met_rate, clo_value,
+                  comfort_par, b_press=101325):
+    """Get the temperature, condition and intensity for a chunk of a PET matrix.
+
+    Args:
+        air_temp: A (sensors x time) array of air temperatures in Celsius.
+        rad_temp: A (sensors x time) array of mean radiant temperatures in Celsius.
+        rel_h: A (sensors x time) array of relative humidity in percent.
+        air_speed: A (sensors x time) array of air speeds in m/s or an array
+            with one air speed per time to be used for all sensors.
+        met_rate: An array of metabolic rates in met with one value per time.
+        clo_value: An array of clothing levels in clo with one value per time.
+        comfort_par: A PETParameter to set the assumptions of the PET model.
+        b_press: The air pressure in Pa as a single number or an array with one
+            value per time (eg. the atmospheric station pressure of an EPW).
+            (Default: 101325 Pa for sea level).
+    """
+    result = physiologic_equivalent_temperature_np(
+        air_temp, rad_temp, air_speed, rel_h, met_rate, clo_value,
+        comfort_par.age, comfort_par.sex, comfort_par.height,
+        comfort_par.body_mass, comfort_par.posture, b_press)
+    temper = result['pet']
+    cond_intensity = pet_category_np(temper, comfort_par.humid_acclimated)
+    cond = thermal_condition_pet_np(cond_intensity)
+    return temper, cond, cond_intensity
+
+
+def _row_to_data(header, values):
+    """Convert a row of an array into a data collection with a given header."""
+    data = HourlyContinuousCollection(header.duplicate(), values.tolist())
+    data._validated_a_period = True
+    return data
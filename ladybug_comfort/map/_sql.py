@@ -0,0 +1,195 @@
+# coding=utf-8
+"""Methods for bulk extraction of EnergyPlus SQLite results into NumPy arrays."""
+from __future__ import division
+
+import sqlite3
+import numpy as np
+
+from ladybug.sql import SQLiteResult
+from ladybug.header import Header
+from ladybug.analysisperiod import AnalysisPeriod
+from ladybug.datacollection import HourlyContinuousCollection
+
+from ._helper import analysis_period_indices
+from ._cache import get_cache_dir, file_hash, cache_key, load_cached, save_cached
+
+
+def sql_output_arrays(result_sql, output_names, analysis_period=None,
+                      dtype=np.float64):
+    """Get NumPy arrays for several timeseries outputs of an EnergyPlus SQLite file.
+
+    Each output is extracted with a single query and the values are placed
+    straight into a (keys x time) array without building any data collections.
+
+    Args:
+        result_sql: Path to an SQLite file that was generated by EnergyPlus or
+            a ladybug SQLiteResult object. This file must contain hourly or
+            sub-hourly results for the outputs.
+        output_names: A list of EnergyPlus output names to be extracted
+            (eg. "Zone Mean Air Temperature").
+        analysis_period: An optional AnalysisPeriod to select the columns of
+            the arrays. If None, the arrays will be for the entire run period
+            of the result_sql. (Default: None).
+        dtype: The NumPy dtype of the arrays. (Default: np.float64).
+
+    Returns:
+        A tuple with two values.
+
+        * output_arrays -- A dictionary with one key for each output name that
+            was found in the result_sql. Each value is a tuple with three items:
+
+            -   values: A (keys x time) NumPy array of the output values.
+
+            -   key_index: A dictionary that maps each upper-case key of the
+                output (eg. zone or surface name) to its row in the values.
+
+            -   header: A ladybug Header for the output, which can be duplicated
+                to create data collections from the rows of the values.
+
+        * run_period -- The AnalysisPeriod of the first run period in the result_sql.
+            This will be None if none of the outputs were found.
+
+        When a cache directory has been set with the set_cache_dir function of
+        the _cache module, the arrays of outputs that have already been extracted
+        from the same result_sql are read-only memory-mapped arrays.
+    """
+    sql_obj = result_sql if isinstance(result_sql, SQLiteResult) \
+        else SQLiteResult(result_sql)
+    output_arrays, run_period, col_i = {}, None, None
+
+    # load any outputs that have already been cached from the same inputs
+    cache_keys = {}
+    if get_cache_dir() is not None:
+        sql_hash = file_hash(sql_obj.file_path)
+        a_per_str = None if analysis_period is None else \
+            (str(analysis_period), analysis_period.is_leap_year)
+        for output_name in output_names:
+            key = cache_key('sql', sql_hash, output_name, a_per_str,
+                            np.dtype(dtype).str)
+            cached = load_cached(key)
+            if cached is None:
+                cache_keys[output_name] = key
+            elif cached[1]['header'] is not None:
+                values, info = cached[0]['values'], cached[1]
+                header = Header.from_dict(info['header'])
+                output_arrays[output_name] = (values, info['key_index'], header)
+                run_period = AnalysisPeriod.from_dict(info['run_period'])
+        output_names = [name for name in output_names if name in cache_keys]
+        if len(output_names) == 0:
+            return output_arrays, run_period
+
+    conn = sqlite3.connect(sql_obj.file_path)
+    try:
+        c = conn.cursor()
+        for output_name in output_names:
+            # extract all indices in the ReportDataDictionary with the output_name
+            c.execute('SELECT ReportDataDictionaryIndex, KeyValue, ReportingFrequency, '
+                      'Units FROM ReportDataDictionary WHERE Name=?', (output_name,))
+            header_rows = c.fetchall()
+            if len(header_rows) == 0:
+                _cache_output(cache_keys, output_name)
+                continue
+            freq = header_rows[0][2]
+            header_rows = [row for row in header_rows if row[2] == freq]
+
+            # extract all data of the output as (dictionary index, time index, value)
+            rel_indices = ','.join(str(int(row[0])) for row in header_rows)
+            c.execute('SELECT ReportDataDictionaryIndex, TimeIndex, Value FROM '
+                      'ReportData WHERE ReportDataDictionaryIndex IN ({})'.format(
+                          rel_indices))
+            data = np.array(c.fetchall(), dtype=np.float64).reshape(-1, 3)
+            if len(data) == 0:
+                _cache_output(cache_keys, output_name)
+                continue
+            times, time_col = np.unique(data[:, 1], return_inverse=True)
+
+            # get the run period and the columns that are within the analysis period
+            if col_i is None:
+                run_period, report_freq, mult = \
+                    sql_obj._extract_run_period(int(times[0]), int(times[-1]))
+                if not isinstance(report_freq, int) and report_freq != 'Hourly':
+                    raise ValueError(
+                        'EnergyPlus reporting frequency must be Hourly or Timestep '
+                        'to use thermal mapping. Not {}.'.format(report_freq))
+                if mult:  # there are multiple run periods; use the first one
+                    run_period = sql_obj._extract_all_run_period(
+                        report_freq, run_period.timestep, run_period.is_leap_year)[0]
+                col_i = np.arange(len(run_period))
+                if analysis_period is not None and analysis_period != run_period:
+                    col_i = analysis_period_indices(run_period, analysis_period)
+
+            # place the values into a (keys x time) array
+            dict_indices = np.array([row[0] for row in header_rows], dtype=np.float64)
+            sort_i = np.argsort(dict_indices)
+            key_row = sort_i[np.searchsorted(dict_indices, data[:, 0], sorter=sort_i)]
+            values = np.zeros((len(header_rows), len(times)), dtype=dtype)
+            values[key_row, time_col] = data[:, 2]
+            values = values[:, col_i]
+            units = header_rows[0][3]
+            if units == 'J':
+                values /= 3600000.
+                units = 'kWh'
+            key_index = {row[1].upper(): i for i, row in enumerate(header_rows)}
+            data_type, units = SQLiteResult._data_type_from_unit(units, output_name)
+            a_per = run_period if analysis_period is None else analysis_period
+            header = Header(data_type, units, a_per, {'type': output_name})
+            output_arrays[output_name] = (values, key_index, header)
+            _cache_output(cache_keys, output_name, values, key_index, header, run_period)
+        conn.close()  # ensure connection is always closed
+    except Exception:
+        conn.close()  # ensure connection is always closed
+        raise
+    return output_arrays, run_period
+
+
+def sql_output_rows(output_array, keys):
+    """Get a (keys x time) array for a list of keys of an output from sql_output_arrays.
+
+    Args:
+        output_array: A tuple of (values, key_index, header) for an output, which
+            is one of the values of the dictionary returned by sql_output_arrays.
+        keys: A list of keys (eg. zone or surface names) for the rows to be
+            returned. The keys are case-insensitive.
+    """
+    values, key_index = output_array[0], output_array[1]
+    return values[[key_index[key.upper()] for key in keys]]
+
+
+def sql_output_data(output_array, key, key_group='Zone'):
+    """Get a data collection for one key of an output from sql_output_arrays.
+
+    Args:
+        output_array: A tuple of (values, key_index, header) for an output, which
+            is one of the values of the dictionary returned by sql_output_arrays.
+        key: The key (eg. zone or surface name) for which a data collection
+            will be returned. The key is case-insensitive.
+        key_group: Text for the metadata key under which the key will be
+            written into the header of the data collection. (Default: Zone).
+    """
+    values, key_index, header = output_array
+    key = key.upper()
+    metadata = header.metadata.copy()
+    metadata[key_group] = key
+    new_header = Header(header.data_type, header.unit, header.analysis_period, metadata)
+    data = HourlyContinuousCollection(new_header, values[key_index[key]].tolist())
+    data._validated_a_period = True
+    return data
+
+
+def _cache_output(cache_keys, output_name, values=None, key_index=None,
+                  header=None, run_period=None):
+    """Save an output of sql_output_arrays to the cache if it has a cache key.
+
+    Outputs that were not found in the result_sql are cached without any values.
+    """
+    try:
+        key = cache_keys[output_name]
+    except KeyError:  # no cache directory has been set
+        return
+    arrays = {} if values is None else {'values': values}
+    info = {
+        'key_index': key_index,
+        'header': None if header is None else header.to_dict(),
+        'run_period': None if run_period is None else run_period.to_dict()
+    }
+    save_cached(key, arrays, info)
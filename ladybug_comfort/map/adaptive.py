@@ -0,0 +1,352 @@
+# coding=utf-8
+"""Utility functions for calculating Adaptive thermal comfort.
+
+This module is devoted to calculating Adaptive comfort with NumPy.
+"""
+from __future__ import division
+
+import numpy as np
+
+from ..adaptive import neutral_temperature_conditioned
+from ..parameter.adaptive import AdaptiveParameter
+
+
+def adaptive_comfort_ashrae55_np(t_prevail, to):
+    """Get adaptive comfort criteria according to ASHRAE-55 with NumPy arrays.
+
+    This function is the same as the base adaptive_comfort_ashrae55 function
+    but it uses NumPy arrays of any matching (or broadcastable) shape.
+
+    Args:
+        t_prevail: The prevailing outdoor temperature [C] as a NumPy array.
+        to: Operative Temperature [C] as a NumPy array.
+
+    Returns:
+        A dictionary containing results with the following keys
+
+        -   to : Operative Temperature [C].
+        -   t_comf : Adaptive comfort neutral temperature (desired by occupants) [C].
+        -   deg_comf: The difference between the operative temperature (to)
+            and the adaptive comfort neutral temperature (t_comf) [C].
+    """
+    t_prevail = np.clip(np.asarray(t_prevail, dtype=np.float64), 10.0, 33.5)
+    t_comf = 0.31 * t_prevail + 17.8
+    return {'to': to, 't_comf': t_comf, 'deg_comf': to - t_comf}
+
+
+def adaptive_comfort_en15251_np(t_prevail, to):
+    """Get adaptive comfort criteria according to the EN standard with NumPy arrays.
+
+    This function is the same as the base adaptive_comfort_en15251 function
+    but it uses NumPy arrays of any matching (or broadcastable) shape.
+
+    Args:
+        t_prevail: The prevailing outdoor temperature [C] as a NumPy array.
+        to: Operative Temperature [C] as a NumPy array.
+
+    Returns:
+        A dictionary containing results with the following keys
+
+        -   to : Operative Temperature [C].
+        -   t_comf : Adaptive comfort neutral temperature (desired by occupants) [C].
+        -   deg_comf: The difference between the operative temperature (to)
+            and the adaptive comfort neutral temperature (t_comf) [C].
+    """
+    t_prevail = np.clip(np.asarray(t_prevail, dtype=np.float64), 10.0, 30.0)
+    t_comf = 0.33 * t_prevail + 18.8
+    return {'to': to, 't_comf': t_comf, 'deg_comf': to - t_comf}
+
+
+def adaptive_comfort_conditioned_np(t_prevail, to, conditioning, model):
+    """Get adaptive comfort for heated/cooled operation with NumPy arrays.
+
+    This function is the same as the base adaptive_comfort_conditioned function
+    but it uses NumPy arrays of any matching (or broadcastable) shape.
+
+    Args:
+        t_prevail: The prevailing outdoor temperature [C] as a NumPy array.
+        to: Operative Temperature [C] as a NumPy array.
+        conditioning: A number between 0 and 1 that represents how "conditioned" vs.
+            "free-running" the building is.
+        model: The comfort standard, which will be used to represent the "free-running"
+            function.  Chose from: 'EN-16798', 'ASHRAE-55'.
+
+    Returns:
+        A dictionary containing results with the following keys
+
+        -   to : Operative Temperature [C].
+        -   t_comf : Adaptive comfort neutral temperature (desired by occupants) [C].
+        -   deg_comf: The difference between the operative temperature (to)
+            and the adaptive comfort neutral temperature (t_comf) [C].
+    """
+    t_prevail = np.clip(np.asarray(t_prevail, dtype=np.float64), 10.0, 30.0)
+    t_comf = neutral_temperature_conditioned(t_prevail, conditioning, model)
+    return {'to': to, 't_comf': t_comf, 'deg_comf': to - t_comf}
+
+
+def cooling_effect_ashrae55_np(vel, to, tp=None):
+    """Get ASHRAE-55 cooling effect as a result of elevated air speed with NumPy arrays.
+
+    Args:
+        vel: Relative air velocity [m/s] as a NumPy array.
+        to : Operative Temperature [C] as a NumPy array.
+        tp: Prevailing Outdoor Temperature [C]. Currently not used in calculations.
+
+    Returns:
+        ce -- A NumPy array of cooling effect as a result of elevated air speed [C]
+    """
+    vel = np.asarray(vel, dtype=np.float64)
+    ce = np.where(vel < 0.9, 1.2, np.where(vel < 1.2, 1.8, 2.2))
+    return np.where((vel >= 0.6) & (to >= 25), ce, 0.)
+
+
+def cooling_effect_en16798_np(vel, to, trm):
+    """Get EN-16798 cooling effect as a result of elevated air speed with NumPy arrays.
+
+    Args:
+        vel: Relative air velocity [m/s] as a NumPy array.
+        to : Operative Temperature [C] as a NumPy array.
+        trm: Running Mean Outdoor Air Temperature [C] as a NumPy array.
+
+    Returns:
+        ce -- A NumPy array of cooling effect as a result of elevated air speed [C]
+    """
+    vel = np.asarray(vel, dtype=np.float64)
+    ce = np.where(vel < 0.9, 1.2, np.where(vel < 1.2, 1.8, 2.2))
+    return np.where((vel >= 0.6) & (to >= 25) & (trm > 12.73), ce, 0.)
+
+
+def cooling_effect_en15251_np(vel, to, trm=None):
+    """Get EN-15251 cooling effect as a result of elevated air speed with NumPy arrays.
+
+    Args:
+        vel: Relative air velocity [m/s] as a NumPy array.
+        to : Operative Temperature [C] as a NumPy array.
+        trm: Running Mean Outdoor Air Temperature [C]. Currently not
+            used in calculations.
+
+    Returns:
+        ce -- A NumPy array of cooling effect as a result of elevated air speed [C]
+    """
+    vel = np.asarray(vel, dtype=np.float64)
+    elevated = (vel >= 0.2) & (to >= 25)
+    # only take the log of the elevated air speeds to avoid warnings for zero speeds
+    ce = 1.7856 * np.log(np.where(elevated, vel, 1.)) + 2.9835
+    return np.where(elevated, ce, 0.)
+
+
+def is_comfortable_np(comfort_result, cooling_effect, comfort_par):
+    """Determine if conditions are comfortable or not.
+
+    Values are one of the following:
+
+    * 0 = uncomfortable
+    * 1 = comfortable
+
+    Args:
+        comfort_result: An adaptive comfort result dictionary from one of the
+            adaptive_comfort NumPy functions.
+        cooling_effect: A NumPy array of cooling effect from elevated air speed.
+        comfort_par: An AdaptiveParameter object with the comfort thresholds.
+    """
+    to, deg_comf = comfort_result['to'], comfort_result['deg_comf']
+    # lower threshold of EN-16798 is 1 degree cooler than upper threshold
+    lower = -comfort_par.neutral_offset if comfort_par.ashrae_or_en \
+        else -comfort_par.neutral_offset - 1
+    comfortable = (to >= comfort_par.minimum_operative) & (deg_comf >= lower) & \
+        (deg_comf <= comfort_par.neutral_offset + cooling_effect)
+    return comfortable.astype(int)
+
+
+def thermal_condition_np(comfort_result, cooling_effect, comfort_par):
+    """Determine whether conditions are cold, neutral or hot.
+
+    Values are one of the following:
+
+    * -1 = cold
+    * 0 = netural
+    * +1 = hot
+
+    Args:
+        comfort_result: An adaptive comfort result dictionary from one of the
+            adaptive_comfort NumPy functions.
+        cooling_effect: A NumPy array of cooling effect from elevated air speed.
+        comfort_par: An AdaptiveParameter object with the comfort thresholds.
+    """
+    comfortable = is_comfortable_np(comfort_result, cooling_effect, comfort_par)
+    return np.where(comfortable == 0,
+                    np.where(comfort_result['deg_comf'] > 0, 1, -1), 0)
+
+
+def adaptive_comfort_np(t_prevail, to, vel, comfort_par=None):
+    """Get all of the adaptive comfort results using the model of an AdaptiveParameter.
+
+    Args:
+        t_prevail: The prevailing outdoor temperature [C] as a NumPy array.
+        to: Operative Temperature [C] as a NumPy array.
+        vel: Relative air velocity [m/s] as a NumPy array.
+        comfort_par: An AdaptiveParameter object to set the comfort standard,
+            the conditioning and the comfort thresholds. If None, the default
+            AdaptiveParameter will be used.
+
+    Returns:
+        A dictionary containing NumPy arrays with the following keys
+
+        -   to : Operative Temperature [C].
+        -   t_comf : Adaptive comfort neutral temperature (desired by occupants) [C].
+        -   deg_comf: The difference between the operative temperature (to)
+            and the adaptive comfort neutral temperature (t_comf) [C].
+        -   ce: Cooling effect as a result of elevated air speed [C].
+        -   is_comfortable: Integers noting whether conditions are comfortable (1)
+            or not (0).
+        -   thermal_condition: Integers noting whether conditions are cold (-1),
+            neutral (0) or hot (+1).
+    """
+    comfort_par = AdaptiveParameter() if comfort_par is None else comfort_par
+    t_prevail = np.asarray(t_prevail, dtype=np.float64)
+    to = np.asarray(to, dtype=np.float64)
+
+    # determine the comfort function to use
+    if comfort_par.conditioning != 0:
+        result = adaptive_comfort_conditioned_np(
+            t_prevail, to, comfort_par.conditioning, comfort_par.standard)
+    elif comfort_par.ashrae_or_en:
+        result = adaptive_comfort_ashrae55_np(t_prevail, to)
+    else:
+        result = adaptive_comfort_en15251_np(t_prevail, to)
+    result['t_comf'] = np.broadcast_to(result['t_comf'], result['deg_comf'].shape)
+
+    # determine the cooling effect function to use
+    if not comfort_par.discrete_or_continuous_air_speed:
+        ce = cooling_effect_en15251_np(vel, to, t_prevail)
+    elif comfort_par.ashrae_or_en:
+        ce = cooling_effect_ashrae55_np(vel, to, t_prevail)
+    else:
+        ce = cooling_effect_en16798_np(vel, to, t_prevail)
+    result['ce'] = np.broadcast_to(ce, result['deg_comf'].shape)
+
+    comfortable = is_comfortable_np(result, ce, comfort_par)
+    result['is_comfortable'] = comfortable
+    result['thermal_condition'] = np.where(
+        comfortable == 0, np.where(result['deg_comf'] > 0, 1, -1), 0)
+    return result
+
+
+def weighted_running_mean_hourly_np(outdoor_temperatures, alpha=0.8):
+    """Get weighted running mean temperatures given hourly outdoor temperatures.
+
+    This function is the same as the base weighted_running_mean_hourly function
+    but it accepts a (sites x hours) NumPy array in order to compute the
+    prevailing temperatures of several sites or scenarios (eg. a batch of EPW
+    files) at once. The daily means are computed by reshaping the hours into
+    days and the exponential running mean is evaluated as a recursive filter
+    over the days for all sites together.
+
+    Args:
+        outdoor_temperatures: A NumPy array of hourly outdoor temperatures in
+            Celsius, where the last axis is the hours. This can be a 1D array
+            for a single site or a (sites x hours) array. There should be at
+            least 168 hours (1 week of data).
+        alpha: A constant between 0 and 1 that governs how quickly the running mean
+            responds to the outdoor temperature. (Default: 0.8).
+
+    Returns:
+        prevailing_temp -- A NumPy array of prevailing outdoor temperatures with
+        the same shape as the input outdoor_temperatures.
+    """
+    temps = np.asarray(outdoor_temperatures, dtype=np.float64)
+    hour_count = temps.shape[-1]
+    assert hour_count >= 168, 'outdoor_temperatures must be for at least ' \
+        'a week (168 values). Got {} values.'.format(hour_count)
+
+    # compute the initial prevailing outdoor temperature by looking over the past week
+    past_week = _daily_means_np(temps[..., -144:])
+    starting_temp = _starting_running_mean_np(past_week, alpha)
+
+    # compute the running mean of each day using the previous day's mean
+    day_count = hour_count // 24
+    daily_means = _daily_means_np(temps[..., :day_count * 24])
+    extra_count = hour_count - day_count * 24
+    run_count = day_count + 1 if extra_count != 0 else day_count
+    daily_run_means = _running_mean_filter_np(
+        starting_temp, daily_means, run_count, alpha)
+
+    # repeat the daily running means for each hour, including any extra hours
+    prevailing_temp = np.repeat(daily_run_means[..., :day_count], 24, axis=-1)
+    if extra_count != 0:
+        extra_temps = np.repeat(daily_run_means[..., -1:], extra_count, axis=-1)
+        prevailing_temp = np.concatenate((prevailing_temp, extra_temps), axis=-1)
+    return prevailing_temp
+
+
+def weighted_running_mean_daily_np(outdoor_temperatures, alpha=0.8):
+    """Get weighted running mean temperatures given average daily outdoor temperatures.
+
+    This function is the same as the base weighted_running_mean_daily function
+    but it accepts a (sites x days) NumPy array in order to compute the
+    prevailing temperatures of several sites or scenarios at once.
+
+    Args:
+        outdoor_temperatures: A NumPy array of daily outdoor temperatures in
+            Celsius, where the last axis is the days. This can be a 1D array
+            for a single site or a (sites x days) array. There should be at
+            least 7 days.
+        alpha: A constant between 0 and 1 that governs how quickly the running mean
+            responds to the outdoor temperature. (Default: 0.8).
+
+    Returns:
+        daily_run_means -- A NumPy array of prevailing outdoor temperatures with
+        the same shape as the input outdoor_temperatures.
+    """
+    temps = np.asarray(outdoor_temperatures, dtype=np.float64)
+    day_count = temps.shape[-1]
+    assert day_count >= 7, 'outdoor_temperatures must have ' \
+        'at least 7 values to be meaningful.'
+
+    # compute the initial prevailing outdoor temperature by looking over the past week
+    starting_temp = _starting_running_mean_np(temps[..., -6:], alpha)
+
+    # the base function uses the first day's mean for both of the first two steps
+    prev_means = np.concatenate((temps[..., :1], temps[..., :-1]), axis=-1)
+    return _running_mean_filter_np(starting_temp, prev_means, day_count, alpha)
+
+
+def _daily_means_np(hourly_values):
+    """Get the mean of each day of hourly values by reshaping the hours into days.
+
+    The hours of each day are summed in order such that the results match
+    the Python sum of each day.
+    """
+    days = hourly_values.reshape(hourly_values.shape[:-1] + (-1, 24))
+    total = days[..., 0]
+    for hour in range(1, 24):
+        total = total + days[..., hour]
+    return total / 24
+
+
+def _starting_running_mean_np(past_days, alpha):
+    """Get the weighted mean of the last 6 daily values over the last axis."""
+    divisor = 1 + alpha + alpha ** 2 + alpha ** 3 + alpha ** 4 + alpha ** 5
+    dividend = past_days[..., -1]
+    for day in range(1, 6):
+        dividend = dividend + alpha ** day * past_days[..., -1 - day]
+    return dividend / divisor
+
+
+def _running_mean_filter_np(starting_temp, prev_means, run_count, alpha):
+    """Evaluate the exponential running mean as a recursive filter over the last axis.
+
+    Args:
+        starting_temp: The running mean of the first day for each site.
+        prev_means: The daily mean of the day before each running mean
+            after the first one.
+        run_count: The number of running means to compute.
+        alpha: The constant that governs how quickly the running mean responds.
+    """
+    daily_run_means = np.empty(np.shape(starting_temp) + (run_count,))
+    daily_run_means[..., 0] = starting_temp
+    inv_alpha = 1 - alpha
+    for day in range(1, run_count):
+        daily_run_means[..., day] = (inv_alpha * prev_means[..., day - 1]) + \
+            alpha * daily_run_means[..., day - 1]
+    return daily_run_means
@@ -6,7 +6,8 @@ import numpy as np
 
 from ladybug.sql import SQLiteResult
 
-from ._helper import binary_to_array
+from ._helper import binary_to_array, analysis_period_moys
+from ._sql import sql_output_arrays
 
 
 def irradiance_contrib_map(
@@ -49,77 +50,71 @@ def irradiance_contrib_map(
     beam_to_beam_out = 'Surface Window Transmitted Beam To Beam Solar Radiation Rate'
     beam_to_diff_out = 'Surface Window Transmitted Beam To Diffuse Solar Radiation Rate'
     diff_to_diff_out = 'Surface Window Transmitted Diffuse Solar Radiation Rate'
-    incident_dat = sql_obj.data_collections_by_output_name(incident_out)
-    beam_to_beam_dat = sql_obj.data_collections_by_output_name(beam_to_beam_out)
-    beam_to_diff_dat = sql_obj.data_collections_by_output_name(beam_to_diff_out)
-    diff_to_diff_dat = sql_obj.data_collections_by_output_name(diff_to_diff_out)
+    sql_arrays, run_period = sql_output_arrays(
+        sql_obj, (incident_out, beam_to_beam_out, beam_to_diff_out, diff_to_diff_out))
 
     # compute beam and diff transmittance for the relevant aperture
-    incident_per_area = _data_for_surface(incident_dat, aperture_id)
-    beam_to_beam = _data_for_surface(beam_to_beam_dat, aperture_id)
-    beam_to_diff = _data_for_surface(beam_to_diff_dat, aperture_id)
-    diff_to_diff = _data_for_surface(diff_to_diff_dat, aperture_id)
+    incident_per_area = _values_for_surface(sql_arrays[incident_out], aperture_id)
+    beam_to_beam = _values_for_surface(sql_arrays[beam_to_beam_out], aperture_id)
+    beam_to_diff = _values_for_surface(sql_arrays[beam_to_diff_out], aperture_id)
+    diff_to_diff = _values_for_surface(sql_arrays[diff_to_diff_out], aperture_id)
     ap_dict = sql_obj.tabular_data_by_name('Exterior Fenestration')
     ap_area = ap_dict[aperture_id.upper()][2] if aperture_id is not None \
-        else ap_dict.values()[0][2]
+        else list(ap_dict.values())[0][2]
     incident = incident_per_area * ap_area
-    dts = incident_per_area.datetimes
-    beam_trans_all, diff_trans_all = {}, {}
-    all_data = zip(beam_to_beam, beam_to_diff, diff_to_diff, incident, dts)
-    for bb, bd, dd, inc, dt in all_data:
-        if inc != 0:
-            try:
-                beam_trans_all[dt.int_hoy].append(bb / inc)
-                diff_trans_all[dt.int_hoy].append((bd + dd) / inc)
-            except KeyError:
-                beam_trans_all[dt.int_hoy] = [bb / inc]
-                diff_trans_all[dt.int_hoy] = [(bd + dd) / inc]
+
+    # average the transmittance over each hour where there is incident solar
+    hoys = analysis_period_moys(run_period) // 60
+    sun_up = incident != 0
+    hour_count = np.bincount(hoys[sun_up], minlength=8784)
+    beam_sum = np.bincount(hoys[sun_up], beam_to_beam[sun_up] / incident[sun_up],
+                           minlength=8784)
+    diff_sum = np.bincount(
+        hoys[sun_up], (beam_to_diff[sun_up] + diff_to_diff[sun_up]) / incident[sun_up],
+        minlength=8784)
 
     # open the sun-up-hours file and get transmittance for just those hours
     with open(sun_up_hours) as soh_f:
         sun_indices = [int(float(h)) for h in soh_f]
-    beam_trans, diff_trans = [], []
-    for s_ind in sun_indices:
-        try:
-            b_trans = sum(beam_trans_all[s_ind]) / len(beam_trans_all[s_ind])
-            d_trans = sum(diff_trans_all[s_ind]) / len(diff_trans_all[s_ind])
-        except KeyError:  # no incident solar on window for that hour
-            b_trans = d_trans = 0
-        beam_trans.append(b_trans)
-        diff_trans.append(d_trans)
+    sun_count = hour_count[sun_indices]
+    has_sun = sun_count != 0  # no incident solar on window for the other hours
+    beam_trans = np.zeros(len(sun_indices))
+    diff_trans = np.zeros(len(sun_indices))
+    beam_trans[has_sun] = beam_sum[sun_indices][has_sun] / sun_count[has_sun]
+    diff_trans[has_sun] = diff_sum[sun_indices][has_sun] / sun_count[has_sun]
 
     # compute the direct irradiance contribution
-    direct_mtx = binary_to_array(direct_specular) * np.array(beam_trans)
+    # memory-map the matrices such that only the result is held in memory
+    direct_mtx = binary_to_array(direct_specular, mmap_mode='r') * beam_trans
 
     # compute the indirect irradiance contribution
-    indirect_mtx = binary_to_array(indirect_specular) * np.array(
-        beam_trans) + binary_to_array(indirect_diffuse) * np.array(diff_trans)
+    indirect_mtx = binary_to_array(indirect_specular, mmap_mode='r') * beam_trans
+    indirect_mtx += binary_to_array(indirect_diffuse, mmap_mode='r') * diff_trans
 
     # compute the ground-reflected irradiance contribution
-    ref_mtx = binary_to_array(ref_specular) * np.array(
-        beam_trans) + binary_to_array(ref_diffuse) * np.array(diff_trans)
+    ref_mtx = binary_to_array(ref_specular, mmap_mode='r') * beam_trans
+    ref_mtx += binary_to_array(ref_diffuse, mmap_mode='r') * diff_trans
 
     return direct_mtx, indirect_mtx, ref_mtx
 
 
-def _data_for_surface(data_colls, aperture_id):
-    """Get a data collection for a specific aperture.
+def _values_for_surface(output_array, aperture_id):
+    """Get an array of values for a specific aperture.
 
     Args:
-        data_colls: A list of data collections from an SQLite file.
-        aperture_id: The identifier if an aperture to be selected from the list of
-            data collections.
+        output_array: A tuple of (values, key_index, header) for an output of
+            the SQLite file, which is one of the values returned by sql_output_arrays.
+        aperture_id: The identifier if an aperture to be selected from the
+            output array.
 
     Return:
-        A data collection for the specified aperture_id.
+        An array of values for the specified aperture_id. If the aperture_id is
+        None or it is not found, the first surface in the output will be used.
     """
+    values, key_index = output_array[0], output_array[1]
     if aperture_id is None:
-        return data_colls[0]
-    ap_id = aperture_id.upper()
-    for dat_c in data_colls:
-        if dat_c.header.metadata['Surface'] == ap_id:
-            return dat_c
-    return data_colls[0]
+        return values[0]
+    return values[key_index.get(aperture_id.upper(), 0)]
 
 
 def _ill_vals(ill_file):
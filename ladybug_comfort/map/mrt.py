@@ -6,18 +6,19 @@ import os
 import json
 import numpy as np
 
-from ladybug.epw import EPW
-from ladybug.sql import SQLiteResult
-from ladybug.sunpath import Sunpath
 from ladybug.datatype.energyflux import Irradiance
 from ladybug.analysisperiod import AnalysisPeriod
 from ladybug.header import Header
+from ladybug.datatype.temperature import MeanRadiantTemperature
 from ladybug.datacollection import HourlyContinuousCollection
 
-from ..solarcal import sharp_from_solar_and_body_azimuth
-from ..collection.solarcal import _HorizontalSolarCalMap, _HorizontalRefSolarCalMap
 from ..parameter.solarcal import SolarCalParameter
-from ._helper import binary_to_array, load_matrix
+from ._helper import binary_mtx_dimension, binary_to_array, load_matrix
+from ._cache import cached_epw
+from ._sql import sql_output_arrays, sql_output_rows
+from .solarcal import get_projection_factor_np, get_projection_factor_simple_np, \
+    sharp_from_solar_and_body_azimuth_np
+from .sunpath import sun_positions_np
 
 
 def shortwave_mrt_map(
@@ -68,16 +69,23 @@ def shortwave_mrt_map(
     is_annual, t_step, lp_yr = a_per.is_annual, a_per.timestep, a_per.is_leap_year
     with open(sun_up_hours) as soh_f:
         sun_indices = [int(float(h) * t_step) for h in soh_f]
+    per_indices = None if is_annual else \
+        [int(round(moy * t_step / 60.)) for moy in a_per.moys]
 
-    # parse each of the .ill files into annual irradiance data collections
-    indirect = _ill_file_to_data(indirect_ill, sun_indices, t_step, lp_yr)
-    direct = _ill_file_to_data(direct_ill, sun_indices, t_step, lp_yr) \
+    def load_ill(ill_file):
+        """Load an .ill file as an array of irradiance over the analysis period."""
+        irr = ill_file_to_array(ill_file, sun_indices, t_step, lp_yr, dtype=np.float64)
+        return irr if per_indices is None else irr[:, per_indices]
+
+    # parse each of the .ill files into arrays of irradiance
+    indirect = load_ill(indirect_ill)
+    direct = load_ill(direct_ill) \
         if direct_ill is not None and os.path.isfile(direct_ill) else \
-        [_blank_ill_data(t_step, lp_yr)] * len(indirect)
-    ref = _ill_file_to_data(ref_ill, sun_indices, t_step, lp_yr) \
+        np.zeros(indirect.shape)
+    ref = load_ill(ref_ill) \
         if ref_ill is not None and os.path.isfile(ref_ill) else None
 
-    # if there are dynamic contributions, then add them to the data collections
+    # if there are dynamic contributions, then add them to the irradiance
     if contributions is not None and os.path.isdir(contributions):
         for dyn_group in os.listdir(contributions):
             # get the file paths to the contributions
@@ -86,20 +94,10 @@ def shortwave_mrt_map(
             direct_con_f = os.path.join(group_path, 'direct.ill')
             ref_con_f = os.path.join(group_path, 'reflected.ill')
             # add the contributions to the irradiance terms
-            indirect_con = _ill_file_to_data(indirect_con_f, sun_indices, t_step, lp_yr)
-            indirect = [rad + c_rad for rad, c_rad in zip(indirect, indirect_con)]
-            direct_con = _ill_file_to_data(direct_con_f, sun_indices, t_step, lp_yr)
-            direct = [rad + c_rad for rad, c_rad in zip(direct, direct_con)]
+            indirect += load_ill(indirect_con_f)
+            direct += load_ill(direct_con_f)
             if ref is not None and os.path.isfile(ref_con_f):
-                ref_con = _ill_file_to_data(ref_con_f, sun_indices, t_step, lp_yr)
-                ref = [rad + c_rad for rad, c_rad in zip(ref, ref_con)]
-
-    # if the analysis is not annual, apply analysis periods
-    if not is_annual:
-        indirect = [data.filter_by_analysis_period(a_per) for data in indirect]
-        direct = [data.filter_by_analysis_period(a_per) for data in direct]
-        if ref is not None:
-            ref = [data.filter_by_analysis_period(a_per) for data in ref]
+                ref += load_ill(ref_con_f)
 
     # if there are any transmittance contributions, then compute and add them
     if transmittance_contribs is not None and os.path.isdir(transmittance_contribs):
@@ -110,74 +108,131 @@ def shortwave_mrt_map(
         shd_grps = [grp for grp in os.listdir(transmittance_contribs)
                     if grp != 'schedules.json']
         for dyn_group in shd_grps:
-            t_sch_head = Header(Irradiance(), 'W/m2', a_per)
-            t_sch = HourlyContinuousCollection(t_sch_head, sch_dict[dyn_group])
+            t_sch = np.array(sch_dict[dyn_group], dtype=np.float64)
+            assert len(t_sch) == len(a_per), 'Transmittance schedule for "{}" has {} ' \
+                'values but the analysis period has {}.'.format(
+                    dyn_group, len(t_sch), len(a_per))
             # get the file paths to the transmittance_contribs
             group_path = os.path.join(transmittance_contribs, dyn_group)
             indirect_con_f = os.path.join(group_path, 'indirect.ill')
             direct_con_f = os.path.join(group_path, 'direct.ill')
             ref_con_f = os.path.join(group_path, 'reflected.ill')
-            # add the transmittance_contribs to the irradiance terms
-            indirect_con = _ill_file_to_data(indirect_con_f, sun_indices, t_step, lp_yr)
-            direct_con = _ill_file_to_data(direct_con_f, sun_indices, t_step, lp_yr)
-            if not is_annual:
-                indirect_con = \
-                    [data.filter_by_analysis_period(a_per) for data in indirect_con]
-                direct_con = \
-                    [data.filter_by_analysis_period(a_per) for data in direct_con]
-            indirect = [rad + ((c_rad - rad) * t_sch)
-                        for rad, c_rad in zip(indirect, indirect_con)]
-            direct = [rad + ((c_rad - rad) * t_sch)
-                      for rad, c_rad in zip(direct, direct_con)]
+            # blend the transmittance_contribs into the irradiance terms
+            indirect += (load_ill(indirect_con_f) - indirect) * t_sch
+            direct += (load_ill(direct_con_f) - direct) * t_sch
             if ref is not None and os.path.isfile(ref_con_f):
-                ref_con = _ill_file_to_data(ref_con_f, sun_indices, t_step, lp_yr)
-                if not is_annual:
-                    ref_con = [data.filter_by_analysis_period(a_per) for data in ref_con]
-                ref = [rad + ((c_rad - rad) * t_sch) for rad, c_rad in zip(ref, ref_con)]
+                ref += (load_ill(ref_con_f) - ref) * t_sch
 
     # if need be, convert total irradiance into indirect irradiance
     if indirect_is_total:
-        indirect = [t_rad - d_rad for t_rad, d_rad in zip(indirect, direct)]
+        indirect -= direct
 
     # compute solar altitudes and sharps
     body_par = SolarCalParameter() if solarcal_par is None else solarcal_par
-    sp = Sunpath.from_location(location)
-    _altitudes = []
-    if body_par.body_azimuth is None:
-        _sharps = [body_par.sharp] * len(a_per)
-        for t_date in a_per.datetimes:
-            sun = sp.calculate_sun_from_date_time(t_date)
-            _altitudes.append(sun.altitude)
+    altitudes, sharps = _solar_altitudes_and_sharps(location, a_per, body_par)
+
+    # pass all arrays through SolarCal and return MRT data collections
+    longwave = np.array([data.values for data in longwave_data], dtype=np.float64)
+    mrt = shortwave_mrt_map_np(
+        altitudes, sharps, longwave, direct, indirect, ref, body_par)
+    base_data = _blank_ill_data(t_step, lp_yr)
+    if not is_annual:
+        base_data = base_data.filter_by_analysis_period(a_per)
+    return [base_data.get_aligned_collection(
+        values, MeanRadiantTemperature(), 'C', mutable=False)
+        for values in mrt.tolist()]
+
+
+def shortwave_mrt_map_np(
+        altitudes, sharps, longwave_mrt, direct_irr, indirect_irr, ref_irr=None,
+        solarcal_par=None, fract_exposed=1, floor_reflectance=0.25):
+    """Get a NumPy array of MRT adjusted for shortwave solar from irradiance arrays.
+
+    This function computes the same horizontal SolarCal model that is used by
+    shortwave_mrt_map but it does so for all sensors and timesteps at once
+    using NumPy arrays.
+
+    Args:
+        altitudes: A 1-D array of solar altitudes in degrees with one value for
+            each timestep of the irradiance arrays.
+        sharps: A 1-D array of solar horizontal angles relative to the front of
+            the person (SHARP) with one value for each timestep. This can also
+            be a single number to be used for all timesteps.
+        longwave_mrt: A NumPy array of longwave mean radiant temperature in C
+            with one row for each sensor and one column for each timestep.
+            This can also be a single row to be used for all sensors.
+        direct_irr: A NumPy array of direct horizontal irradiance in W/m2 with
+            one row for each sensor and one column for each timestep.
+        indirect_irr: A NumPy array of indirect (diffuse) horizontal irradiance
+            in W/m2 that aligns with the direct_irr.
+        ref_irr: An optional NumPy array of ground-reflected horizontal irradiance
+            in W/m2 that aligns with the direct_irr. If None, the floor_reflectance
+            will be used to estimate the reflected irradiance. (Default: None).
+        solarcal_par: Optional SolarCalParameter object to account for
+            properties of the human geometry. (Default: None).
+        fract_exposed: A number or array between 0 and 1 representing the
+            fraction of the body exposed to direct sunlight. (Default: 1).
+        floor_reflectance: A number or array between 0 and 1 for the reflectance
+            of the floor, which is only used when ref_irr is None. (Default: 0.25).
+
+    Returns:
+        A NumPy array of mean radiant temperature in C with one row for each
+        sensor and one column for each timestep.
+    """
+    body_par = SolarCalParameter() if solarcal_par is None else solarcal_par
+    posture = body_par.posture
+    fract_eff = 0.696 if posture == 'seated' else 0.725
+
+    # get the factor to convert direct horizontal irradiance to direct body flux
+    altitudes = np.asarray(altitudes, dtype=np.float64)
+    sharps = np.broadcast_to(np.asarray(sharps, dtype=np.float64), altitudes.shape)
+    sun_up = altitudes >= 2
+    up_alts, up_sharps = altitudes[sun_up], sharps[sun_up]
+    try:
+        proj_fac = get_projection_factor_np(up_alts, up_sharps, posture)
+    except KeyError:
+        proj_fac = get_projection_factor_simple_np(up_alts, up_sharps, posture)
+    dir_factor = np.zeros(altitudes.shape)
+    dir_factor[sun_up] = proj_fac / np.sin(np.radians(up_alts))
+
+    # compute the solar flux on the body and convert it to an MRT delta
+    dir_solar = dir_factor * fract_exposed * direct_irr
+    diff_solar = 0.5 * fract_eff * indirect_irr
+    if ref_irr is None:
+        ref_solar = 0.5 * fract_eff * (indirect_irr + direct_irr) * floor_reflectance
     else:
-        _sharps = []
-        for t_date in a_per.datetimes:
-            sun = sp.calculate_sun_from_date_time(t_date)
-            sharp = sharp_from_solar_and_body_azimuth(sun.azimuth, body_par.body_azimuth)
-            _sharps.append(sharp)
-            _altitudes.append(sun.altitude)
-
-    # duplicate the longwave data if there is only one data collection
-    if len(longwave_data) == 1:
-        longwave_data = [longwave_data[0]] * len(direct)
-
-    # pass all data through the solarcal collections and return MRT data collections
-    mrt_data = []
-    if ref is not None:  # fully-detailed SolarCal with ground reflectance
-        for l_mrt, d_rad, i_rad, r_rad in zip(longwave_data, direct, indirect, ref):
-            scl_obj = _HorizontalRefSolarCalMap(
-                _altitudes, _sharps, d_rad, i_rad, r_rad, l_mrt, None, body_par)
-            mrt_data.append(scl_obj.mean_radiant_temperature)
-    else:  # simpler SolarCal assuming default ground reflectance
-        for l_mrt, d_rad, i_rad in zip(longwave_data, direct, indirect):
-            scl_obj = _HorizontalSolarCalMap(
-                _altitudes, _sharps, d_rad, i_rad, l_mrt, None, None, body_par)
-            mrt_data.append(scl_obj.mean_radiant_temperature)
-    return mrt_data
+        ref_solar = 0.5 * fract_eff * ref_irr
+    s_flux = dir_solar + diff_solar + ref_solar
+    short_erf = s_flux * (body_par.body_absorptivity / body_par.body_emissivity)
+    short_mrt_delta = np.where(sun_up, short_erf / (fract_eff * 6.012), 0)
+    return longwave_mrt + short_mrt_delta
+
+
+def _solar_altitudes_and_sharps(location, analysis_period, solarcal_par):
+    """Get arrays of solar altitudes and SHARPs for each step of an analysis period.
+
+    Args:
+        location: A ladybug Location object to dictate the solar positions.
+        analysis_period: An AnalysisPeriod for the timesteps of the arrays.
+        solarcal_par: A SolarCalParameter object for the body azimuth and sharp.
+    """
+    altitudes, azimuths = sun_positions_np(location, analysis_period)
+    if solarcal_par.body_azimuth is None:
+        sharps = np.full(altitudes.shape, solarcal_par.sharp, dtype=np.float64)
+    else:
+        sharps = sharp_from_solar_and_body_azimuth_np(
+            azimuths, solarcal_par.body_azimuth)
+    return altitudes, sharps
 
 
 def longwave_mrt_map(
-        enclosure_info, modifiers, sql, view_factors, epw, analysis_period=None):
-    """Get MRT data collections adjusted for shortwave using Radiance .ill files.
+        enclosure_info, modifiers, sql, view_factors, epw, analysis_period=None,
+        dtype=np.float32):
+    """Get a matrix of longwave MRT using view factors and surface temperatures.
+
+    Sensors are grouped by the radiant enclosure that they belong to such that
+    the MRT of each group is computed with a single matrix multiplication of
+    the view factors and the surface temperatures.
 
     Args:
         enclosure_info: Path to a JSON file containing information about the radiant
@@ -192,6 +247,12 @@ def longwave_mrt_map(
         analysis_period: An optional AnalysisPeriod to be applied to all results.
             If None, all data collections will be for the entire run period of
             the sql.
+        dtype: The NumPy dtype of the temperature matrices and the resulting
+            MRT matrix. (Default: np.float32).
+
+    Returns:
+        A NumPy array of longwave MRT in C with one row for each sensor and one
+        column for each timestep of the analysis period.
     """
     # load the enclosure information and modifiers list
     with open(enclosure_info) as json_file:
@@ -202,121 +263,151 @@ def longwave_mrt_map(
     srf_order = [line[:-5].upper() for line in mod_lines]
     a_per = analysis_period if analysis_period is not None else AnalysisPeriod()
 
-    # load the indoor surface temperatures if they are needed
-    sql_obj = SQLiteResult(sql) if os.path.isfile(sql) \
-        and os.stat(sql).st_size != 0 else None
+    # load the view factors and group the sensors by the enclosure they belong to
+    vf_data = load_matrix(view_factors).astype(dtype, copy=False)
+    sen_encs = np.array(enclosure_dict['sensor_indices'][:len(vf_data)], dtype=int)
+    vf_data = vf_data[:len(sen_encs)]
+    in_grps = np.unique(sen_encs[sen_encs != -1])
+    out_i = np.flatnonzero(sen_encs == -1)
+
+    # load the surface temperatures from the sql
+    in_avg_outp = 'Zone Mean Radiant Temperature'
+    in_srf_outp = 'Surface Inside Face Temperature'
+    out_srf_outp = 'Surface Outside Face Temperature'
+    sql_outputs = []
     if enclosure_dict['has_indoor']:
-        assert sql_obj is not None, \
+        assert os.path.isfile(sql) and os.stat(sql).st_size != 0, \
             'Indoor sensors were found but no SQLite file was present.'
-        in_avg_outp = 'Zone Mean Radiant Temperature'
-        in_srf_outp = 'Surface Inside Face Temperature'
-        in_avg_dict = {d.header.metadata['Zone']: d for d in
-                       sql_obj.data_collections_by_output_name(in_avg_outp)}
-        in_srf_dict = {d.header.metadata['Surface']: d for d in
-                       sql_obj.data_collections_by_output_name(in_srf_outp)}
-        in_avg = [in_avg_dict[z] for z in zone_order]
-        in_srf = [in_srf_dict[s] for s in srf_order[:-3]]
-        if in_avg[0].header.analysis_period != a_per:
-            in_avg = [d.filter_by_analysis_period(a_per) for d in in_avg]
-            in_srf = [d.filter_by_analysis_period(a_per) for d in in_srf]
-        in_data = []
-        for zone in in_avg:
-            in_list = in_srf + [zone, zone, zone]
-            in_data.append(tuple(zip(*in_list)))
-
-    # load the EPW and outdoor surface temperatures if they are needed
+        sql_outputs.extend([in_avg_outp, in_srf_outp])
+    has_sql = os.path.isfile(sql) and os.stat(sql).st_size != 0
+    if enclosure_dict['has_outdoor'] and has_sql:
+        sql_outputs.append(out_srf_outp)
+    sql_arrays = sql_output_arrays(sql, sql_outputs, a_per, dtype)[0] \
+        if len(sql_outputs) != 0 else {}
+
+    # build the (surfaces x time) temperature matrices for each type of enclosure
+    if enclosure_dict['has_indoor']:
+        in_srf_temps = sql_output_rows(sql_arrays[in_srf_outp], srf_order[:-3])
+        in_avg_temps = sql_output_rows(sql_arrays[in_avg_outp], zone_order)
+        time_count = in_srf_temps.shape[1]
     if enclosure_dict['has_outdoor']:
-        if sql_obj is not None:
-            out_srf_outp = 'Surface Outside Face Temperature'
-            out_srf_dict = {d.header.metadata['Surface']: d for d in
-                            sql_obj.data_collections_by_output_name(out_srf_outp)}
-            out_srf = [out_srf_dict[s] for s in srf_order[:-3]]
-            if out_srf[0].header.analysis_period != a_per:
-                out_srf = [d.filter_by_analysis_period(a_per) for d in out_srf]
-        else:
-            out_srf = []
-        epw_obj = EPW(epw)
+        epw_obj = cached_epw(epw)
         out_avg = epw_obj.dry_bulb_temperature
         out_sky = epw_obj.sky_temperature
         if not a_per.is_annual:
             out_avg = out_avg.filter_by_analysis_period(a_per)
             out_sky = out_sky.filter_by_analysis_period(a_per)
-        out_data = out_srf + [out_avg, out_sky, out_avg]
-        out_data = tuple(zip(*out_data))
-
-    # load the view factors and perform the matrix multiplication with temperature
-    vf_data = load_matrix(view_factors)
-
-    mrt_data = []
-    for sen_enc, view_facs in zip(enclosure_dict['sensor_indices'], vf_data):
-        if sen_enc == -1:  # outdoor sensor
-            temp_data = np.array(out_data)
-        else:  # indoor sensor
-            temp_data = np.array(in_data[sen_enc])
-        sensor_vals = np.sum(view_facs * temp_data, axis=1)
-        mrt_data.append(sensor_vals.tolist())
+        time_count = len(out_avg)
+        out_srf_temps = sql_output_rows(sql_arrays[out_srf_outp], srf_order[:-3]) \
+            if has_sql else np.zeros((0, time_count), dtype=dtype)
+        out_temps = np.concatenate(
+            (out_srf_temps, np.array([out_avg.values, out_sky.values, out_avg.values],
+                                     dtype=dtype)))
+    mrt_data = np.zeros((len(sen_encs), time_count), dtype=dtype)
+
+    # compute MRT for the indoor sensors using the indoor surface temperatures
+    for sen_enc in in_grps:
+        # the last three view factors all see the zone mean radiant temperature
+        grp_i = np.flatnonzero(sen_encs == sen_enc)
+        grp_vfs = vf_data[grp_i]
+        grp_mrt = np.dot(grp_vfs[:, :-3], in_srf_temps)
+        grp_mrt += grp_vfs[:, -3:].sum(axis=1)[:, None] * in_avg_temps[sen_enc]
+        mrt_data[grp_i] = grp_mrt
+
+    # compute MRT for the outdoor sensors using EPW and outdoor surface temperatures
+    if len(out_i) != 0:
+        mrt_data[out_i] = np.dot(vf_data[out_i], out_temps)
 
     return mrt_data
 
 
-def _ill_file_to_data(ill_file, sun_indices, timestep=1, leap_yr=False):
-    """Convert a list of sun-up irradiance from an .ill file into annual irradiance data.
+def ill_file_to_array(ill_file, sun_indices, timestep=1, leap_yr=False,
+                      start_row=0, end_row=None, dtype=np.float32):
+    """Get a NumPy array of annual irradiance from a Radiance .ill file.
+
+    NumPy and binary Radiance files are memory-mapped such that only the requested
+    rows are read from disk. This makes it possible to stream through very large
+    files by calling this function with successive row ranges.
 
     Args:
-        ill_file: Path to an .ill file.
+        ill_file: Path to an .ill file. This can be a plain text file, a NumPy
+            file or a Radiance file with a header (either ascii or binary).
         sun_indices: A list of integers for where in the total_count sun-up hours occur.
-        timestep: The timestep to make the data collection.
-        leap_yr: Boolean to note if data is for a leap year.
+        timestep: The timestep of the annual irradiance. (Default: 1).
+        leap_yr: Boolean to note if data is for a leap year. (Default: False).
+        start_row: An integer for the first sensor row of the file to be loaded.
+            (Default: 0).
+        end_row: An optional integer for the sensor row (exclusive) at which
+            loading of the file should stop. If None, all rows after the
+            start_row will be loaded. (Default: None).
+        dtype: The NumPy dtype of the output array. (Default: np.float32).
 
     Return:
-        A list of annual HourlyContinuousCollection with irradiance data.
+        A NumPy array of annual irradiance with one row per sensor and one column
+        for each timestep of the year. All values outside of the sun_indices are zero.
+    """
+    values = _ill_file_values(ill_file, start_row, end_row)
+    steps = 8760 * timestep if not leap_yr else 8784 * timestep
+    irr_array = np.zeros((len(values), steps), dtype=dtype)
+    sun_count = min(len(sun_indices), values.shape[1])
+    irr_array[:, np.asarray(sun_indices[:sun_count], dtype=np.intp)] = \
+        values[:, :sun_count]
+    return irr_array
+
+
+def _ill_file_values(ill_file, start_row=0, end_row=None):
+    """Get a 2-D array of the sun-up irradiance values within an .ill file.
+
+    Args:
+        ill_file: Path to an .ill file.
+        start_row: An integer for the first row of the file to be loaded.
+        end_row: An optional integer for the row (exclusive) at which to stop.
     """
-    a_period = AnalysisPeriod(timestep=timestep, is_leap_year=leap_yr)
-    header = Header(Irradiance(), 'W/m2', a_period)
-    irr_data = []
     with open(ill_file, 'rb') as inf:
         first_bytes = inf.read(6)
     is_text = first_bytes[:1].isdigit() or first_bytes[1:2].isdigit()
     is_numpy = first_bytes.startswith(b'\x93NUMPY')
-    if is_text:
-        with open(ill_file) as results:
-            for pt_res in results:
-                ill_values = [float(v) for v in pt_res.split()]
-                pt_irr_data = _ill_values_to_data(
-                    ill_values, sun_indices, header, timestep, leap_yr)
-                irr_data.append(pt_irr_data)
-    elif is_numpy:
-        results = np.load(ill_file)
-        for ill_values in results:
-            pt_irr_data = _ill_values_to_data(
-                ill_values, sun_indices, header, timestep, leap_yr)
-            irr_data.append(pt_irr_data)
+    if is_text or is_numpy:
+        fmt, line_count = 'ascii', 0
     else:
-        results = binary_to_array(ill_file)
-        for ill_values in results:
-            pt_irr_data = _ill_values_to_data(
-                ill_values, sun_indices, header, timestep, leap_yr)
-            irr_data.append(pt_irr_data)
-    return irr_data
+        nrows, ncols, ncomp, line_count, fmt = binary_mtx_dimension(ill_file)
+        if ncomp not in (None, 1):
+            raise ValueError(
+                'Radiance file "{}" has {} components per value when only a '
+                'single component is supported.'.format(ill_file, ncomp))
+
+    if is_numpy:
+        return np.load(ill_file, mmap_mode='r')[start_row:end_row]
+    elif fmt == 'ascii':
+        row_count = None if end_row is None else max(end_row - start_row, 0)
+        if row_count == 0:
+            return np.zeros((0, 0), dtype=np.float64)
+        return np.loadtxt(ill_file, dtype=np.float64, ndmin=2,
+                          skiprows=line_count + start_row, max_rows=row_count)
+    else:  # binary Radiance file that can be memory-mapped after the header
+        values = binary_to_array(
+            ill_file, nrows, ncols, ncomp, fmt, line_count, mmap_mode='r')
+        return values[start_row:end_row]
 
 
-def _ill_values_to_data(ill_values, sun_indices, header, timestep=1, leap_yr=False):
+def _ill_file_to_data(ill_file, sun_indices, timestep=1, leap_yr=False):
     """Convert a list of sun-up irradiance from an .ill file into annual irradiance data.
 
     Args:
-        ill_values: A list of raw irradiance values from an .ill file.
+        ill_file: Path to an .ill file.
         sun_indices: A list of integers for where in the total_count sun-up hours occur.
-        header: A Header object for the for the data collection.
         timestep: The timestep to make the data collection.
         leap_yr: Boolean to note if data is for a leap year.
 
     Return:
-        An annual HourlyContinuousCollection of irradiance data.
+        A list of annual HourlyContinuousCollection with irradiance data.
     """
-    values = [0] * (8760 * timestep) if not leap_yr else [0] * (8784 * timestep)
-    for i, irr in zip(sun_indices, ill_values):
-        values[i] = irr
-    return HourlyContinuousCollection(header, values)
+    a_period = AnalysisPeriod(timestep=timestep, is_leap_year=leap_yr)
+    header = Header(Irradiance(), 'W/m2', a_period)
+    irr_array = ill_file_to_array(
+        ill_file, sun_indices, timestep, leap_yr, dtype=np.float64)
+    return [HourlyContinuousCollection(header, values)
+            for values in irr_array.tolist()]
 
 
 def _blank_ill_data(timestep=1, leap_yr=False):
@@ -0,0 +1,409 @@
+# coding=utf-8
+"""Utility functions for calculating Physiologic Equivalent Temperature (PET).
+
+This module is devoted to calculating PET with NumPy.
+"""
+from __future__ import division
+
+import numpy as np
+
+from ..pet import TC_SET, TSK_SET, TBODY_SET, P_REF, C_AIR, L_VAP, C_B, \
+    EM_SK, EM_CL, SIGM, _memi_dynamic_balance, _brute_force_three_var
+
+# number of unsolved cells above which the brute force method is run with NumPy
+BRUTE_FORCE_BATCH = 64
+
+
+def physiologic_equivalent_temperature_np(
+        ta, tr, vel, rh, met, clo, age=36, sex=0.5, ht=1.65, m_body=62, pos='standing',
+        b_press=101325):
+    """Calculate Physiological Equivalent Temperature (PET) with NumPy arrays.
+
+    This function is the same as the base physiologic_equivalent_temperature
+    function but it uses NumPy arrays of any matching (or broadcastable) shape
+    for the environmental inputs. The steady state of the MEMI model is solved
+    for all cells at once using a secant method with masks for the cells that
+    have converged. Any cells that fail to converge are re-run with a
+    progressively wider search range and, failing that, a brute force method.
+    The PET of the reference environment is then found with a batched bisection.
+
+    Args:
+        ta: Air temperature [C] as a NumPy array.
+        tr: Mean radiant temperature [C] as a NumPy array.
+        vel: Relative air velocity [m/s] as a NumPy array.
+        rh: Relative humidity [%] as a NumPy array.
+        met: Metabolic rate [met] as a NumPy array.
+        clo: Clothing [clo] as a NumPy array.
+        age: The age of the human subject in years. (Default: 36 years for middle age
+            of the average worldwide life expectancy).
+        sex: A value between 0 and 1 to indicate the sex of the human subject,
+            which influences the computation of basal metabolism. 0 indicates male.
+            1 indicates female and any number in between denotes a weighted average
+            between the two. (Default: 0.5).
+        ht: The height of the human subject in meters. (Default: 1.65m for
+            a worldwide average between male and female height).
+        m_body: The body mass of the human subject in kilograms. (Default: 62 kg
+            for the worldwide average adult human body mass).
+        pos: Text to indicate the posture of the human subject's body. Choose from
+            the following: "standing", "seated", "crouching". (Default: "standing").
+        b_press: The air pressure in which the human subject exists [Pa] as a
+            NumPy array. (Default: 101325 Pa for sea level).
+
+    Returns:
+        A dictionary containing results of the PET model with the following keys.
+        Each value is a NumPy array.
+
+        -   pet -- Physiological equivalent temperature (PET) [C]
+        -   t_core -- Core body temperature [C]
+        -   t_skin -- Skin temperature [C]
+        -   t_clo -- Clothing temperature [C]
+    """
+    epsilon = 0.01  # the acceptable error in the result of the temperatures
+
+    # broadcast all of the inputs to a common shape and flatten them
+    shape = np.broadcast(ta, tr, vel, rh, met, clo, b_press).shape
+    ta, tr, vel, rh, met, clo, b_press = \
+        (np.broadcast_to(np.asarray(v, dtype=np.float64), shape).ravel()
+         for v in (ta, tr, vel, rh, met, clo, b_press))
+
+    # compute the constant variables of the MEMI model
+    with np.errstate(all='ignore'):
+        c_vars = _memi_constant_vars_np(
+            ta, vel, rh, b_press, met, clo, age, sex, ht, m_body, pos)
+    a_du, a_clo, a_effr, feff, hc, fcl, facl, rcl, htcl, vpa, he, ere = c_vars
+
+    # determine a starting guess for the human temperatures using constant variables
+    t_core_in = np.full(ta.shape, 36.6)  # normal human body temperature
+    t_env = (ta + tr) / 2  # the operative temperature of the surrounding environment
+    r_body = (1 / htcl) - rcl
+    r_tot = r_body + rcl
+    t_sk_in = t_core_in * (rcl / r_tot) + t_env * (r_body / r_tot)
+    t_clo_in = (ta + tr + t_sk_in) / 3  # average of air, radiant, and skin temperature
+    t_in = np.array([t_core_in, t_sk_in, t_clo_in])
+
+    def fn(t_human, i):
+        return _memi_dynamic_balance_np(
+            t_human, ta[i], tr[i], a_du, a_clo[i], a_effr, feff, hc[i], fcl[i],
+            facl[i], rcl[i], htcl[i], vpa[i], he[i], ere[i])
+
+    # find a steady state solution to the MEMI model balance under the input conditions
+    tn = np.full(t_in.shape, np.nan)
+    unsolved = np.arange(ta.size)
+    for i in (1, 2, 3, 4, 5, 6):  # progressively widen search range
+        widen = np.array([[5 * i], [10 * i], [10 * i]])
+        t_min, t_max = t_in[:, unsolved] - widen, t_in[:, unsolved] + widen
+
+        def fn_unsolved(t_human, j):
+            return fn(t_human, unsolved[j])
+
+        tn[:, unsolved] = _secant_three_var_np(t_min, t_max, fn_unsolved, epsilon)
+        unsolved = unsolved[np.isnan(tn[0, unsolved])]
+        if unsolved.size == 0:
+            break  # model converged and root was found
+    if unsolved.size != 0:  # if we still don't have convergence, try brute force
+        increments = (0.001, 0.01, 0.01)  # increments with which to adjust body temp
+        err = 0.1  # maximum allowed error in [W]
+        if unsolved.size < BRUTE_FORCE_BATCH:  # NumPy overhead outweighs batching
+            for i in unsolved.tolist():
+                d_args = (ta[i], tr[i], a_du, a_clo[i], a_effr, feff, hc[i], fcl[i],
+                          facl[i], rcl[i], htcl[i], vpa[i], he[i], ere[i])
+                d_args = tuple(float(v) for v in d_args)
+                tn[:, i] = _brute_force_three_var(
+                    tuple(t_in[:, i].tolist()), increments, _memi_dynamic_balance,
+                    err, other_args=d_args)
+        else:
+
+            def fn_unsolved(t_human, j):
+                return fn(t_human, unsolved[j])
+
+            tn[:, unsolved] = _brute_force_three_var_np(
+                t_in[:, unsolved], np.array(increments).reshape(3, 1),
+                fn_unsolved, err)
+
+    # compute the PET using the human subject temperatures using a bisection method
+    def f(tx, i):
+        """A function with the input variables of the PET reference situation."""
+        r_vars = _memi_constant_vars_np(
+            tx, 0.1, 50, b_press[i], met[i], 0.9, age, sex, ht, m_body, pos, False)
+        return _memi_dynamic_balance_np(tn[:, i], tx, tx, *r_vars, scalar=True)
+
+    pet = _pet_bisect_np(f, ta.size, epsilon)
+
+    return {'pet': pet.reshape(shape), 't_core': tn[0].reshape(shape),
+            't_skin': tn[1].reshape(shape), 't_clo': tn[2].reshape(shape)}
+
+
+def pet_category_np(pet, humid_acclimated=False):
+    """Get the category of heat/cold stress associated with a NumPy array of PET.
+
+    Values are the same as those of the base pet_category and pet_category_humid
+    functions, ranging from -4 (Extreme Cold) to 4 (Extreme Heat).
+
+    Args:
+        pet: A NumPy array of Physiological Equivalent Temperature [C].
+        humid_acclimated: A boolean to note whether the categories for humid
+            climates should be used (those of the pet_category_humid function).
+            (Default: False).
+    """
+    if humid_acclimated:
+        lower, upper = (14, 18, 22, 26), (30, 34, 38, 42)
+    else:
+        lower, upper = (4, 8, 13, 18), (23, 29, 35, 41)
+    conditions = [pet < lower[0], pet < lower[1], pet < lower[2], pet < lower[3],
+                  pet <= upper[0], pet <= upper[1], pet <= upper[2], pet <= upper[3]]
+    choices = [-4, -3, -2, -1, 0, 1, 2, 3]
+    return np.select(conditions, choices, default=4)
+
+
+def core_temperature_category_np(t_core):
+    """Get the classification of core body temperature for a NumPy array.
+
+    * -2 = Hypothermia
+    * -1 = Cold
+    * 0 = Normal
+    * 1 = Hot
+    * 2 = Hyperthermia
+
+    Args:
+        t_core: A NumPy array of the core body temperature of the human subject [C].
+    """
+    conditions = [t_core < 35, t_core < 36.5, t_core < 37.5, t_core < 38.3]
+    return np.select(conditions, [-2, -1, 0, 1], default=2)
+
+
+def thermal_condition_np(pet_cat):
+    """Determine whether conditions are cold, neutral or hot from PET categories.
+
+    Values are one of the following:
+
+    * -1 = cold
+    * 0 = netural
+    * +1 = hot
+
+    Args:
+        pet_cat: A NumPy array of PET categories from the pet_category_np function.
+    """
+    return np.sign(pet_cat)
+
+
+def _memi_constant_vars_np(
+        ta, vel, rh, b_press, met, clo, age, sex, ht, m_body, pos, actual=True):
+    """Compute variables of the MEMI model that do not change with body temperature.
+
+    This is the same as the _memi_constant_vars function of the base pet module
+    but ta, vel, rh, b_press, met and clo can be NumPy arrays.
+    """
+    # compute tha area parameters of the body
+    a_du = 0.203 * m_body ** 0.425 * ht ** 0.725  # Dubois surface area of human subject
+    feff = 0.725 if pos in ('standing', 'crouching') else 0.696  # radiant efficiency
+
+    # increase the Burton surface to account for clothing, k = 0.31 for Hoeppe
+    fcl = 1 + (0.31 * clo)  # increase heat exchange surface depending on clothing level
+    facl = (173.51 * clo - 2.36 - 100.76 * clo * clo + 19.28 * clo ** 3.0) / 100
+    a_clo = a_du * facl + a_du * (fcl - 1.0)
+    a_effr = a_du * feff  # effective radiative area derived from posture of the subject
+
+    # partial pressure of water depending on relative humidity and air temperature
+    if actual:  # the calculation of the actual vapor pressure of inputs
+        vpa = rh / 100.0 * 6.105 * np.exp(17.27 * ta / (237.7 + ta))  # [hPa]
+    else:  # use reference temperature, humidity and barometric pressure
+        vpa = 12  # [hPa] vapour pressure of the standard environment
+
+    # convection coefficient depending on air speed and subject posture
+    if pos == 'standing':
+        hc = 2.67 + (6.5 * vel ** 0.67)
+    elif pos == 'seated':
+        hc = 2.26 + (7.42 * vel ** 0.67)
+    elif pos == 'crouching':
+        hc = 8.6 * (vel ** 0.513)
+    # modification of hc with the total air pressure
+    hc = hc * (b_press / P_REF) ** 0.55
+
+    # compute base metabolism for men and women in [W]
+    r_fem = ht * 100.0 / m_body ** (1.0 / 3.0) - 42.1
+    metab_female = 3.19 * m_body ** 0.75 * (1.0 + 0.004 * (30.0 - age) + 0.018 * r_fem)
+    r_mal = ht * 100.0 / m_body ** (1.0 / 3.0) - 43.4
+    metab_male = 3.45 * m_body ** 0.75 * (1.0 + 0.004 * (30.0 - age) + 0.01 * r_mal)
+    # compute the total metabolism, accounting for the activity level
+    if actual:  # actual human subject metabolic rate
+        mec = (metab_male * 1.17 * met) / a_du  # [W/m2]
+        fec = (metab_female * 1.22 * met) / a_du  # [W/m2]
+    else:  # reference human subject metabolic rate assumes 80 W of activity level
+        mec = (80 + metab_male) / a_du  # [W/m2]
+        fec = (80 + metab_female) / a_du  # [W/m2]
+
+    # attribution of internal energy depending on the sex of the subject
+    he = ((1 - sex) * mec) + (sex * fec)  # [W/m2]
+
+    # compute the respiratory energy losses from the metabolic rate
+    texp = 0.47 * ta + 21.0  # [degC]
+    dventpulm = he * 1.44 * (10.0 ** -6)  # pulmonary flow rate
+    eres = C_AIR * (ta - texp) * dventpulm  # sensible heat loss [W/m2]
+    vpexp = 6.11 * 10.0 ** (7.45 * texp / (235.0 + texp))
+    p_hpa = b_press / 100  # barometric pressure [hPa]
+    erel = 0.623 * L_VAP / p_hpa * (vpa - vpexp) * dventpulm  # latent heat loss [W/m2]
+    ere = eres + erel  # total respiratory heat loss [W/m2]
+
+    # compute the clothed fraction of the body and the clothing thickness
+    rcl = clo / 6.45  # convert [clo] to [m2-K/W]
+    facl = np.minimum(facl, 1.0)  # ensure that clothing does not cover more than 100%
+    y = np.select(  # thickness of the clothing layer
+        [clo >= 2.0, clo > 0.6, clo > 0.3, clo > 0.0],
+        [1.0, (ht - 0.2) / ht, 0.5, 0.1], default=0)
+
+    # compute subject radius depending on the clothing level (6.28 = 2 * pi)
+    r2 = a_du * (fcl - 1.0 + facl) / (6.28 * ht * y)  # external radius
+    r1 = facl * a_du / (6.28 * ht * y)  # internal radius
+    di = r2 - r1
+
+    # compute the equivalent thermal resistance of body tissues
+    htcl = (6.28 * ht * y * di) / (rcl * np.log(r2 / r1) * a_clo)  # [W/(m2-K)]
+
+    # return all of the variables used by the rest of the MEMI calculation
+    return a_du, a_clo, a_effr, feff, hc, fcl, facl, rcl, htcl, vpa, he, ere
+
+
+def _memi_dynamic_balance_np(
+        t_human, ta, tr, a_du, a_clo, a_effr, feff, hc, fcl, facl, rcl, htcl, vpa,
+        he, ere, scalar=False):
+    """Compute the dynamic load balance of the MEMI model.
+
+    This is the same as the _memi_dynamic_balance function of the base pet
+    module but t_human is a NumPy array with three rows (core, skin and
+    clothing temperature) and the other inputs can be NumPy arrays.
+    """
+    # unpack the array of temperatures of the human subject and get average body temp
+    t_core, t_sk, t_clo = t_human
+    alpha = 0.1  # constant in steady state model but updates t_body in transient model
+    t_body = alpha * t_sk + (1 - alpha) * t_core
+
+    # compute sweat losses
+    qmsw = np.minimum(304.94 * 10 ** -3 * np.maximum(t_body - TBODY_SET, 0), 500)
+    # L_VAP / 1000 --> [J/g] ; qwsw / 3600 --> [g/m2-s]
+    esw = (L_VAP / 1000) * (qmsw / 3600)  # [W/m2]
+    # saturation vapor pressure at temperature tsk
+    pv_sk = 6.105 * np.exp((17.27 * (t_sk + 273.15) - 4717.03) / (237.7 + t_sk))  # hPa
+    # compute vapour transfer
+    lw = 1.67  # Lewis factor [K/hPa]
+    he_diff = hc * lw  # diffusion coefficient of air layer
+    fecl = 1 / (1 + 0.92 * hc * rcl)  # Burton efficiency factor
+    emax = he_diff * fecl * (pv_sk - vpa)  # maximum diffusion at skin surface
+    w = esw / emax  # skin wettedness
+    too_wet = w > 1
+    w = np.where(too_wet, 1, w)
+    esw = np.where(too_wet & (esw - emax < 0), emax, esw)
+    esw = np.maximum(esw, 0)
+    i_m = 0.38  # Woodcock's ratio
+    r_ecl = (1 / (fcl * hc) + rcl) / (lw * i_m)  # clothing vapour transfer resistance
+    ediff = (1 - w) * (pv_sk - vpa) / r_ecl  # diffusion heat transfer
+    evap = -(ediff + esw)  # [W/m2]
+
+    # compute radiation losses
+    tr_k, tsk_k, tclo_k = tr + 273.15, t_sk + 273.15, t_clo + 273.15
+    # for bare skin area [W/m2]
+    rbare = a_effr * (1.0 - facl) * EM_SK * SIGM * (tr_k ** 4 - tsk_k ** 4) / a_du
+    # for dressed area [W/m2]
+    rclo = feff * a_clo * EM_CL * SIGM * (tr_k ** 4 - tclo_k ** 4) / a_du
+
+    # compute convection losses #
+    # for bare skin area:
+    cbare = hc * (ta - t_sk) * a_du * (1.0 - facl) / a_du  # [W/m2]
+    # for dressed area:
+    cclo = hc * (ta - t_clo) * a_clo / a_du  # [W/m2]
+
+    # return either the calculated [core, skin, clo] energy flux or the scalar sum
+    if scalar:  # return the scalar sum of the energy balance
+        return he + ere + rclo + rbare + cclo + cbare + evap
+    else:  # produce an array of 3 energy fluxes across [core, skin, clo]
+        sig_skin = np.maximum(TSK_SET - t_sk, 0)
+        sig_core = np.maximum(t_core - TC_SET, 0)
+        vaso = np.minimum((6.3 + 75 * sig_core) / (1 + 0.5 * sig_skin), 90)
+        vaso_ex = (vaso / 3600 * C_B + 5.28) * (t_core - t_sk)
+        clo_ex = htcl * (t_sk - t_clo)
+        e_core = he + ere - vaso_ex  # core balance [W/m2]
+        e_sk = rbare + cbare + evap + vaso_ex - clo_ex  # skin balance [W/m2]
+        e_clo = cclo + rclo + clo_ex  # clothes balance [W/m2]
+        return np.array([e_core, e_sk, e_clo])
+
+
+def _secant_three_var_np(a, b, fn, epsilon, max_iter=1000):
+    """Solve the roots of many 3-variable functions at once with a secant method.
+
+    This is the same as the ladybug.rootfinding secant_three_var function but
+    a and b are NumPy arrays with 3 rows and one column for each problem to solve.
+    The fn must accept such an array along with an array of column indices
+    and return an array of the same shape. Columns that fail to converge are NaN.
+    """
+    root = np.full(a.shape, np.nan)
+    idx = np.arange(a.shape[1])
+    with np.errstate(all='ignore'):
+        f1 = fn(a, idx)
+        done = np.all(np.abs(f1) <= epsilon, axis=0)
+        root[:, idx[done]] = a[:, done]
+        idx, a, b, f1 = idx[~done], a[:, ~done], b[:, ~done], f1[:, ~done]
+        f2 = fn(b, idx)
+        done = np.all(np.abs(f2) <= epsilon, axis=0)
+        root[:, idx[done]] = b[:, done]
+        idx, a, b, f1, f2 = \
+            idx[~done], a[:, ~done], b[:, ~done], f1[:, ~done], f2[:, ~done]
+
+        for _ in range(max_iter):
+            if idx.size == 0:
+                break
+            c = b - f2 / ((f2 - f1) / (b - a))
+            # columns with a zero or undefined slope have failed to converge
+            valid = np.all(np.isfinite(c), axis=0)
+            idx, b, c, f2 = idx[valid], b[:, valid], c[:, valid], f2[:, valid]
+            f3 = fn(c, idx)
+            done = np.all(np.abs(f3) <= epsilon, axis=0)
+            root[:, idx[done]] = c[:, done]
+            keep = ~done & np.all(np.isfinite(f3), axis=0)
+            idx, a, b, f1, f2 = \
+                idx[keep], b[:, keep], c[:, keep], f2[:, keep], f3[:, keep]
+    return root
+
+
+def _brute_force_three_var_np(
+        starting_guess, increments, fn, epsilon, max_iter=100000):
+    """Brute force root-finding for many MEMI models at once.
+
+    This is the same as the _brute_force_three_var function of the base pet
+    module but the starting_guess is a NumPy array with 3 rows and one column
+    for each problem to solve. The increments are a NumPy array with 3 rows.
+    """
+    guess = np.array(starting_guess, dtype=np.float64)
+    idx = np.arange(guess.shape[1])
+    with np.errstate(all='ignore'):
+        en_vec = fn(guess, idx)
+        active = ~np.all(np.abs(en_vec) < epsilon, axis=0)
+        idx, en_vec = idx[active], en_vec[:, active]
+        curr_i = 0
+        while idx.size != 0 and curr_i < max_iter:
+            step = np.where(en_vec > epsilon, increments,
+                            np.where(en_vec < -epsilon, -increments, 0))
+            guess[:, idx] += step
+            en_vec = fn(guess[:, idx], idx)
+            active = ~np.all(np.abs(en_vec) < epsilon, axis=0)
+            idx, en_vec = idx[active], en_vec[:, active]
+            curr_i += 1
+    return guess
+
+
+def _pet_bisect_np(f, count, epsilon):
+    """Bisect the PET of many reference environments at once.
+
+    This follows the same bisection loop as the base PET function, which
+    starts from a PET of 0 within a search interval of -40 to 60 C.
+    """
+    ti = np.full(count, -40.)  # start of the search interval
+    tf = np.full(count, 60.)  # end of the search interval
+    pet = np.zeros(count)
+    idx = np.arange(count)
+    with np.errstate(all='ignore'):
+        while idx.size != 0:  # bisection loop
+            lower = f(ti[idx], idx) * f(pet[idx], idx) < 0
+            tf[idx] = np.where(lower, pet[idx], tf[idx])
+            ti[idx] = np.where(lower, ti[idx], pet[idx])
+            pet[idx] = (ti[idx] + tf[idx]) / 2
+            idx = idx[tf[idx] - ti[idx] > epsilon]
+    return pet
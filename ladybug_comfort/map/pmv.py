@@ -0,0 +1,590 @@
+# coding=utf-8
+"""Utility functions for calculating Predicted Mean Vote (PMV).
+
+This module is devoted to calculating PMV with NumPy.
+"""
+from __future__ import division
+
+import numpy as np
+
+from ..pmv import pierce_set, calc_missing_pmv_input
+from ._helper import secant_np, bisect_np
+
+# arrays with fewer cells are evaluated with the base pierce_set for each cell
+SCALAR_CELL_COUNT = 16
+
+
+def predicted_mean_vote_np(ta, tr, vel, rh, met, clo, wme=0, still_air_threshold=0.1):
+    """Calculate PMV using Fanger's original model and Pierce SET with NumPy arrays.
+
+    This function is the same as the base predicted_mean_vote function but it
+    uses NumPy arrays of any matching (or broadcastable) shape. The cooling
+    effect of any air speeds above the still_air_threshold is solved for all
+    such cells at once.
+
+    Args:
+        ta: Air temperature [C] as a NumPy array.
+        tr: Mean radiant temperature [C] as a NumPy array.
+        vel: Relative air velocity [m/s] as a NumPy array.
+        rh: Relative humidity [%] as a NumPy array.
+        met: Metabolic rate [met] as a NumPy array.
+        clo: Clothing [clo] as a NumPy array.
+        wme: External work [met] as a NumPy array, normally around 0 when seated.
+        still_air_threshold: The air velocity in m/s at which the Pierce
+            Standard Effective Temperature (SET) model will be used
+            to correct values in the original Fanger PMV model.
+            Default is 0.1 m/s per the 2015 release of ASHRAE Standard-55.
+
+    Returns:
+        A dictionary containing results of the PMV model with the same keys as
+        the base predicted_mean_vote function (pmv, ppd, set, ta_adj, ce,
+        heat_loss). Each value is a NumPy array.
+    """
+    se_temp = pierce_set_np(ta, tr, vel, rh, met, clo, wme)
+    result = _pmv_with_cooling_effect_np(
+        ta, tr, vel, rh, met, clo, wme, still_air_threshold, se_temp)
+    result['set'] = se_temp
+    return result
+
+
+def predicted_mean_vote_no_set_np(
+        ta, tr, vel, rh, met, clo, wme=0, still_air_threshold=0.1):
+    """Calculate PMV using Fanger's model and Pierce SET model ONLY WHEN NECESSARY.
+
+    This function is the same as the base predicted_mean_vote_no_set function
+    but it uses NumPy arrays of any matching (or broadcastable) shape. SET is
+    only computed for the cells where the air speed is above the still_air_threshold.
+
+    Args:
+        ta: Air temperature [C] as a NumPy array.
+        tr: Mean radiant temperature [C] as a NumPy array.
+        vel: Relative air velocity [m/s] as a NumPy array.
+        rh: Relative humidity [%] as a NumPy array.
+        met: Metabolic rate [met] as a NumPy array.
+        clo: Clothing [clo] as a NumPy array.
+        wme: External work [met] as a NumPy array, normally around 0 when seated.
+        still_air_threshold: The air velocity in m/s at which the Pierce
+            Standard Effective Temperature (SET) model will be used
+            to correct values in the original Fanger PMV model.
+            Default is 0.1 m/s per the 2015 release of ASHRAE Standard-55.
+
+    Returns:
+        A dictionary containing results of the PMV model with the same keys as
+        the base predicted_mean_vote_no_set function (pmv, ppd, ta_adj, ce,
+        heat_loss). Each value is a NumPy array.
+    """
+    return _pmv_with_cooling_effect_np(
+        ta, tr, vel, rh, met, clo, wme, still_air_threshold)
+
+
+def _pmv_with_cooling_effect_np(ta, tr, vel, rh, met, clo, wme,
+                                still_air_threshold, se_temp=None):
+    """Run Fanger's PMV model after correcting arrays for the cooling effect."""
+    shape = np.broadcast(ta, tr, vel, rh, met, clo, wme).shape
+    ta, tr, vel, rh, met, clo, wme = \
+        (np.broadcast_to(np.asarray(v, dtype=np.float64), shape).ravel()
+         for v in (ta, tr, vel, rh, met, clo, wme))
+    if se_temp is not None:
+        se_temp = np.broadcast_to(se_temp, shape).ravel()
+
+    # solve for the cooling effect of the cells that are above the still air threshold
+    ce = np.zeros(ta.shape)
+    moving = np.flatnonzero(vel > still_air_threshold)
+    if moving.size != 0:
+        m_set = se_temp[moving] if se_temp is not None else None
+        ce[moving] = cooling_effect_np(
+            ta[moving], tr[moving], vel[moving], rh[moving], met[moving],
+            clo[moving], wme[moving], still_air_threshold, m_set)
+
+    # run the adjusted conditions through the Fanger model
+    vel_adj = np.where(vel > still_air_threshold, still_air_threshold, vel)
+    ta_adj = ta - ce
+    pmv, ppd, heat_loss = fanger_pmv_np(ta_adj, tr - ce, vel_adj, rh, met, clo, wme)
+
+    result = {}
+    result['pmv'] = pmv.reshape(shape)
+    result['ppd'] = ppd.reshape(shape)
+    result['ta_adj'] = ta_adj.reshape(shape)
+    result['ce'] = ce.reshape(shape)
+    result['heat_loss'] = {key: hl.reshape(shape) for key, hl in heat_loss.items()}
+    return result
+
+
+def cooling_effect_np(ta, tr, vel, rh, met, clo, wme=0, still_air_threshold=0.1,
+                      se_temp=None):
+    """Calculate the cooling effect of elevated air speed for 1D NumPy arrays.
+
+    The cooling effect is the amount that the air and radiant temperature of
+    a still-air environment must be reduced by in order to produce the same
+    Standard Effective Temperature (SET) as the input conditions. All elements
+    are solved at once using a secant method with a bisection fallback for any
+    elements that failed to converge.
+
+    Args:
+        ta: Air temperature [C] as a 1D NumPy array.
+        tr: Mean radiant temperature [C] as a 1D NumPy array.
+        vel: Relative air velocity [m/s] as a 1D NumPy array.
+        rh: Relative humidity [%] as a 1D NumPy array.
+        met: Metabolic rate [met] as a 1D NumPy array.
+        clo: Clothing [clo] as a 1D NumPy array.
+        wme: External work [met] as a 1D NumPy array, normally around 0 when seated.
+        still_air_threshold: The air velocity in m/s at which the Pierce
+            Standard Effective Temperature (SET) model will be used
+            to correct values in the original Fanger PMV model.
+        se_temp: An optional 1D NumPy array of the Standard Effective Temperature
+            for the input conditions. If None, it will be computed.
+
+    Returns:
+        ce -- A 1D NumPy array of the cooling effect [C].
+    """
+    ta, tr, vel, rh, met, clo, wme = \
+        (np.broadcast_to(np.asarray(v, dtype=np.float64), np.shape(ta))
+         for v in (ta, tr, vel, rh, met, clo, wme))
+    if se_temp is None:
+        se_temp = pierce_set_np(ta, tr, vel, rh, met, clo, wme)
+    ce_l = np.zeros(ta.shape)
+    ce_r = np.full(ta.shape, 40.)
+    eps = 0.001  # precision of ce
+
+    def fn(ce, i):
+        return se_temp[i] - pierce_set_np(ta[i] - ce, tr[i] - ce, still_air_threshold,
+                                          rh[i], met[i], clo[i], wme[i])
+
+    ce = secant_np(ce_l, ce_r, fn, eps)
+    failed = np.flatnonzero(np.isnan(ce))
+    if failed.size != 0:  # fall back to bisection for anything that failed
+
+        def fn_failed(ce, i):
+            return fn(ce, failed[i])
+
+        ce[failed] = bisect_np(ce_l[failed], ce_r[failed], fn_failed, eps, 0)
+    return ce
+
+
+def calc_missing_pmv_input_np(target_pmv, pmv_inputs, low_bound=0., up_bound=100.,
+                              tolerance=0.001, still_air_threshold=0.1):
+    """Solve for a missing PMV input given NumPy arrays of target PMV and other inputs.
+
+    This function solves the same problem as the base calc_missing_pmv_input
+    function but all elements of the arrays are solved at once using a secant
+    method. Only the elements that have not yet converged are evaluated with the
+    PMV model on each iteration. Any elements that do not converge within a few
+    iterations are solved with the base function. Note that the PMV with cooling
+    effect is not smooth at high air speeds and so the secant method can
+    occasionally converge to a different value within the tolerance than
+    the base function.
+
+    Args:
+        target_pmv: A NumPy array of the target PMV values that you are trying
+            to produce from the inputs to the PMV model.
+        pmv_inputs: A dictionary of 7 pmv inputs with the following keys:
+            'ta', 'tr', 'vel', 'rh', 'met', 'clo', 'wme'. Each key should
+            correspond to a NumPy array (or number) that can be broadcast with
+            the target_pmv but one of these inputs should have a value of None.
+            The input corresponding to None will be solved for by this function.
+            One can also input None for both 'ta' and 'tr' to solve for the
+            operative temperature that meets the target_pmv.
+        low_bound: The lowest possible value of the missing input you are tying to
+            find as a number or a NumPy array. (Default: 0).
+        up_bound: The highest possible value of the missing input you are tying to
+            find as a number or a NumPy array. (Default: 100).
+        tolerance: The acceptable error in the target_pmv. (Default: 0.001).
+        still_air_threshold: The air velocity in m/s at which the Pierce
+            Standard Effective Temperature (SET) model will be used
+            to correct values in the original Fanger PMV model.
+            Default is 0.1 m/s per the 2015 release of ASHRAE Standard-55.
+
+    Returns:
+        complete_pmv_inputs -- A copy of the pmv_inputs dictionary where each value
+        is a NumPy array with the broadcast shape of the inputs. The missing input
+        will be filled by the values that return the target_pmv.
+    """
+    assert len(pmv_inputs.keys()) == 7, \
+        'pmv_inputs must have 7 keys. Got {}.'.format(len(pmv_inputs.keys()))
+    keys = ('ta', 'tr', 'vel', 'rh', 'met', 'clo', 'wme')
+    if pmv_inputs['ta'] is None and pmv_inputs['tr'] is None:
+        missing_keys = ('ta', 'tr')
+    else:
+        missing_keys = tuple(k for k in keys if pmv_inputs[k] is None)[:1]
+    assert len(missing_keys) != 0, 'One of the pmv_inputs must be None.'
+
+    # broadcast all of the inputs to the same 1D arrays
+    given = {k: np.asarray(pmv_inputs[k], dtype=np.float64)
+             for k in keys if k not in missing_keys}
+    shape = np.broadcast(np.asarray(target_pmv, dtype=np.float64), low_bound,
+                         up_bound, *given.values()).shape
+    given = {k: np.broadcast_to(v, shape).ravel() for k, v in given.items()}
+    target = np.broadcast_to(np.asarray(target_pmv, dtype=np.float64), shape).ravel()
+    low = np.broadcast_to(np.asarray(low_bound, dtype=np.float64), shape).ravel()
+    up = np.broadcast_to(np.asarray(up_bound, dtype=np.float64), shape).ravel()
+
+    def fn(x, i):
+        inputs = {k: v[i] for k, v in given.items()}
+        for key in missing_keys:
+            inputs[key] = x
+        return predicted_mean_vote_no_set_np(
+            inputs['ta'], inputs['tr'], inputs['vel'], inputs['rh'], inputs['met'],
+            inputs['clo'], inputs['wme'], still_air_threshold)['pmv'] - target[i]
+
+    # solve for the missing input using the function
+    if missing_keys != ('clo',):  # bisect is much better at finding reasonable clo
+        missing_val = secant_np(low, up, fn, tolerance, 20)
+        # solve anything that did not converge quickly with the base function,
+        # which is faster for a few elements and follows the same secant steps
+        for i in np.flatnonzero(np.isnan(missing_val)).tolist():
+            inputs = {k: float(v[i]) for k, v in given.items()}
+            inputs.update({k: None for k in missing_keys})
+            missing_val[i] = calc_missing_pmv_input(
+                float(target[i]), inputs, float(low[i]), float(up[i]), tolerance,
+                still_air_threshold)[missing_keys[0]]
+    else:
+        missing_val = bisect_np(low, up, fn, tolerance, 0)
+
+    # copy and complete the input dictionary
+    pmv_inputs = {k: v.reshape(shape) for k, v in given.items()}
+    for key in missing_keys:
+        pmv_inputs[key] = missing_val.reshape(shape)
+    return pmv_inputs
+
+
+def fanger_pmv_np(ta, tr, vel, rh, met, clo, wme=0):
+    """Calculate PMV using only Fanger's original equation with NumPy arrays.
+
+    This function is the same as the base fanger_pmv function but it uses NumPy
+    arrays of any matching (or broadcastable) shape. The iterative solution for
+    the clothing surface temperature is run only on the cells that have not
+    yet converged such that the whole array is solved at once.
+
+    Args:
+        ta: Air temperature [C] as a NumPy array.
+        tr: Mean radiant temperature [C] as a NumPy array.
+        vel: Relative air velocity [m/s] as a NumPy array.
+        rh: Relative humidity [%] as a NumPy array.
+        met: Metabolic rate [met] as a NumPy array.
+        clo: Clothing [clo] as a NumPy array.
+        wme: External work [met] as a NumPy array, normally around 0 when seated.
+
+    Returns:
+        A tuple with three elements
+
+        -   pmv: Predicted mean vote (PMV) as a NumPy array.
+        -   ppd: Percentage of people dissatisfied (PPD) [%] as a NumPy array.
+        -   heat_loss: A dictionary with the 6 heat loss terms of the PMV model.
+            Each value of the dictionary is a NumPy array and the keys are
+            the same as those of the base fanger_pmv function
+            ('cond', 'sweat', 'res_l', 'res_s', 'rad', 'conv').
+    """
+    # broadcast all of the inputs to a common shape and flatten them
+    shape = np.broadcast(ta, tr, vel, rh, met, clo, wme).shape
+    ta, tr, vel, rh, met, clo, wme = \
+        (np.broadcast_to(np.asarray(v, dtype=np.float64), shape).ravel()
+         for v in (ta, tr, vel, rh, met, clo, wme))
+
+    pa = rh * 10. * np.exp(16.6536 - 4030.183 / (ta + 235.))
+
+    icl = 0.155 * clo  # thermal insulation of the clothing in M2K/W
+    m = met * 58.15  # metabolic rate in W/m2
+    w = wme * 58.15  # external work in W/m2
+    mw = m - w  # internal heat production in the human body
+    fcl = np.where(icl <= 0.078, 1 + (1.29 * icl), 1.05 + (0.645 * icl))
+
+    # heat transfer coefficient by forced convection
+    hcf = 12.1 * np.sqrt(vel)
+    taa = ta + 273.
+    tra = tr + 273.
+    tcla = taa + (35.5 - ta) / (3.5 * icl + 0.1)
+
+    p1 = icl * fcl
+    p2 = p1 * 3.96
+    p3 = p1 * 100.
+    p4 = p1 * taa
+    p5 = 308.7 - 0.028 * mw + (p2 * ((tra / 100.) ** 4))
+    xn = tcla / 100.
+    xf = tcla / 50.
+    hc = np.maximum(hcf, 2.38 * (np.abs(100.0 * xf - taa) ** 0.25))
+    eps = 0.00015
+
+    # iterate the clothing temperature only for the cells that have not converged
+    failed = np.zeros(xn.shape, dtype=bool)
+    active = np.flatnonzero(np.abs(xn - xf) > eps)
+    n = 0
+    while active.size != 0:
+        xf_a = (xf[active] + xn[active]) / 2.
+        hcn = 2.38 * (np.abs(100.0 * xf_a - taa[active]) ** 0.25)
+        hc_a = np.maximum(hcf[active], hcn)
+        xn_a = (p5[active] + p4[active] * hc_a - p2[active] * (xf_a ** 4)) / \
+            (100. + p3[active] * hc_a)
+        xf[active], xn[active], hc[active] = xf_a, xn_a, hc_a
+        n += 1
+        if n > 150:
+            failed[active] = True
+            break
+        active = active[np.abs(xn_a - xf_a) > eps]
+
+    tcl = 100. * xn - 273.
+
+    # heat loss conduction through skin
+    hl1 = 3.05 * 0.001 * (5733. - (6.99 * mw) - pa)
+    # heat loss by sweating
+    hl2 = np.where(mw > 58.15, 0.42 * (mw - 58.15), 0.)
+    # latent respiration heat loss
+    hl3 = 1.7 * 0.00001 * m * (5867. - pa)
+    # dry respiration heat loss
+    hl4 = 0.0014 * m * (34. - ta)
+    # heat loss by radiation
+    hl5 = 3.96 * fcl * ((xn ** 4) - ((tra / 100.) ** 4))
+    # heat loss by convection
+    hl6 = fcl * hc * (tcl - ta)
+
+    ts = 0.303 * np.exp(-0.036 * m) + 0.028
+    pmv = ts * (mw - hl1 - hl2 - hl3 - hl4 - hl5 - hl6)
+    ppd = ppd_from_pmv_np(pmv)
+
+    # collect heat loss terms and set any failed cells to the default values
+    heat_loss = {
+        'cond': hl1,
+        'sweat': hl2,
+        'res_l': hl3,
+        'res_s': hl4,
+        'rad': hl5,
+        'conv': hl6
+    }
+    if failed.any():
+        pmv[failed], ppd[failed] = 0.0, 5.0
+        for hl in heat_loss.values():
+            hl[failed] = 0
+
+    pmv, ppd = pmv.reshape(shape), ppd.reshape(shape)
+    heat_loss = {key: hl.reshape(shape) for key, hl in heat_loss.items()}
+    return pmv, ppd, heat_loss
+
+
+def pierce_set_np(ta, tr, vel, rh, met, clo, wme=0.):
+    """Calculate Standard Effective Temperature (SET) with NumPy arrays.
+
+    This function is the same as the base pierce_set function but it uses
+    NumPy arrays of any matching (or broadcastable) shape. All cells are
+    stepped through the two-node model together unless there are only a few
+    of them (eg. the last unconverged cells of a root-finding problem), in
+    which case the base function is faster for each cell.
+
+    Args:
+        ta: Air temperature [C] as a NumPy array.
+        tr: Mean radiant temperature [C] as a NumPy array.
+        vel: Relative air velocity [m/s] as a NumPy array.
+        rh: Relative humidity [%] as a NumPy array.
+        met: Metabolic rate [met] as a NumPy array.
+        clo: Clothing [clo] as a NumPy array.
+        wme: External work [met] as a NumPy array, normally around 0 when seated.
+
+    Returns:
+        se_temp -- A NumPy array of standard effective temperature [C].
+    """
+    shape = np.broadcast(ta, tr, vel, rh, met, clo, wme).shape
+    ta, tr, vel, rh, met, clo, wme = \
+        (np.broadcast_to(np.asarray(v, dtype=np.float64), shape).ravel()
+         for v in (ta, tr, vel, rh, met, clo, wme))
+    if ta.size < SCALAR_CELL_COUNT:  # the NumPy overhead outweighs the few cells
+        try:
+            return np.array(
+                [pierce_set(*vals) for vals in
+                 zip(*(v.tolist() for v in (ta, tr, vel, rh, met, clo, wme)))],
+                dtype=np.float64).reshape(shape)
+        except (OverflowError, ValueError, ZeroDivisionError):
+            pass  # extreme values that only the NumPy model can evaluate
+
+    # key initial variables
+    vapor_pressure = (rh * saturated_vapor_pressure_torr_np(ta)) / 100.
+    air_velocity = np.maximum(vel, 0.1)
+    kclo = 0.25
+    bodyweight = 69.9
+    bodysurfacearea = 1.8258
+    metfactor = 58.2
+    sbc = 0.000000056697  # Stefan-Boltzmann constant (W/m2-K4)
+    csw = 170.
+    cdil = 120.
+    cstr = 0.5
+
+    temp_skin_neutral = 33.7  # setpoint (neutral) value for Tsk
+    temp_core_neutral = 36.8  # setpoint value for Tcr
+    temp_body_neutral = 36.49  # setpoint for Tb
+    skin_blood_flow_neutral = 6.3  # neutral value for skin_blood_flow
+
+    # INITIAL VALUES - start of 1st experiment
+    temp_skin = np.full(ta.shape, temp_skin_neutral)
+    temp_core = np.full(ta.shape, temp_core_neutral)
+    skin_blood_flow = np.full(ta.shape, skin_blood_flow_neutral)
+    alfa = np.full(ta.shape, 0.1)
+    esk = 0.1 * met
+
+    # UNIT CONVERSIONS (from input variables)
+    p = 101.325  # pressure of the atmosphere in kPa
+    pressure_in_atmospheres = p * 0.009869
+    ltime = 60
+    rcl = 0.155 * clo
+
+    facl = 1.0 + 0.15 * clo  # % INCreaSE IN BODY SURFACE Area DUE TO CLOTHING
+    LR = 2.2 / pressure_in_atmospheres  # Lewis Relation is 2.2 at sea level
+    RM = met * metfactor
+    M = met * metfactor
+
+    no_clo = clo <= 0
+    wcrit = np.where(no_clo, 0.38 * air_velocity ** -0.29,
+                     0.59 * air_velocity ** -0.08)
+    icl = np.where(no_clo, 1.0, 0.45)
+
+    chc = 3.0 * pow(pressure_in_atmospheres, 0.53)
+    chcV = 8.600001 * (air_velocity * pressure_in_atmospheres) ** 0.53
+    chc = np.maximum(chc, chcV)
+
+    # initial estimate of Tcl
+    chr = np.full(ta.shape, 4.7)
+    ctc = chr + chc
+    ra = 1.0 / (facl * ctc)  # resistance of air layer to dry heat transfer
+    top = (chr * tr + chc * ta) / ctc
+    tcl = top + (temp_skin - top) / (ctc * (ra + rcl))
+
+    # Tcl and chr are solved iteratively using: H(Tsk - To) = ctc(Tcl - To),
+    # where H = 1 / (ra + Rcl) and ra = 1 / Facl * ctc
+    # this iteration only changes the results of the first time step
+    tcl_old = np.zeros(ta.shape)
+    active = np.flatnonzero(np.abs(tcl - tcl_old) > 0.01)
+    while active.size != 0:
+        tcl_old[active] = tcl[active]
+        chr[active] = 4.0 * sbc * \
+            (((tcl[active] + tr[active]) / 2.0 + 273.15) ** 3.0) * 0.72
+        ctc[active] = chr[active] + chc[active]
+        ra[active] = 1.0 / (facl[active] * ctc[active])
+        top[active] = (chr[active] * tr[active] + chc[active] * ta[active]) / \
+            ctc[active]
+        tcl[active] = (ra[active] * temp_skin[active] + rcl[active] * top[active]) / \
+            (ra[active] + rcl[active])
+        active = active[np.abs(tcl[active] - tcl_old[active]) > 0.01]
+
+    # step all cells through the two-node model together
+    rea = 1.0 / (LR * facl * chc)  # evaporative resistance of air layer
+    recl = rcl / (LR * icl)  # evaporative resistance of clothing (icl=.45)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for i in range(ltime - 1):
+            dry = (temp_skin - top) / (ra + rcl)
+            hfcs = (temp_core - temp_skin) * (5.28 + 1.163 * skin_blood_flow)
+            eres = 0.0023 * M * (44.0 - vapor_pressure)
+            cres = 0.0014 * M * (34.0 - ta)
+            scr = M - hfcs - eres - cres - wme
+            ssk = hfcs - dry - esk
+            tcsk = 0.97 * alfa * bodyweight
+            tccr = 0.97 * (1 - alfa) * bodyweight
+            dtsk = (ssk * bodysurfacearea) / (tcsk * 60.0)  # deg C per minute
+            dtcr = scr * bodysurfacearea / (tccr * 60.0)  # deg C per minute
+            temp_skin = temp_skin + dtsk
+            temp_core = temp_core + dtcr
+            TB = alfa * temp_skin + (1 - alfa) * temp_core
+            sksig = temp_skin - temp_skin_neutral
+            warms = np.maximum(sksig, 0)
+            colds = np.maximum(-sksig, 0)
+            crsig = (temp_core - temp_core_neutral)
+            warmc = np.maximum(crsig, 0)
+            coldc = np.maximum(-crsig, 0)
+            bdsig = TB - temp_body_neutral
+            warmb = np.maximum(bdsig, 0)
+            skin_blood_flow = (skin_blood_flow_neutral + cdil * warmc) / \
+                (1 + cstr * colds)
+            skin_blood_flow = np.clip(skin_blood_flow, 0.5, 90.0)
+            regsw = np.minimum(csw * warmb * np.exp(warms / 10.7), 500.0)
+            ersw = 0.68 * regsw
+            emax = (saturated_vapor_pressure_torr_np(temp_skin) - vapor_pressure) / \
+                (rea + recl)
+            prsw = ersw / emax
+            pwet = 0.06 + 0.94 * prsw
+            edif = pwet * emax - ersw
+            too_wet = pwet > wcrit
+            pwet = np.where(too_wet, wcrit, pwet)
+            prsw = np.where(too_wet, wcrit / 0.94, prsw)
+            ersw = np.where(too_wet, prsw * emax, ersw)
+            edif = np.where(too_wet, 0.06 * (1.0 - prsw) * emax, edif)
+            neg_emax = emax < 0
+            edif = np.where(neg_emax, 0, edif)
+            ersw = np.where(neg_emax, 0, ersw)
+            pwet = np.where(neg_emax, wcrit, pwet)
+            esk = ersw + edif
+            mshiv = 19.4 * colds * coldc
+            M = RM + mshiv
+            alfa = 0.0417737 + 0.7451833 / (skin_blood_flow + .585417)
+
+    # Define new heat flow terms, coefficients, and abbreviations
+    hsk = dry + esk  # total heat loss from skin
+    W = pwet
+    pssk = saturated_vapor_pressure_torr_np(temp_skin)
+    # Definition of ASHRAE standard environment... denoted "S"
+    chrS = chr
+    chcS = np.where(
+        met < 0.85, 3.0,
+        np.maximum(5.66 * np.maximum(met - 0.85, 0) ** 0.39, 3.0))
+
+    ctcs = chcS + chrS
+    rclos = 1.52 / ((met - wme / metfactor) + 0.6944) - 0.1835
+    rcls = 0.155 * rclos
+    facls = 1.0 + kclo * rclos
+    fcls = 1.0 / (1.0 + 0.155 * facls * ctcs * rclos)
+    ims = 0.45
+    icls = ims * chcS / ctcs * (1 - fcls) / (chcS / ctcs - fcls * ims)
+    ras = 1.0 / (facls * ctcs)
+    reaS = 1.0 / (LR * facls * chcS)
+    reclS = rcls / (LR * icls)
+    hd_s = 1.0 / (ras + rcls)
+    he_s = 1.0 / (reaS + reclS)
+
+    # SET* (standardized humidity, clo, Pb, and chc)
+    # determined using Newton's iterative solution on all unconverged cells
+    delta = .0001
+    x = temp_skin - hsk / hd_s  # lower bound for SET
+    active = np.arange(x.size)
+    while active.size != 0:
+        x_old = x[active]
+        be1 = pssk[active] - 0.5 * saturated_vapor_pressure_torr_np(x_old)
+        err1 = hsk[active] - hd_s[active] * (temp_skin[active] - x_old) - \
+            W[active] * he_s[active] * be1
+        be2 = pssk[active] - 0.5 * saturated_vapor_pressure_torr_np(x_old + delta)
+        err2 = hsk[active] - hd_s[active] * (temp_skin[active] - (x_old + delta)) - \
+            W[active] * he_s[active] * be2
+        x_new = x_old - delta * err1 / (err2 - err1)
+        x[active] = x_new
+        active = active[np.abs(x_new - x_old) > .01]
+
+    return x.reshape(shape)
+
+
+def saturated_vapor_pressure_torr_np(db_temp):
+    """Calculate saturated vapor pressure (Torr) at temperature (C) with NumPy arrays.
+    """
+    return np.exp(18.6686 - 4030.183 / (db_temp + 235.0))
+
+
+def ppd_from_pmv_np(pmv):
+    """Calculate the Percentage of People Dissatisfied (PPD) from a NumPy array of PMV.
+
+    Args:
+        pmv: A NumPy array of predicted mean vote (PMV).
+
+    Returns:
+        ppd -- A NumPy array of the percentage of people dissatisfied (PPD).
+    """
+    return 100.0 - 95.0 * np.exp(-0.03353 * pmv ** 4.0 - 0.2179 * pmv ** 2.0)
+
+
+def thermal_condition_np(pmv, ppd, comfort_par):
+    """Determine whether conditions are cold, neutral or hot.
+
+    Values are one of the following:
+
+    * -1 = cold
+    * 0 = netural
+    * +1 = hot
+
+    Args:
+        pmv: A NumPy array of predicted mean vote (PMV).
+        ppd: A NumPy array of the percentage of people dissatisfied (PPD).
+        comfort_par: A PMVParameter object with the PPD comfort threshold.
+    """
+    return np.where(ppd >= comfort_par.ppd_comfort_thresh,
+                    np.where(pmv > 0, 1, -1), 0)
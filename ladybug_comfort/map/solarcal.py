@@ -0,0 +1,143 @@
+# coding=utf-8
+"""Utility functions for calculating SolarCal projection factors.
+
+This module is devoted to calculating SolarCal projection factors with NumPy.
+"""
+import numpy as np
+from ..solarcal import SOLARCAL_SPLINES
+
+# tables of the simpler projection factor interpolation with rows for each
+# SHARP in SIMPLE_AZ_RANGE and columns for each altitude in SIMPLE_ALT_RANGE
+SIMPLE_ALT_RANGE = (0, 15, 30, 45, 60, 75, 90)
+SIMPLE_AZ_RANGE = (0, 15, 30, 45, 60, 75, 90, 105, 120, 135, 150, 165, 180)
+SIMPLE_AP_TABLES = {
+    'standing': ((0.254, 0.254, 0.228, 0.187, 0.149, 0.104, 0.059),
+                 (0.248, 0.248, 0.225, 0.183, 0.145, 0.102, 0.059),
+                 (0.239, 0.239, 0.218, 0.177, 0.138, 0.096, 0.059),
+                 (0.225, 0.225, 0.199, 0.165, 0.127, 0.09, 0.059),
+                 (0.205, 0.205, 0.182, 0.151, 0.116, 0.083, 0.059),
+                 (0.183, 0.183, 0.165, 0.136, 0.109, 0.078, 0.059),
+                 (0.167, 0.167, 0.155, 0.131, 0.107, 0.078, 0.059),
+                 (0.175, 0.175, 0.161, 0.131, 0.111, 0.081, 0.059),
+                 (0.199, 0.199, 0.178, 0.147, 0.12, 0.084, 0.059),
+                 (0.22, 0.22, 0.196, 0.16, 0.126, 0.088, 0.059),
+                 (0.238, 0.238, 0.21, 0.17, 0.133, 0.091, 0.059),
+                 (0.249, 0.249, 0.22, 0.177, 0.138, 0.093, 0.059),
+                 (0.252, 0.252, 0.223, 0.178, 0.138, 0.093, 0.059)),
+    'seated': ((0.202, 0.226, 0.212, 0.211, 0.182, 0.156, 0.123),
+               (0.203, 0.228, 0.205, 0.2, 0.187, 0.158, 0.123),
+               (0.2, 0.231, 0.207, 0.202, 0.184, 0.155, 0.123),
+               (0.191, 0.227, 0.205, 0.201, 0.175, 0.149, 0.123),
+               (0.177, 0.214, 0.195, 0.192, 0.168, 0.141, 0.123),
+               (0.16, 0.196, 0.182, 0.181, 0.162, 0.134, 0.123),
+               (0.15, 0.181, 0.173, 0.17, 0.153, 0.129, 0.123),
+               (0.163, 0.18, 0.164, 0.158, 0.145, 0.125, 0.123),
+               (0.182, 0.181, 0.156, 0.145, 0.136, 0.122, 0.123),
+               (0.195, 0.181, 0.146, 0.134, 0.128, 0.118, 0.123),
+               (0.207, 0.178, 0.135, 0.121, 0.117, 0.117, 0.123),
+               (0.213, 0.174, 0.125, 0.109, 0.109, 0.116, 0.123),
+               (0.209, 0.167, 0.117, 0.106, 0.106, 0.114, 0.123))
+}
+_SPLINE_ARRAYS = {}  # SOLARCAL_SPLINES that have already been converted to arrays
+
+
+def get_projection_factor_np(altitude, sharp=135, posture='standing'):
+    """Get the fraction of body surface area exposed to direct sun from solar position.
+
+    This function is the same as the base get_projection_factor function
+    but it uses NumPy arrays to look up all projection factors at once.
+
+    Args:
+        altitude: A NumPy array of numbers between 0 and 90 representing the
+            altitude of the sun in degrees.
+        sharp: A NumPy array of numbers between 0 and 180 representing the solar
+            horizontal angle relative to front of person (SHARP). (Default: 135).
+        posture: A text string indicating the posture of the body. Letters must
+            be lowercase. Choose from the following: "standing", "seated", "supine".
+            (Default: "standing").
+
+    Returns:
+        A NumPy array of projection factors with the broadcasted shape of the
+        altitude and sharp.
+    """
+    altitude, sharp = np.broadcast_arrays(
+        np.asarray(altitude, dtype=np.float64), np.asarray(sharp, dtype=np.float64))
+    if posture == 'supine':
+        altitude, sharp = np.abs(90 - sharp), altitude
+        altitude = np.where(altitude == 0, 1, altitude)
+        posture = 'standing'
+    try:
+        table = _SPLINE_ARRAYS[posture]
+    except KeyError:
+        table = np.array(SOLARCAL_SPLINES[posture], dtype=np.float64)
+        _SPLINE_ARRAYS[posture] = table
+    try:
+        return table[sharp.astype(int), (np.ceil(altitude) - 1).astype(int)]
+    except IndexError:
+        raise ValueError('altitude|azimuth {}|{} is outside of acceptable ranges'.format(
+            altitude, sharp))
+
+
+def get_projection_factor_simple_np(altitude, sharp=135, posture='standing'):
+    """Get the fraction of body surface area exposed to direct sun with a simpler method.
+
+    This function is the same as the base get_projection_factor_simple function
+    but it uses NumPy arrays to interpolate all projection factors at once.
+
+    Args:
+        altitude: A NumPy array of numbers between 0 and 90 representing the
+            altitude of the sun in degrees.
+        sharp: A NumPy array of numbers between 0 and 180 representing the solar
+            horizontal angle relative to front of person (SHARP). (Default: 135).
+        posture: A text string indicating the posture of the body. Letters must
+            be lowercase. Choose from the following: "standing", "seated", "supine".
+            (Default: "standing").
+
+    Returns:
+        A NumPy array of projection factors with the broadcasted shape of the
+        altitude and sharp.
+    """
+    altitude, sharp = np.broadcast_arrays(
+        np.asarray(altitude, dtype=np.float64), np.asarray(sharp, dtype=np.float64))
+    if posture == 'supine':
+        altitude, sharp = np.abs(90 - sharp), altitude
+        posture = 'standing'
+    try:
+        ap_table = np.array(SIMPLE_AP_TABLES[posture])
+    except KeyError:
+        raise TypeError('Posture type {} is not recognized.'.format(posture))
+
+    alt_range = np.array(SIMPLE_ALT_RANGE, dtype=np.float64)
+    az_range = np.array(SIMPLE_AZ_RANGE, dtype=np.float64)
+    alt_i = _find_span_np(alt_range, altitude)
+    az_i = _find_span_np(az_range, sharp)
+    alt1, alt2 = alt_range[alt_i], alt_range[alt_i + 1]
+    az1, az2 = az_range[az_i], az_range[az_i + 1]
+
+    # bilinear interpolation
+    ap = ap_table[az_i, alt_i] * (az2 - sharp) * (alt2 - altitude)
+    ap += ap_table[az_i + 1, alt_i] * (sharp - az1) * (alt2 - altitude)
+    ap += ap_table[az_i, alt_i + 1] * (az2 - sharp) * (altitude - alt1)
+    ap += ap_table[az_i + 1, alt_i + 1] * (sharp - az1) * (altitude - alt1)
+    ap /= (az2 - az1) * (alt2 - alt1)
+    return ap
+
+
+def sharp_from_solar_and_body_azimuth_np(solar_azimuth, body_azimuth=0):
+    """Calculate solar horizontal angle relative to front of person (SHARP).
+
+    Args:
+        solar_azimuth: A NumPy array of numbers between 0 and 360 representing
+            the solar azimuth in degrees (0=North, 90=East, 180=South, 270=West).
+        body_azimuth: A number between 0 and 360 representing the direction that
+            the human is facing in degrees (0=North, 90=East, 180=South, 270=West).
+    """
+    angle_diff = np.abs(np.asarray(solar_azimuth) - body_azimuth)
+    return np.where(angle_diff <= 180, angle_diff, 360 - angle_diff)
+
+
+def _find_span_np(arr, x):
+    """For ordered array arr, find the left index of the interval each x falls in."""
+    if not np.all((x >= arr[0]) & (x <= arr[-1])):
+        raise ValueError('altitude/azimuth {} is outside of acceptable ranges'.format(x))
+    return np.clip(np.searchsorted(arr, x, side='right') - 1, 0, len(arr) - 2)
@@ -0,0 +1,179 @@
+# coding=utf-8
+"""Utility functions for calculating solar positions with NumPy.
+
+The solar position formulas are the same NOAA formulas that are used by the
+ladybug Sunpath but they are evaluated for all timesteps at once.
+"""
+from __future__ import division
+
+import math
+import numpy as np
+
+from ladybug.sunpath import Sunpath
+
+from ._helper import analysis_period_moys
+from ._cache import cache_key, load_cached, save_cached
+
+_SUN_POSITIONS = {}  # solar positions that have already been computed keyed by period
+
+
+def sun_positions_np(location, analysis_period):
+    """Get arrays of solar altitudes and azimuths for each step of an analysis period.
+
+    Results are cached in memory by location and analysis period such that
+    repeated calls for the same period within a process do not recompute the
+    solar positions. When a cache directory is set (see set_cache_dir), the
+    solar positions are also cached on disk such that they are shared by all
+    commands of a thermal mapping workflow. For this reason, the returned arrays
+    are read-only.
+
+    Args:
+        location: A ladybug Location object to dictate the solar positions.
+        analysis_period: A ladybug AnalysisPeriod with the timesteps for which
+            solar positions will be computed.
+
+    Returns:
+        A tuple with two NumPy arrays that each have one value per timestep
+        of the analysis_period.
+
+        -   altitudes: The solar altitudes in degrees.
+
+        -   azimuths: The solar azimuths in degrees (0=North, 90=East, 180=South,
+            270=West).
+    """
+    key = (location.latitude, location.longitude, location.time_zone,
+           str(analysis_period), analysis_period.is_leap_year)
+    try:
+        return _SUN_POSITIONS[key]
+    except KeyError:
+        disk_key = cache_key('sun_positions', *key)
+        cached = load_cached(disk_key)
+        if cached is not None:
+            altitudes, azimuths = cached[0]['altitudes'], cached[0]['azimuths']
+        else:
+            altitudes, azimuths = sun_positions_from_moys_np(
+                location, analysis_period_moys(analysis_period),
+                analysis_period.is_leap_year)
+            save_cached(disk_key, {'altitudes': altitudes, 'azimuths': azimuths})
+            altitudes.flags.writeable = False
+            azimuths.flags.writeable = False
+        _SUN_POSITIONS[key] = altitudes, azimuths
+        return altitudes, azimuths
+
+
+def sun_positions_from_moys_np(location, moys, is_leap_year=False):
+    """Get arrays of solar altitudes and azimuths from minutes of the year.
+
+    Args:
+        location: A ladybug Location object to dictate the solar positions.
+        moys: A list or array of integers for the minutes of the year for
+            which solar positions will be computed.
+        is_leap_year: A boolean to note whether the minutes of the year are
+            for a leap year. (Default: False).
+
+    Returns:
+        A tuple with two NumPy arrays for the solar altitudes and azimuths in degrees.
+    """
+    # process the location into the same units used by the ladybug Sunpath
+    lat = math.radians(float(location.latitude))
+    if lat == math.pi / 2:  # prevent math domain errors
+        lat = lat - 1e-9
+    if lat == -math.pi / 2:  # prevent math domain errors
+        lat = lat + 1e-9
+    lon = math.radians(float(location.longitude))
+    time_zone = float(location.time_zone)
+
+    # get the days since 01-01-1900 and the minutes of the day
+    moys = np.asarray(moys, dtype=np.int64)
+    year = 2016 if is_leap_year else 2017
+    days = Sunpath._days_from_010119(year, 1, 1) + moys // 1440
+    minutes = moys % 1440
+    day_fracs = np.array([round(m / 1440.0, 2) for m in range(1440)])[minutes]
+
+    # compute the solar geometry
+    sol_dec, eq_of_time = _solar_geometry_np(
+        days + 2415018.5 + day_fracs - (time_zone / 24))
+
+    # compute the solar time and the hour angle in degrees
+    hour = minutes // 60 + (minutes % 60) / 60.0
+    sol_time = ((hour * 60 + eq_of_time + 4 * math.degrees(lon) -
+                 60 * time_zone) % 1440) / 60 * 60
+    hour_angle = np.where(sol_time < 0, sol_time / 4 + 180, sol_time / 4 - 180)
+
+    # radians for the zenith and degrees for altitude
+    cos_zenith = math.sin(lat) * np.sin(sol_dec) + \
+        math.cos(lat) * np.cos(sol_dec) * np.cos(np.radians(hour_angle))
+    zenith = np.arccos(np.clip(cos_zenith, -1, 1))
+    altitude = 90 - np.degrees(zenith)
+
+    # approx atmospheric refraction used to correct the altitude
+    tan_alt = np.tan(np.radians(altitude))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        atmos_refraction = np.where(
+            altitude > 85, 0,
+            np.where(
+                altitude > 5,
+                58.1 / tan_alt - 0.07 / tan_alt ** 3 + 0.000086 / tan_alt ** 5,
+                np.where(
+                    altitude > -0.575,
+                    1735 + altitude * (-518.2 + altitude *
+                                       (103.4 + altitude * (-12.79 + altitude * 0.711))),
+                    -20.772 / tan_alt)))
+    altitude = altitude + atmos_refraction / 3600
+
+    # azimuth in degrees, where perfect solar noon yields an undefined azimuth
+    with np.errstate(divide='ignore', invalid='ignore'):
+        az_init = ((math.sin(lat) * np.cos(zenith)) - np.sin(sol_dec)) / \
+            (math.cos(lat) * np.sin(zenith))
+        az_angle = np.degrees(np.arccos(az_init))
+    azimuth = np.where(
+        hour_angle > 0, (az_angle + 180) % 360, (540 - az_angle) % 360)
+    azimuth[np.isnan(az_angle)] = 180
+    return altitude, azimuth
+
+
+def _solar_geometry_np(julian_day):
+    """Get the solar declination [radians] and equation of time [minutes] from days.
+
+    Args:
+        julian_day: A NumPy array of julian days.
+    """
+    julian_century = (julian_day - 2451545) / 36525
+
+    # degrees
+    geom_mean_long_sun = (280.46646 + julian_century *
+                          (36000.76983 + julian_century * 0.0003032)) % 360
+    geom_mean_anom_sun = 357.52911 + julian_century * \
+        (35999.05029 - 0.0001537 * julian_century)
+    eccent_orbit = 0.016708634 - julian_century * \
+        (0.000042037 + 0.0000001267 * julian_century)
+    sun_eq_of_ctr = np.sin(np.radians(geom_mean_anom_sun)) * \
+        (1.914602 - julian_century * (0.004817 + 0.000014 * julian_century)) + \
+        np.sin(np.radians(2 * geom_mean_anom_sun)) * \
+        (0.019993 - 0.000101 * julian_century) + \
+        np.sin(np.radians(3 * geom_mean_anom_sun)) * 0.000289
+    sun_true_long = geom_mean_long_sun + sun_eq_of_ctr
+    sun_app_long = sun_true_long - 0.00569 - 0.00478 * \
+        np.sin(np.radians(125.04 - 1934.136 * julian_century))
+    mean_obliq_ecliptic = 23 + \
+        (26 + ((21.448 - julian_century * (46.815 + julian_century *
+                                           (0.00059 - julian_century *
+                                            0.001813)))) / 60) / 60
+    oblique_corr = mean_obliq_ecliptic + 0.00256 * \
+        np.cos(np.radians(125.04 - 1934.136 * julian_century))
+
+    # radians
+    sol_dec = np.arcsin(np.sin(np.radians(oblique_corr)) *
+                        np.sin(np.radians(sun_app_long)))
+
+    # minutes
+    var_y = np.tan(np.radians(oblique_corr / 2)) * np.tan(np.radians(oblique_corr / 2))
+    eq_of_time = 4 * np.degrees(
+        var_y * np.sin(2 * np.radians(geom_mean_long_sun)) -
+        2 * eccent_orbit * np.sin(np.radians(geom_mean_anom_sun)) +
+        4 * eccent_orbit * var_y * np.sin(np.radians(geom_mean_anom_sun)) *
+        np.cos(2 * np.radians(geom_mean_long_sun)) -
+        0.5 * (var_y ** 2) * np.sin(4 * np.radians(geom_mean_long_sun)) -
+        1.25 * (eccent_orbit ** 2) * np.sin(2 * np.radians(geom_mean_anom_sun))
+    )
+    return sol_dec, eq_of_time
@@ -2,6 +2,7 @@
 """Process comfort map results into thermal comfort percent."""
 from __future__ import division
 import json
+import numpy as np
 
 from ._helper import load_matrix
 
@@ -40,20 +41,20 @@ def tcp_model_schedules(
         occ_dict = json.load(json_file)
 
     # order the occ schedule data based on the relevant zones from the enclosure_info
-    occ_values, total_occs, time_count = [], [], len(cond_mtx[0])
+    time_count = cond_mtx.shape[1]
+    occ_masks, total_occs = [], []
     for zone_id in enclosure_dict['mapper']:
         sch_id = occ_dict['room_occupancy'][zone_id]
         if sch_id is not None:
             sch_vals = occ_dict['schedules'][sch_id]
-            occ_values.append(sch_vals)
+            occ_masks.append(_occupied_mask(sch_vals, time_count))
             total_occs.append(sum(sch_vals))
         else:
-            occ_values.append(None)
+            occ_masks.append(None)
             total_occs.append(None)
     if enclosure_dict['has_outdoor']:
         if outdoor_occ_csv is None:  # assume the outdoors is always occupied
-            sch_vals = [1] * time_count
-            occ_values.append(sch_vals)
+            occ_masks.append(None)
             total_occs.append(time_count)
         else:
             with open(outdoor_occ_csv) as hourly_schedule:
@@ -61,39 +62,21 @@ def tcp_model_schedules(
             assert len(sch_vals) == time_count, 'The number of values in the ' \
                 'outdoor occupancy schedule does not match the number of hours ' \
                 'for which the thermal map was run.'
-            occ_values.append(sch_vals)
+            occ_masks.append(_occupied_mask(sch_vals, time_count))
             total_occs.append(sum(sch_vals))
 
-    # loop through the sensors and compute tcp, hsp, and csp
-    tcp_list, hsp_list, csp_list = [], [], []
-    for pt_i, conditions in zip(enclosure_dict['sensor_indices'], cond_mtx):
-        occ_sch, total_occ = occ_values[pt_i], total_occs[pt_i]
-        if occ_sch is not None and total_occ != 0:
-            tcp, hsp, csp = 0, 0, 0
-            for occ, cond in zip(occ_sch, conditions):
-                if occ == 1:
-                    if cond == 0:
-                        tcp += 1
-                    elif cond == 1:
-                        hsp += 1
-                    else:
-                        csp += 1
-            tcp_list.append((tcp / total_occ) * 100)
-            hsp_list.append((hsp / total_occ) * 100)
-            csp_list.append((csp / total_occ) * 100)
-        else:  # the space is unoccupied; treat all hours as relevant
-            tcp, hsp, csp = 0, 0, 0
-            for cond in conditions:
-                if cond == 0:
-                    tcp += 1
-                elif cond == 1:
-                    hsp += 1
-                else:
-                    csp += 1
-            tcp_list.append((tcp / time_count) * 100)
-            hsp_list.append((hsp / time_count) * 100)
-            csp_list.append((csp / time_count) * 100)
-    return tcp_list, hsp_list, csp_list
+    # treat all hours as relevant for any unoccupied spaces
+    for i, total_occ in enumerate(total_occs):
+        if occ_masks[i] is None or total_occ == 0:
+            occ_masks[i] = np.ones(time_count, dtype=bool)
+            total_occs[i] = time_count
+
+    # gather the occupancy of each sensor from its zone and compute tcp, hsp, and csp
+    sensor_indices = enclosure_dict['sensor_indices'][:len(cond_mtx)]
+    cond_mtx = cond_mtx[:len(sensor_indices)]
+    occ_mask = np.array(occ_masks)[sensor_indices]
+    total_occ = np.array(total_occs)[sensor_indices]
+    return _thermal_comfort_percent(cond_mtx, occ_mask, total_occ)
 
 
 def tcp_total(condition_csv, schedule=None):
@@ -121,7 +104,7 @@ def tcp_total(condition_csv, schedule=None):
     # create the occupancy schedule
     time_count = len(cond_mtx[0])
     if schedule is None:
-        sch_vals = [1] * time_count
+        occ_mask = np.ones(time_count, dtype=bool)
         total_occ = time_count
     else:
         with open(schedule) as hourly_schedule:
@@ -131,20 +114,36 @@ def tcp_total(condition_csv, schedule=None):
             'for which the thermal map was run.'
         total_occ = sum(sch_vals)
         assert total_occ != 0, 'No hours of the occupancy schedule are occupied.'
+        occ_mask = np.array(sch_vals) == 1
+
+    # compute tcp, hsp, and csp for all of the sensors at once
+    return _thermal_comfort_percent(cond_mtx, occ_mask, total_occ)
+
+
+def _occupied_mask(sch_vals, time_count):
+    """Get a boolean array for the hours of a schedule that are fully occupied."""
+    occ_mask = np.zeros(time_count, dtype=bool)
+    sch_vals = np.array(sch_vals[:time_count])
+    occ_mask[:len(sch_vals)] = sch_vals == 1
+    return occ_mask
+
 
-    # loop through the sensors and compute tcp, hsp, and csp
-    tcp_list, hsp_list, csp_list = [], [], []
-    for conditions in cond_mtx:
-        tcp, hsp, csp = 0, 0, 0
-        for occ, cond in zip(sch_vals, conditions):
-            if occ == 1:
-                if cond == 0:
-                    tcp += 1
-                elif cond == 1:
-                    hsp += 1
-                else:
-                    csp += 1
-        tcp_list.append((tcp / total_occ) * 100)
-        hsp_list.append((hsp / total_occ) * 100)
-        csp_list.append((csp / total_occ) * 100)
-    return tcp_list, hsp_list, csp_list
+def _thermal_comfort_percent(cond_mtx, occ_mask, total_occ):
+    """Compute TCP, HSP and CSP from a matrix of conditions with masked reductions.
+
+    Args:
+        cond_mtx: A (sensors x time) NumPy array of thermal conditions.
+        occ_mask: A boolean NumPy array for whether each time is occupied. This
+            can be either a (sensors x time) array or one array for all sensors.
+        total_occ: The total number of occupied hours by which the counts of
+            each sensor are divided. This can be either a number or an array
+            with one value per sensor.
+
+    Returns:
+        A tuple with lists of TCP, HSP and CSP values for each sensor.
+    """
+    occ_count = np.count_nonzero(np.broadcast_to(occ_mask, cond_mtx.shape), axis=1)
+    tcp = np.count_nonzero((cond_mtx == 0) & occ_mask, axis=1)
+    hsp = np.count_nonzero((cond_mtx == 1) & occ_mask, axis=1)
+    csp = occ_count - tcp - hsp
+    return tuple(((count / total_occ) * 100).tolist() for count in (tcp, hsp, csp))
@@ -3,16 +3,28 @@
 
 This module is devoted to calculating UTCI with NumPy.
 """
+import os
 import numpy as np
 from ..utci import _utci_polynomial
 
+# default grid of the UTCI lookup table as (start, stop, step) for each of the
+# polynomial inputs: air temperature [C], radiant - air temperature delta [C],
+# 10 m wind speed [m/s] and vapour pressure [kPa]
+UTCI_LUT_GRID = ((-50, 50, 2), (-30, 70, 4), (0.5, 17, 1), (0, 5, 0.05))
+_UTCI_LUTS = {}  # lookup tables that have already been built keyed by grid
 
-def universal_thermal_climate_index_np(ta, tr, vel, rh):
+
+def universal_thermal_climate_index_np(
+        ta, tr, vel, rh, chunk_size=None, dtype=None, out=None):
     """Calculate Universal Thermal Climate Index (UTCI) using a polynomial approximation.
 
     This function is the same as the base universal_thermal_climate_index function
     but it uses NumPy arrays for calculating UTCI.
 
+    Note that the polynomial creates dozens of temporary arrays that are the size
+    of the inputs. So the chunk_size can be used to bound the peak memory of the
+    calculation for very large inputs.
+
     Args:
         ta: Air temperature [C] as a NumPy array.
         tr: Mean radiant temperature [C] as a NumPy array.
@@ -20,11 +32,46 @@ def universal_thermal_climate_index_np(ta, tr, vel, rh):
             Note that this meteorological speed at 10 m is simply 1.5 times the
             speed felt at ground in the original Fiala model used to build UTCI.
         rh: Relative humidity [%] as a NumPy array.
+        chunk_size: An optional integer for the number of rows (items along the
+            first axis of the broadcasted inputs) to be evaluated at once. If None,
+            all inputs will be evaluated at once. (Default: None).
+        dtype: An optional NumPy dtype for the calculation (eg. np.float32 to
+            halve the memory of the calculation at the cost of some precision).
+            If None, the calculation will follow the dtype of the inputs and
+            results will be written to a float64 array. (Default: None).
+        out: An optional NumPy array into which the results will be written.
+            This must have the shape of the broadcasted inputs. (Default: None).
 
     Returns:
         UTCI_approx -- The Universal Thermal Climate Index (UTCI) for the input
         conditions as approximated by a 4-D polynomial.
     """
+    if chunk_size is None and dtype is None and out is None:
+        return _universal_thermal_climate_index_np(ta, tr, vel, rh)
+
+    # broadcast the inputs to a common shape and set up the output array
+    inputs = np.broadcast_arrays(*(np.asarray(v) for v in (ta, tr, vel, rh)))
+    shape = inputs[0].shape
+    if out is None:
+        out = np.empty(shape, dtype=np.float64 if dtype is None else dtype)
+    assert out.shape == shape, 'The shape of the out array {} does not match ' \
+        'the shape of the inputs {}.'.format(out.shape, shape)
+
+    # evaluate the polynomial over chunks of rows
+    if len(shape) == 0 or chunk_size is None:
+        chunks = (Ellipsis,)
+    else:
+        chunks = (slice(st, st + chunk_size) for st in range(0, shape[0], chunk_size))
+    for chunk in chunks:
+        chunk_in = (v[chunk] for v in inputs)
+        if dtype is not None:
+            chunk_in = (v.astype(dtype, copy=False) for v in chunk_in)
+        out[chunk] = _universal_thermal_climate_index_np(*chunk_in)
+    return out
+
+
+def _universal_thermal_climate_index_np(ta, tr, vel, rh):
+    """Evaluate the UTCI polynomial for all inputs at once."""
     # set upper and lower limits of air velocity according to Fiala model scenarios
     vel = np.where(vel < 0.5, 0.5, np.where(vel > 17, 17, vel))
 
@@ -40,6 +87,139 @@ def universal_thermal_climate_index_np(ta, tr, vel, rh):
     return utci_approx
 
 
+def universal_thermal_climate_index_lut_np(ta, tr, vel, rh, lookup_table=None):
+    """Calculate Universal Thermal Climate Index (UTCI) using a lookup table.
+
+    This function produces the same result as universal_thermal_climate_index_np
+    but, instead of evaluating the 210-term polynomial for every input, it uses
+    multilinear interpolation over a table of UTCI values pre-computed on a regular
+    grid of the polynomial inputs. Any inputs that lie outside of the grid are
+    evaluated with the polynomial.
+
+    With the default UTCI_LUT_GRID, the result differs from the polynomial by
+    no more than 0.2 C for all physically valid inputs (99% of inputs differ by
+    less than 0.11 C). Finer grids can be used to reduce this error at the cost
+    of a larger table.
+
+    Args:
+        ta: Air temperature [C] as a NumPy array.
+        tr: Mean radiant temperature [C] as a NumPy array.
+        vel: Wind speed 10 m above ground level [m/s] as a NumPy array.
+        rh: Relative humidity [%] as a NumPy array.
+        lookup_table: An optional tuple of (axes, table) as output by the
+            utci_lookup_table function. If None, the lookup table for the
+            default UTCI_LUT_GRID will be used, which is built the first time
+            that it is needed. (Default: None).
+
+    Returns:
+        UTCI_approx -- The Universal Thermal Climate Index (UTCI) for the input
+        conditions as approximated by the lookup table.
+    """
+    axes, table = utci_lookup_table() if lookup_table is None else lookup_table
+
+    # compute the inputs to the polynomial in the same manner as the base function
+    ta, tr, vel, rh = np.broadcast_arrays(ta, tr, vel, rh)
+    vel = np.where(vel < 0.5, 0.5, np.where(vel > 17, 17, vel))
+    pa_pr = saturated_vapor_pressure_hpa_np(ta) * (rh / 100.0) / 10.0
+    d_tr = tr - ta
+    inputs = (ta, d_tr, vel, pa_pr)
+
+    # interpolate the values within the grid and use the polynomial for the rest
+    in_grid = np.ones(ta.shape, dtype=bool)
+    for axis, val in zip(axes, inputs):
+        in_grid &= (val >= axis[0]) & (val <= axis[-1])
+    utci_approx = np.empty(ta.shape, dtype=np.float64)
+    utci_approx[in_grid] = _interpolate_grid_np(
+        axes, table, [val[in_grid] for val in inputs])
+    out_grid = ~in_grid
+    if out_grid.any():
+        utci_approx[out_grid] = _utci_polynomial(*(val[out_grid] for val in inputs))
+    return utci_approx
+
+
+def utci_lookup_table(grid=UTCI_LUT_GRID, file_path=None):
+    """Get a lookup table of UTCI values over a regular 4-D grid of inputs.
+
+    Tables are only built once for each grid and are then re-used for all
+    subsequent calls to this function.
+
+    Args:
+        grid: A tuple of four (start, stop, step) tuples for the axes of the
+            table. In order, these are for air temperature [C], the difference
+            between radiant and air temperature [C], 10 m wind speed [m/s] and
+            vapour pressure [kPa]. The actual step of each axis may be slightly
+            smaller than the input step in order to hit the stop value
+            exactly. (Default: UTCI_LUT_GRID).
+        file_path: An optional path to a .npy file for the table. If the file
+            exists, the table will be loaded from it. Otherwise, the table will
+            be built and then written to this file so that it can be re-used
+            across Python sessions. (Default: None).
+
+    Returns:
+        A tuple with two items.
+
+        -   axes -- A tuple of four NumPy arrays for the values along each axis.
+
+        -   table -- A 4-D float32 NumPy array of UTCI values over the axes.
+    """
+    grid = tuple(tuple(float(v) for v in axis) for axis in grid)
+    try:  # see if the table has already been built
+        return _UTCI_LUTS[grid]
+    except KeyError:
+        pass
+    axes = tuple(
+        np.linspace(start, stop, int(np.ceil((stop - start) / step - 1e-9)) + 1)
+        for start, stop, step in grid)
+    shape = tuple(len(axis) for axis in axes)
+
+    if file_path is not None and os.path.isfile(file_path):
+        table = np.load(file_path)
+        assert table.shape == shape, 'UTCI lookup table at "{}" has a shape of ' \
+            '{} which does not match the input grid {}.'.format(
+                file_path, table.shape, shape)
+    else:  # build the table one air temperature at a time to limit memory use
+        table = np.empty(shape, dtype=np.float32)
+        d_tr, vel, pa_pr = np.meshgrid(*axes[1:], indexing='ij')
+        for i, ta in enumerate(axes[0]):
+            table[i] = _utci_polynomial(ta, d_tr, vel, pa_pr)
+        if file_path is not None:
+            np.save(file_path, table)
+
+    _UTCI_LUTS[grid] = axes, table
+    return axes, table
+
+
+def _interpolate_grid_np(axes, table, values):
+    """Multilinear interpolation of values that lie within a regular grid.
+
+    Args:
+        axes: A list of evenly-spaced NumPy arrays for the axes of the grid.
+        table: A NumPy array of values with one dimension for each axis.
+        values: A list of 1-D NumPy arrays with one array for each axis.
+    """
+    # get the index of the lower grid point and the weight of the upper point
+    indices, weights = [], []
+    for axis, val in zip(axes, values):
+        pos = (val - axis[0]) / (axis[1] - axis[0])
+        ind = np.minimum(pos.astype(np.intp), len(axis) - 2)
+        indices.append(ind)
+        weights.append(pos - ind)
+
+    # sum the contribution of each corner of the grid cell around each value
+    flat_table, strides = table.ravel(), np.cumprod((1,) + table.shape[:0:-1])[::-1]
+    base = sum(ind * stride for ind, stride in zip(indices, strides))
+    result = np.zeros(base.shape)
+    for corner in range(2 ** len(axes)):
+        offset, weight = 0, 1
+        for d, (w, stride) in enumerate(zip(weights, strides)):
+            if corner >> d & 1:
+                offset, weight = offset + stride, weight * w
+            else:
+                weight = weight * (1 - w)
+        result += weight * flat_table[base + offset]
+    return result
+
+
 def saturated_vapor_pressure_hpa_np(db_temp):
     """Calculate saturated vapor pressure (hPa) at temperature (C).
 
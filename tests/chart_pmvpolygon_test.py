@@ -48,6 +48,20 @@ def test_polygonpmv_init():
     assert not poly_obj.is_comfort_too_cold
 
 
+def test_polygonpmv_high_activity():
+    """Test PolygonPMV with high met and clo against the polygon-by-polygon method."""
+    psych_chart = PsychrometricChart(20, 50)
+    poly_obj = PolygonPMV(psych_chart, met_rate=[3.0, 4.0], clo_value=[2.0, 1.0])
+    for i in range(2):
+        left_line, right_line = poly_obj.comfort_polylines(i)
+        for line_1, line_2 in ((poly_obj.left_comfort_lines[i], left_line),
+                               (poly_obj.right_comfort_lines[i], right_line)):
+            for pt_1, pt_2 in zip(line_1.vertices, line_2.vertices):
+                assert pt_1.is_equivalent(pt_2, 1e-6)
+    assert poly_obj.left_comfort_lines[0].vertices[0].x < 10
+    assert poly_obj.left_comfort_lines[1].vertices[0].x < 20
+
+
 def test_evaporative_cooling_polygon():
     """Test the evaporative_cooling_polygon method."""
     # test the polygon with the default comfort settings
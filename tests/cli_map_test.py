@@ -2,18 +2,22 @@
 from click.testing import CliRunner
 import json
 import os
+import numpy as np
 
 from ladybug.futil import nukedir
 from ladybug.header import Header
 from ladybug.analysisperiod import AnalysisPeriod
 from ladybug.datatype.temperature import OperativeTemperature, \
-    StandardEffectiveTemperature, UniversalThermalClimateIndex
+    StandardEffectiveTemperature, UniversalThermalClimateIndex, \
+    PhysiologicalEquivalentTemperature
 from ladybug.datatype.thermalcondition import PredictedMeanVote, \
-    ThermalCondition, ThermalConditionElevenPoint
+    ThermalCondition, ThermalConditionElevenPoint, ThermalConditionNinePoint
 from ladybug.datatype.temperaturedelta import OperativeTemperatureDelta
+from ladybug.datatype.temperature import AirTemperature
 
-from ladybug_comfort.cli.map import pmv, adaptive, utci, map_result_info, tcp, \
-    shortwave_mrt, longwave_mrt, air_temperature
+from ladybug_comfort.cli.map import map, pmv, adaptive, utci, pet, map_result_info, \
+    tcp, shortwave_mrt, longwave_mrt, air_temperature, restructure_env_conditions
+from ladybug_comfort.map._output import load_thermal_map
 
 # global files object used by all of the tests
 sql_path = './tests/sql/eplusout.sql'
@@ -91,6 +95,28 @@ def test_utci_map():
     nukedir(res_folder, True)
 
 
+def test_pet_map():
+    runner = CliRunner()
+    res_folder = './tests/map/pet_map_results'
+    run_period = AnalysisPeriod(1, 2, 0, 1, 2, 23)
+
+    base_cmd = [sql_path, enclosure_path, epw_path]
+    base_cmd.extend(['-tr', total_ill_path, '-dr', direct_ill_path, '-rr', ref_ill_path])
+    base_cmd.extend(['-sh', sun_up_path])
+    base_cmd.extend(['-rp', str(run_period)])
+    base_cmd.extend(['--folder', res_folder])
+
+    result = runner.invoke(pet, base_cmd)
+
+    assert result.exit_code == 0
+    out_files = json.loads(result.output)
+    assert os.path.isfile(out_files['temperature'])
+    assert os.path.isfile(out_files['condition'])
+    assert os.path.isfile(out_files['condition_intensity'])
+
+    nukedir(res_folder, True)
+
+
 def test_shortwave_mrt_map():
     runner = CliRunner()
     res_file = './tests/map/shortwave.csv'
@@ -135,6 +161,34 @@ def test_air_map():
     os.remove(res_file)
 
 
+def test_map_cache_dir():
+    runner = CliRunner()
+    cache_dir = './tests/map/map_cache'
+    res_folder = './tests/map/pmv_cache_map_results'
+    run_period = AnalysisPeriod(1, 2, 0, 1, 2, 23)
+
+    base_cmd = ['--cache-dir', cache_dir, 'pmv', sql_path, enclosure_path, epw_path]
+    base_cmd.extend(['-rp', str(run_period)])
+    base_cmd.extend(['--folder', res_folder])
+
+    result = runner.invoke(map, base_cmd)
+    assert result.exit_code == 0
+    cache_entries = os.listdir(cache_dir)
+    assert len(cache_entries) > 1
+    temp_file = json.loads(result.output)['temperature']
+    with open(temp_file, 'rb') as inf:
+        first_values = inf.read()
+
+    result = runner.invoke(map, base_cmd)
+    assert result.exit_code == 0
+    assert sorted(os.listdir(cache_dir)) == sorted(cache_entries)
+    with open(temp_file, 'rb') as inf:
+        assert inf.read() == first_values
+
+    nukedir(res_folder, True)
+    nukedir(cache_dir, True)
+
+
 def test_map_result_info():
     runner = CliRunner()
     a_per = AnalysisPeriod()
@@ -180,6 +234,15 @@ def test_map_result_info():
     assert out_files['condition_intensity'] == \
         Header(ThermalConditionElevenPoint(), 'condition', a_per).to_dict()
 
+    cmd = ['pet']
+    result = runner.invoke(map_result_info, cmd)
+    assert result.exit_code == 0
+    out_files = json.loads(result.output)
+    assert out_files['temperature'] == \
+        Header(PhysiologicalEquivalentTemperature(), 'C', a_per).to_dict()
+    assert out_files['condition_intensity'] == \
+        Header(ThermalConditionNinePoint(), 'condition', a_per).to_dict()
+
 
 def test_tcp():
     runner = CliRunner()
@@ -205,3 +268,33 @@ def test_tcp():
     for fp in out_files:
         assert os.path.isfile(fp)
     nukedir(res_folder, True)
+
+
+def test_restructure_env_conditions():
+    runner = CliRunner()
+    folder = './tests/map/env_conditions'
+    run_period = AnalysisPeriod(1, 2, 0, 1, 2, 23)
+    os.makedirs(folder, exist_ok=True)
+    with open(os.path.join(folder, 'results_info.json'), 'w') as fp:
+        json.dump(Header(AirTemperature(), 'C', run_period).to_dict(), fp)
+    with open(os.path.join(folder, 'grids_info.json'), 'w') as fp:
+        json.dump([{'full_id': 'grid_1', 'count': 3}], fp)
+    with open(os.path.join(folder, '_redist_info.json'), 'w') as fp:
+        json.dump([{'identifier': 'grid_1', 'dist_info': [
+            {'identifier': 'part_0', 'st_ln': 1, 'end_ln': 3}]}], fp)
+    for i, sub_path in enumerate(('longwave_mrt', 'shortwave_mrt')):
+        os.makedirs(os.path.join(folder, sub_path), exist_ok=True)
+        values = np.full((4, 24), 20. + i) + np.arange(4).reshape(4, 1)
+        np.savetxt(os.path.join(folder, sub_path, 'part_0.csv'), values,
+                   delimiter=',')
+
+    result = runner.invoke(
+        restructure_env_conditions, [folder, folder, 'mrt', '--binary'])
+    assert result.exit_code == 0
+    mrt, info = load_thermal_map(os.path.join(folder, 'final', 'mrt', 'grid_1.npy'))
+    assert mrt.shape == (3, 24)
+    assert np.allclose(mrt[:, 0], [43, 45, 47])
+    header = Header.from_dict(info['metadata']['header'])
+    assert header.analysis_period == run_period
+    assert header.data_type.name == 'Mean Radiant Temperature'
+    nukedir(folder, True)
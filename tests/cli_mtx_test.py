@@ -4,8 +4,12 @@ import json
 import os
 
 from ladybug.futil import nukedir
+from ladybug.header import Header
+from ladybug.datatype.temperature import UniversalThermalClimateIndex
+from ladybug.datatype.thermalcondition import ThermalConditionElevenPoint
 
-from ladybug_comfort.cli.mtx import pmv_mtx, adaptive_mtx, utci_mtx
+from ladybug_comfort.cli.mtx import pmv_mtx, adaptive_mtx, utci_mtx, pet_mtx
+from ladybug_comfort.map._output import load_thermal_map
 
 
 # global files object used by all of the tests
@@ -75,3 +79,119 @@ def test_utci_mtx():
     assert os.path.isfile(out_files['condition_intensity'])
 
     nukedir(res_folder, True)
+
+
+def test_utci_mtx_chunked():
+    runner = CliRunner()
+    res_folder = './tests/mtx/utci_mtx_chunked'
+
+    base_cmd = [air_path, rh_path, '--wind-speed', '1.5', '--chunk-size', '2']
+    base_cmd.extend(['-rm', long_mrt_path, '-dm', short_mrt_path])
+    base_cmd.extend(['--folder', res_folder])
+
+    result = runner.invoke(utci_mtx, base_cmd)
+
+    assert result.exit_code == 0
+    out_files = json.loads(result.output)
+    with open(out_files['temperature']) as inf:
+        rows = inf.readlines()
+    with open(air_path) as inf:
+        assert len(rows) == len(inf.readlines())
+    assert len(rows[0].split(',')) == 24
+
+    nukedir(res_folder, True)
+
+
+def test_pet_mtx():
+    runner = CliRunner()
+    res_folder = './tests/mtx/pet_mtx'
+
+    base_cmd = [air_path, rh_path, '--air-speed-json', air_speed_path,
+                '--clo-value', clo_path, '--met-rate', met_path]
+    base_cmd.extend(['-rm', long_mrt_path, '-dm', short_mrt_path])
+    base_cmd.extend(['--folder', res_folder])
+
+    result = runner.invoke(pet_mtx, base_cmd)
+
+    assert result.exit_code == 0
+    out_files = json.loads(result.output)
+    assert os.path.isfile(out_files['temperature'])
+    assert os.path.isfile(out_files['condition'])
+    assert os.path.isfile(out_files['condition_intensity'])
+
+    nukedir(res_folder, True)
+
+
+def test_adaptive_mtx_workers():
+    runner = CliRunner()
+    res_folder = './tests/mtx/adaptive_mtx_serial'
+    par_res_folder = './tests/mtx/adaptive_mtx_parallel'
+
+    base_cmd = [air_path, prevailing_path, '--air-speed-json', air_speed_path]
+    base_cmd.extend(['-rm', long_mrt_path, '-dm', short_mrt_path])
+    result = runner.invoke(adaptive_mtx, base_cmd + ['--folder', res_folder])
+    assert result.exit_code == 0
+    out_files = json.loads(result.output)
+
+    par_cmd = base_cmd + ['--workers', '2', '--chunk-size', '3']
+    result = runner.invoke(adaptive_mtx, par_cmd + ['--folder', par_res_folder])
+    assert result.exit_code == 0
+    par_out_files = json.loads(result.output)
+
+    for key, out_file in out_files.items():
+        with open(out_file) as inf, open(par_out_files[key]) as par_inf:
+            assert inf.read() == par_inf.read()
+
+    nukedir(res_folder, True)
+    nukedir(par_res_folder, True)
+
+
+def test_utci_mtx_precision():
+    runner = CliRunner()
+    res_folder = './tests/mtx/utci_mtx_precision'
+
+    base_cmd = [air_path, rh_path, '--wind-speed-json', air_speed_path]
+    base_cmd.extend(['-rm', long_mrt_path, '--precision', '2'])
+    base_cmd.extend(['--folder', res_folder])
+
+    result = runner.invoke(utci_mtx, base_cmd)
+
+    assert result.exit_code == 0
+    out_files = json.loads(result.output)
+    with open(out_files['temperature']) as inf:
+        values = inf.readline().strip().split(',')
+    assert len(values) == 24
+    assert all(len(val.split('.')[-1]) == 2 for val in values)
+    with open(out_files['condition']) as inf:
+        assert all('.' not in val for val in inf.readline().strip().split(','))
+
+    nukedir(res_folder, True)
+
+
+def test_utci_mtx_binary():
+    runner = CliRunner()
+    res_folder = './tests/mtx/utci_mtx_binary'
+
+    base_cmd = [air_path, rh_path, '--wind-speed-json', air_speed_path]
+    base_cmd.extend(['-rm', long_mrt_path, '--binary', '-cs', '3'])
+    base_cmd.extend(['--run-period', '1/1 to 1/1 between 0 and 23 @1'])
+    base_cmd.extend(['--folder', res_folder])
+
+    result = runner.invoke(utci_mtx, base_cmd)
+
+    assert result.exit_code == 0
+    out_files = json.loads(result.output)
+    temper, info = load_thermal_map(out_files['temperature'])
+    assert temper.shape == (info['shape'][0], 24)
+    assert info['sensors_written'] == info['shape'][0]
+    header = Header.from_dict(info['metadata']['header'])
+    assert isinstance(header.data_type, UniversalThermalClimateIndex)
+    assert header.unit == 'C'
+    assert str(header.analysis_period) == '1/1 to 1/1 between 0 and 23 @1'
+    assert info['metadata']['grid'] == 'temperature'
+    cond_i, info = load_thermal_map(out_files['condition_intensity'])
+    header = Header.from_dict(info['metadata']['header'])
+    assert isinstance(header.data_type, ThermalConditionElevenPoint)
+    assert -5 <= cond_i.min() <= cond_i.max() <= 5
+
+    nukedir(res_folder, True)
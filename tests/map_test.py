@@ -1,10 +1,61 @@
 # coding utf-8
-from ladybug_comfort.map.mrt import shortwave_mrt_map
+import pytest
+
+from ladybug_comfort.map.mrt import shortwave_mrt_map, shortwave_mrt_map_np, \
+    longwave_mrt_map, ill_file_to_array
 from ladybug_comfort.map._enclosure import _parse_enclosure_info
+from ladybug_comfort.map._sql import sql_output_arrays, sql_output_rows, \
+    sql_output_data
+from ladybug_comfort.map.pmv import fanger_pmv_np, pierce_set_np, \
+    predicted_mean_vote_np, calc_missing_pmv_input_np
+from ladybug_comfort.map.utci import universal_thermal_climate_index_np, \
+    universal_thermal_climate_index_lut_np, utci_lookup_table
+from ladybug_comfort.map.pet import physiologic_equivalent_temperature_np, \
+    pet_category_np
+from ladybug_comfort.map.solarcal import get_projection_factor_np, \
+    get_projection_factor_simple_np
+from ladybug_comfort.map.sunpath import sun_positions_np, _SUN_POSITIONS
+from ladybug_comfort.map._cache import set_cache_dir, cached_epw
+from ladybug_comfort.map.tcp import tcp_total, tcp_model_schedules
+from ladybug_comfort.map.adaptive import adaptive_comfort_np, \
+    weighted_running_mean_hourly_np, weighted_running_mean_daily_np
+from ladybug_comfort.map._parallel import run_sensor_chunks, pmv_map_chunk, \
+    pet_mtx_chunk
+from ladybug_comfort.map._helper import binary_mtx_dimension, binary_to_array, \
+    restore_original_distribution
+from ladybug_comfort.map._output import ThermalMapWriter, load_thermal_map, \
+    write_text_matrix, write_collections_csv
+from ladybug_comfort.adaptive import adaptive_comfort_ashrae55, \
+    adaptive_comfort_en15251, adaptive_comfort_conditioned, cooling_effect_ashrae55, \
+    cooling_effect_en16798, cooling_effect_en15251, weighted_running_mean_hourly, \
+    weighted_running_mean_daily
+from ladybug_comfort.pmv import fanger_pmv, pierce_set, predicted_mean_vote, \
+    calc_missing_pmv_input
+from ladybug_comfort.pet import physiologic_equivalent_temperature, \
+    pet_category, pet_category_humid
+from ladybug_comfort.solarcal import shortwave_from_horiz_solar, \
+    shortwave_from_horiz_components, get_projection_factor, \
+    get_projection_factor_simple
+from ladybug_comfort.parameter.solarcal import SolarCalParameter
+from ladybug_comfort.parameter.pmv import PMVParameter
+from ladybug_comfort.parameter.adaptive import AdaptiveParameter
+from ladybug_comfort.parameter.pet import PETParameter
 
 from ladybug.datacollection import HourlyContinuousCollection
+from ladybug.analysisperiod import AnalysisPeriod
+from ladybug.sunpath import Sunpath
 from ladybug.sql import SQLiteResult
 from ladybug.epw import EPW
+from ladybug.futil import nukedir
+from ladybug.datautil import collections_from_csv
+from ladybug.header import Header
+from ladybug.datatype.temperature import AirTemperature
+
+import os
+import io
+import json
+import gzip
+import numpy as np
 
 
 # global files object used by all of the tests
@@ -17,6 +68,10 @@ sql_path = './tests/sql/eplusout.sql'
 sql = SQLiteResult(sql_path)
 epw_path = './tests/epw/boston.epw'
 epw = EPW(epw_path)
+sql_path2 = './tests/sql/eplusout2.sql'
+enclosure_path2 = './tests/map/TestRoom_1_enclosure2.json'
+modifiers_path = './tests/map/scene.mod'
+view_factors_path = './tests/map/view_factor.csv'
 
 
 def test_shortwave_mrt_map():
@@ -34,6 +89,101 @@ def test_shortwave_mrt_map():
         assert len(mrt_dat) == 8760
 
 
+def test_shortwave_mrt_map_np():
+    """Test the shortwave_mrt_map_np function against the scalar SolarCal."""
+    alts = np.array([-5., 1., 10., 45., 80.])
+    sharps = np.array([0., 45., 90., 135., 180.])
+    longwave = np.array([[20.], [25.]])
+    direct = np.array([[0., 50., 300., 600., 900.], [0., 10., 100., 200., 400.]])
+    indirect = np.array([[10., 50., 100., 150., 200.], [5., 20., 40., 60., 80.]])
+    ref = indirect * 0.2
+    par = SolarCalParameter('seated')
+
+    mrt = shortwave_mrt_map_np(alts, sharps, longwave, direct, indirect, None, par)
+    mrt_ref = shortwave_mrt_map_np(alts, sharps, longwave, direct, indirect, ref, par)
+    assert mrt.shape == mrt_ref.shape == (2, 5)
+    for i in range(2):
+        for j in range(5):
+            result = shortwave_from_horiz_solar(
+                longwave[i, 0], indirect[i, j], direct[i, j], alts[j],
+                posture='seated', sharp=sharps[j])
+            assert mrt[i, j] == pytest.approx(result['mrt'], abs=1e-9)
+            result = shortwave_from_horiz_components(
+                longwave[i, 0], indirect[i, j], direct[i, j], ref[i, j], alts[j],
+                posture='seated', sharp=sharps[j])
+            assert mrt_ref[i, j] == pytest.approx(result['mrt'], abs=1e-9)
+    assert np.all(mrt[:, :2] == longwave)
+
+
+def test_get_projection_factor_np():
+    """Test the projection factor functions against the scalar functions."""
+    alts, sharps = np.meshgrid(np.linspace(0.5, 90, 37), np.linspace(0, 180, 49))
+    for posture in ('standing', 'seated', 'supine'):
+        proj_fac = get_projection_factor_np(alts, sharps, posture)
+        proj_fac_simple = get_projection_factor_simple_np(alts, sharps, posture)
+        assert proj_fac.shape == proj_fac_simple.shape == alts.shape
+        for alt, sharp, pf, pf_s in zip(
+                alts.ravel(), sharps.ravel(), proj_fac.ravel(), proj_fac_simple.ravel()):
+            assert pf == get_projection_factor(alt, sharp, posture)
+            assert pf_s == pytest.approx(
+                get_projection_factor_simple(alt, sharp, posture), abs=1e-12)
+
+    assert get_projection_factor_simple_np([45], 0).shape == (1,)
+    with pytest.raises(ValueError):
+        get_projection_factor_simple_np([45, 95], 0)
+    with pytest.raises(TypeError):
+        get_projection_factor_simple_np([45], 0, 'crouching')
+
+
+def test_sun_positions_np():
+    """Test the sun_positions_np function against the ladybug Sunpath."""
+    sp = Sunpath.from_location(epw.location)
+    for a_per in (AnalysisPeriod(timestep=4), AnalysisPeriod(12, 20, 8, 1, 10, 17)):
+        altitudes, azimuths = sun_positions_np(epw.location, a_per)
+        assert altitudes.shape == azimuths.shape == (len(a_per),)
+        for t_date, alt, az in zip(a_per.datetimes, altitudes, azimuths):
+            sun = sp.calculate_sun_from_date_time(t_date)
+            assert alt == pytest.approx(sun.altitude, abs=1e-6)
+            assert az == pytest.approx(sun.azimuth, abs=1e-6)
+
+    # check that the solar positions are cached and protected from edits
+    cached_alts, _ = sun_positions_np(epw.location, AnalysisPeriod(12, 20, 8, 1, 10, 17))
+    assert cached_alts is altitudes
+    with pytest.raises(ValueError):
+        altitudes[0] = 0
+
+    # check that the solar positions are shared through the cache directory
+    cache_dir = './tests/map/sun_cache'
+    a_per = AnalysisPeriod(6, 21, 0, 6, 21, 23)
+    set_cache_dir(cache_dir)
+    try:
+        altitudes, _ = sun_positions_np(epw.location, a_per)
+        assert len(os.listdir(cache_dir)) == 1
+        _SUN_POSITIONS.clear()  # simulate another process of the workflow
+        cached_alts, _ = sun_positions_np(epw.location, a_per)
+        assert isinstance(cached_alts, np.memmap)
+        assert np.array_equal(cached_alts, altitudes)
+    finally:
+        set_cache_dir(None)
+        _SUN_POSITIONS.clear()
+        nukedir(cache_dir, True)
+
+
+def test_longwave_mrt_map():
+    """Test the longwave_mrt_map method."""
+    a_per = AnalysisPeriod(7, 6, 0, 7, 12, 23)
+    mrt = longwave_mrt_map(enclosure_path2, modifiers_path, sql_path2,
+                           view_factors_path, epw_path, a_per)
+    assert mrt.shape == (4, len(a_per))
+    assert mrt.dtype == np.float32
+
+    mrt_64 = longwave_mrt_map(enclosure_path2, modifiers_path, sql_path2,
+                              view_factors_path, epw_path, a_per, np.float64)
+    assert mrt_64.dtype == np.float64
+    assert np.allclose(mrt, mrt_64, atol=1e-4)
+    assert 15 < mrt_64.min() < mrt_64.max() < 40
+
+
 def test_parse_enclosure_info():
     """Test the _parse_enclosure_info method."""
     pt_air_temps, pt_rad_temps, pt_humids, pt_speeds, a_period = _parse_enclosure_info(
@@ -52,3 +202,471 @@ def test_parse_enclosure_info():
         assert isinstance(hum_dat, HourlyContinuousCollection)
         assert len(hum_dat) == 8760
     assert len(pt_speeds) == 4
+
+
+def test_sql_output_arrays():
+    """Test the sql_output_arrays method against the SQLiteResult data collections."""
+    outputs = ('Zone Mean Radiant Temperature', 'Surface Inside Face Temperature',
+               'Zone Air Relative Humidity', 'Not An Output')
+    sql_arrays, run_period = sql_output_arrays(sql_path2, outputs)
+    sql_obj = SQLiteResult(sql_path2)
+    assert run_period == sql_obj.run_periods[0]
+    assert 'Not An Output' not in sql_arrays
+
+    for output_name in outputs[:3]:
+        values, key_index, header = sql_arrays[output_name]
+        data_colls = sql_obj.data_collections_by_output_name(output_name)
+        assert values.shape == (len(data_colls), len(run_period))
+        assert header.analysis_period == run_period
+        for data in data_colls:
+            key = [v for k, v in data.header.metadata.items() if k != 'type'][0]
+            assert values[key_index[key]].tolist() == list(data.values)
+
+    # test the selection of rows, data collections and analysis periods
+    rad_temps = sql_obj.data_collections_by_output_name(outputs[0])
+    zone_ids = [d.header.metadata['Zone'] for d in rad_temps]
+    rows = sql_output_rows(sql_arrays[outputs[0]], [z.lower() for z in zone_ids][::-1])
+    assert rows[0].tolist() == list(rad_temps[-1].values)
+    data = sql_output_data(sql_arrays[outputs[0]], zone_ids[0])
+    assert isinstance(data, HourlyContinuousCollection)
+    assert data.header.metadata == rad_temps[0].header.metadata
+    assert data.values == rad_temps[0].values
+
+    a_per = AnalysisPeriod(7, 7, 8, 7, 9, 17)
+    sql_arrays, _ = sql_output_arrays(sql_path2, outputs[:1], a_per, np.float32)
+    values = sql_arrays[outputs[0]][0]
+    assert values.dtype == np.float32
+    assert values[0].tolist() == pytest.approx(
+        rad_temps[0].filter_by_analysis_period(a_per).values, abs=1e-5)
+
+
+def test_fanger_pmv_np():
+    """Test the fanger_pmv_np function against the scalar fanger_pmv."""
+    ta = np.array([[19., 22., 25.], [28., 31., 34.]])
+    tr = ta + np.array([0., 5., 10.])
+    vel = np.array([0.05, 0.1, 0.5])
+    pmv, ppd, heat_loss = fanger_pmv_np(ta, tr, vel, 50, 1.1, 0.5)
+
+    assert pmv.shape == ppd.shape == (2, 3)
+    assert heat_loss['conv'].shape == (2, 3)
+    for i in range(2):
+        for j in range(3):
+            s_pmv, s_ppd, s_hl = fanger_pmv(ta[i, j], tr[i, j], vel[j], 50, 1.1, 0.5)
+            assert pmv[i, j] == pytest.approx(s_pmv, rel=1e-6)
+            assert ppd[i, j] == pytest.approx(s_ppd, rel=1e-6)
+            for key, val in s_hl.items():
+                assert heat_loss[key][i, j] == pytest.approx(val, abs=1e-6)
+
+
+def test_predicted_mean_vote_np():
+    """Test the predicted_mean_vote_np function against the scalar functions."""
+    ta = np.array([18., 24., 30., 36.])
+    tr = np.array([20., 30., 30., 40.])
+    vel = np.array([0.05, 0.3, 1.0, 2.5])
+    rh = np.array([30., 50., 70., 20.])
+    result = predicted_mean_vote_np(ta, tr, vel, rh, 1.2, 0.6)
+    se_temp = pierce_set_np(ta, tr, vel, rh, 1.2, 0.6)
+
+    for i in range(4):
+        s_result = predicted_mean_vote(ta[i], tr[i], vel[i], rh[i], 1.2, 0.6)
+        assert se_temp[i] == pytest.approx(
+            pierce_set(ta[i], tr[i], vel[i], rh[i], 1.2, 0.6), rel=1e-6)
+        for key in ('pmv', 'ppd', 'set', 'ta_adj', 'ce'):
+            assert result[key][i] == pytest.approx(s_result[key], abs=1e-6)
+
+
+def test_calc_missing_pmv_input_np():
+    """Test the calc_missing_pmv_input_np function against the scalar function."""
+    target_pmv = np.array([-0.5, 0.5, -0.5, 0.5])
+    rh = np.array([0., 30., 60., 100.])
+    vel = np.array([0.1, 0.1, 0.5, 1.0])
+    pmv_inputs = {'ta': None, 'tr': None, 'vel': vel, 'rh': rh,
+                  'met': 1.1, 'clo': 0.7, 'wme': 0.}
+    result = calc_missing_pmv_input_np(target_pmv, pmv_inputs)
+    assert result['ta'].shape == (4,)
+    assert np.array_equal(result['ta'], result['tr'])
+    for i in range(4):
+        s_inputs = {'ta': None, 'tr': None, 'vel': vel[i], 'rh': rh[i],
+                    'met': 1.1, 'clo': 0.7, 'wme': 0.}
+        s_result = calc_missing_pmv_input(target_pmv[i], s_inputs)
+        assert result['ta'][i] == pytest.approx(s_result['ta'], abs=1e-6)
+
+    # test high activity and clothing levels with roots below the low_bound
+    met = np.array([3., 3., 4., 4.])
+    clo = np.array([2., 2., 1., 1.])
+    pmv_inputs = {'ta': None, 'tr': None, 'vel': 0.1, 'rh': 50.,
+                  'met': met, 'clo': clo, 'wme': 0.}
+    result = calc_missing_pmv_input_np(target_pmv, pmv_inputs)
+    assert result['ta'][0] < 0
+    for i in range(4):
+        s_inputs = {'ta': None, 'tr': None, 'vel': 0.1, 'rh': 50.,
+                    'met': met[i], 'clo': clo[i], 'wme': 0.}
+        s_result = calc_missing_pmv_input(target_pmv[i], s_inputs)
+        assert result['ta'][i] == pytest.approx(s_result['ta'], abs=1e-6)
+
+    pmv_inputs = {'ta': 24., 'tr': 24., 'vel': 0.1, 'rh': 50.,
+                  'met': 1.1, 'clo': None, 'wme': 0.}
+    result = calc_missing_pmv_input_np(target_pmv, pmv_inputs, up_bound=5)
+    for i in range(4):
+        s_inputs = pmv_inputs.copy()
+        s_result = calc_missing_pmv_input(target_pmv[i], s_inputs, up_bound=5)
+        assert result['clo'][i] == pytest.approx(s_result['clo'], abs=1e-6)
+
+
+def test_adaptive_comfort_np():
+    """Test the adaptive_comfort_np function against the scalar functions."""
+    t_prevail = np.array([5., 12., 20., 28., 35.])
+    to = np.array([[18., 22., 26., 29., 33.], [20., 25., 27., 31., 36.]])
+    vel = np.array([0.1, 0.3, 0.7, 1.0, 1.5])
+    params = (
+        (AdaptiveParameter(True), adaptive_comfort_ashrae55, cooling_effect_ashrae55),
+        (AdaptiveParameter(False), adaptive_comfort_en15251, cooling_effect_en16798),
+        (AdaptiveParameter(False, discrete_or_continuous_air_speed=False),
+         adaptive_comfort_en15251, cooling_effect_en15251),
+        (AdaptiveParameter(True, conditioning=0.5),
+         lambda tp, t: adaptive_comfort_conditioned(tp, t, 0.5, 'ASHRAE-55'),
+         cooling_effect_ashrae55)
+    )
+    for comf_par, comf_funct, cooling_funct in params:
+        result = adaptive_comfort_np(t_prevail, to, vel, comf_par)
+        for key in ('t_comf', 'deg_comf', 'ce', 'is_comfortable', 'thermal_condition'):
+            assert result[key].shape == (2, 5)
+        for i in range(2):
+            for j in range(5):
+                s_result = comf_funct(t_prevail[j], to[i, j])
+                s_ce = cooling_funct(vel[j], to[i, j], t_prevail[j])
+                assert result['t_comf'][i, j] == pytest.approx(s_result['t_comf'])
+                assert result['deg_comf'][i, j] == pytest.approx(s_result['deg_comf'])
+                assert result['ce'][i, j] == pytest.approx(s_ce)
+                assert result['is_comfortable'][i, j] == \
+                    comf_par.is_comfortable(s_result, s_ce)
+                assert result['thermal_condition'][i, j] == \
+                    comf_par.thermal_condition(s_result, s_ce)
+
+
+def test_weighted_running_mean_np():
+    """Test the weighted running mean NumPy functions against the scalar functions."""
+    epw_path = './tests/epw/chicago.epw'
+    outdoor_temp = np.array(EPW(epw_path).dry_bulb_temperature.values)
+    sites = np.array([outdoor_temp, outdoor_temp + 5, outdoor_temp[::-1]])
+
+    prevail = weighted_running_mean_hourly_np(sites)
+    assert prevail.shape == (3, 8760)
+    for site, site_prevail in zip(sites, prevail):
+        assert site_prevail.tolist() == weighted_running_mean_hourly(site.tolist())
+    extra_prevail = weighted_running_mean_hourly_np(sites[:, :8746])
+    assert extra_prevail.shape == (3, 8746)
+    assert extra_prevail[0].tolist() == \
+        weighted_running_mean_hourly(sites[0, :8746].tolist())
+
+    daily_temp = sites.reshape(3, 365, 24).mean(axis=-1)
+    daily_prevail = weighted_running_mean_daily_np(daily_temp, 0.6)
+    assert daily_prevail.shape == (3, 365)
+    for site, site_prevail in zip(daily_temp, daily_prevail):
+        assert site_prevail.tolist() == weighted_running_mean_daily(site.tolist(), 0.6)
+
+
+def test_run_sensor_chunks():
+    """Test that run_sensor_chunks gives the same results for any chunks of sensors."""
+    air_temp = np.linspace(18, 32, 7 * 24).reshape(7, 24)
+    rad_temp = air_temp + np.linspace(-2, 6, 24)
+    rel_h = np.full((7, 24), 45.)
+    vel = np.tile(np.linspace(0.05, 1.5, 7).reshape(7, 1), (1, 24))
+    met, clo = np.full(24, 1.1), np.full(24, 0.7)
+    arrays = (air_temp, rad_temp, rel_h, vel)
+    args = (met, clo, True, PMVParameter())
+
+    base_results = run_sensor_chunks(pmv_map_chunk, arrays, args)
+    for workers, chunk_size in ((1, 3), (2, None), (3, 2)):
+        results = run_sensor_chunks(pmv_map_chunk, arrays, args, workers, chunk_size)
+        assert len(results) == 3
+        for res, base_res in zip(results, base_results):
+            assert res.shape == (7, 24)
+            assert np.array_equal(res, base_res)
+
+
+def test_pet_mtx_chunk_pressure():
+    """Test that pet_mtx_chunk uses the station pressure of an EPW."""
+    epw_path = './tests/epw/chicago.epw'
+    cache_dir = './tests/map/epw_cache'
+    set_cache_dir(cache_dir)
+    try:
+        epw_obj = cached_epw(epw_path)
+        cached_obj = cached_epw(epw_path)  # loaded from the cache
+        assert cached_obj.atmospheric_station_pressure.values == \
+            epw_obj.atmospheric_station_pressure.values
+    finally:
+        set_cache_dir(None)
+        nukedir(cache_dir, True)
+
+    b_press = np.array(epw_obj.atmospheric_station_pressure.values[:24]) * 0.8
+    air_temp = np.tile(np.linspace(-5, 35, 24), (2, 1))
+    rel_h, vel = np.full((2, 24), 50.), np.full(24, 1.5)
+    met, clo = np.full(24, 2.4), np.full(24, 0.7)
+    temper, _, _ = pet_mtx_chunk(
+        air_temp, air_temp, rel_h, vel, met, clo, PETParameter(), b_press)
+    sea_temper, _, _ = pet_mtx_chunk(
+        air_temp, air_temp, rel_h, vel, met, clo, PETParameter())
+    assert not np.allclose(temper, sea_temper)
+    for i in range(24):
+        t_a = float(air_temp[0, i])
+        s_result = physiologic_equivalent_temperature(
+            t_a, t_a, 1.5, 50., 2.4, 0.7, b_press=float(b_press[i]))
+        assert temper[1, i] == pytest.approx(s_result['pet'], abs=1e-2)
+
+
+def test_tcp_total():
+    """Test the tcp_total and tcp_model_schedules functions."""
+    condition_path = './tests/map/map_results/condition.csv'
+    cond_mtx = np.loadtxt(condition_path, delimiter=',')
+    tcp_list, hsp_list, csp_list = tcp_total(condition_path)
+    assert len(tcp_list) == len(hsp_list) == len(csp_list) == len(cond_mtx)
+    for tcp, hsp, csp, conditions in zip(tcp_list, hsp_list, csp_list, cond_mtx):
+        assert tcp == (np.sum(conditions == 0) / len(conditions)) * 100
+        assert hsp == (np.sum(conditions == 1) / len(conditions)) * 100
+        assert tcp + hsp + csp == pytest.approx(100)
+
+    occ_sch_path = './tests/map/occ_schedules.json'
+    sch_tcp, sch_hsp, sch_csp = tcp_model_schedules(
+        condition_path, enclosure_path, occ_sch_path)
+    assert len(sch_tcp) == len(tcp_list)
+    for tcp, hsp, csp in zip(sch_tcp, sch_hsp, sch_csp):
+        assert 0 <= tcp <= 100
+        assert tcp + hsp + csp == pytest.approx(100)
+
+
+def test_write_text_matrix():
+    """Test the write_text_matrix function with different formats of values."""
+    values = np.array([[21.123456789, 0.1, -3.], [1e-05, 25., 1234.5]])
+    out_file = io.StringIO()
+    write_text_matrix(values, out_file)
+    assert out_file.getvalue() == \
+        '\n'.join(','.join(str(v) for v in row) for row in values) + '\n'
+
+    out_file = io.StringIO()
+    write_text_matrix(values, out_file, delimiter=' ', precision=2)
+    assert out_file.getvalue() == '21.12 0.10 -3.00\n0.00 25.00 1234.50\n'
+
+    out_file = io.StringIO()
+    write_text_matrix(values[:, :1], out_file, ' ', 3, scientific=True)
+    assert out_file.getvalue() == '2.112e+01\n1.000e-05\n'
+
+    out_file = io.StringIO()
+    write_text_matrix(np.array([[-1, 0, 1]]), out_file)
+    write_text_matrix([50.0, 12.5], out_file)
+    assert out_file.getvalue() == '-1,0,1\n50.0\n12.5\n'
+
+    gz_path = './tests/map/values.csv.gz'
+    write_text_matrix(values, gz_path, precision=1, compress=True)
+    with gzip.open(gz_path, 'rt') as inf:
+        assert inf.read() == '21.1,0.1,-3.0\n0.0,25.0,1234.5\n'
+    os.remove(gz_path)
+
+
+def test_binary_to_array():
+    """Test the binary_to_array function with memory-mapped and text matrices."""
+    values = np.arange(24, dtype=np.float32).reshape(4, 6) / 4
+    header = '#?RADIANCE\nrmtxop\nNROWS=4\nNCOLS=6\nNCOMP=1\nFORMAT={}\n\n'
+    folder = './tests/map/binary_to_array'
+    os.makedirs(folder, exist_ok=True)
+    bin_file = os.path.join(folder, 'bin.ill')
+    ascii_file = os.path.join(folder, 'ascii.ill')
+    with open(bin_file, 'wb') as outf:
+        outf.write(header.format('float').encode('utf-8'))
+        outf.write(values.tobytes())
+    with open(ascii_file, 'w') as outf:
+        outf.write(header.format('ascii'))
+        write_text_matrix(values, outf, delimiter='\t')
+
+    assert binary_mtx_dimension(bin_file) == (4, 6, 1, 7, 'float')
+    array = binary_to_array(bin_file)
+    assert array.dtype == np.float32
+    assert np.array_equal(array, values)
+    mmap_array = binary_to_array(bin_file, mmap_mode='r')
+    assert isinstance(mmap_array, np.memmap)
+    assert np.array_equal(mmap_array[1:3], values[1:3])
+    assert np.array_equal(binary_to_array(ascii_file), values)
+    del mmap_array
+    nukedir(folder, True)
+
+
+def test_restore_original_distribution():
+    """Test the restore_original_distribution function with different input formats."""
+    values = np.arange(60, dtype=np.float32).reshape(10, 6) / 4
+    folder = './tests/map/restore_distribution'
+    in_folder = os.path.join(folder, 'input')
+    os.makedirs(in_folder, exist_ok=True)
+    np.save(os.path.join(in_folder, 'part_0.npy'), values[:4])
+    with open(os.path.join(in_folder, 'part_1.npy'), 'wb') as outf:
+        outf.write(b'#?RADIANCE\nNROWS=6\nNCOLS=6\nNCOMP=1\nFORMAT=float\n\n')
+        outf.write(values[4:].tobytes())
+    dist_info = [
+        {'identifier': 'grid_1', 'dist_info': [
+            {'identifier': 'part_0', 'st_ln': 0, 'end_ln': 2}]},
+        {'identifier': 'grid_2', 'dist_info': [
+            {'identifier': 'part_0', 'st_ln': 3, 'end_ln': 3},
+            {'identifier': 'part_1', 'st_ln': 0, 'end_ln': 5}]}
+    ]
+    with open(os.path.join(in_folder, '_redist_info.json'), 'w') as outf:
+        json.dump(dist_info, outf)
+
+    out_folder = os.path.join(folder, 'npy')
+    restore_original_distribution(in_folder, out_folder)
+    assert np.array_equal(np.load(os.path.join(out_folder, 'grid_1.npy')), values[:3])
+    assert np.array_equal(np.load(os.path.join(out_folder, 'grid_2.npy')), values[3:])
+
+    out_folder = os.path.join(folder, 'csv')
+    restore_original_distribution(
+        in_folder, out_folder, output_extension='csv', as_text=True, fmt='%.12f',
+        delimiter='comma', workers=2)
+    grid_2 = np.loadtxt(os.path.join(out_folder, 'grid_2.csv'), delimiter=',')
+    assert np.array_equal(grid_2, values[3:])
+    nukedir(folder, True)
+
+
+def test_write_collections_csv():
+    """Test the write_collections_csv function with a discontinuous analysis period."""
+    a_per = AnalysisPeriod(6, 21, 9, 6, 22, 16)
+    values = np.arange(3 * 16, dtype=np.float32).reshape(3, 16) / 2
+    header = Header(AirTemperature(), 'C', a_per)
+    csv_path = './tests/map/grid_collections.csv'
+    write_collections_csv(values, header, csv_path, {'grid': 'TestRoom_1'})
+
+    data = collections_from_csv(csv_path)
+    assert len(data) == 3
+    assert data[1].header.analysis_period == a_per
+    assert data[1].header.metadata == {'grid': 'TestRoom_1', 'sensor_index': '1'}
+    assert data[1].datetimes == a_per.datetimes
+    assert data[2].values == tuple(values[2].tolist())
+    os.remove(csv_path)
+
+
+def test_thermal_map_writer():
+    """Test the ThermalMapWriter with appended blocks and run_sensor_chunks outputs."""
+    air_temp = np.linspace(18, 32, 7 * 24).reshape(7, 24)
+    rad_temp = air_temp + np.linspace(-2, 6, 24)
+    rel_h = np.full((7, 24), 45.)
+    vel = np.full((7, 24), 0.1)
+    met, clo = np.full(24, 1.1), np.full(24, 0.7)
+    arrays = (air_temp, rad_temp, rel_h, vel)
+    args = (met, clo, True, PMVParameter())
+    base_results = run_sensor_chunks(pmv_map_chunk, arrays, args)
+
+    folder = './tests/map/thermal_map_writer'
+    os.makedirs(folder, exist_ok=True)
+    temp_path = os.path.join(folder, 'temperature.csv')
+    metadata = {'grid': 'TestRoom_1', 'unit': 'C'}
+    with ThermalMapWriter(temp_path, (7, 24), np.float64, metadata) as writer:
+        writer.append(base_results[0][:3])
+    assert os.path.isfile(writer.info_path)
+    with ThermalMapWriter(temp_path, (7, 24), append=True) as writer:
+        assert writer.sensors_written == 3
+        assert writer.metadata == metadata
+        writer.append(base_results[0][3:])
+    array, info = load_thermal_map(temp_path)
+    assert info['sensors_written'] == 7
+    assert info['metadata'] == metadata
+    assert np.array_equal(array, base_results[0])
+
+    for workers, chunk_size in ((1, 2), (2, 3)):
+        names = ('temperature.csv', 'condition.csv', 'condition_intensity.csv')
+        writers = [ThermalMapWriter(os.path.join(folder, name), (7, 24), res.dtype)
+                   for name, res in zip(names, base_results)]
+        results = run_sensor_chunks(pmv_map_chunk, arrays, args, workers, chunk_size,
+                                    out=[writer.array for writer in writers])
+        for writer, res, base_res in zip(writers, results, base_results):
+            writer.sensors_written = 7
+            writer.close()
+            assert np.array_equal(res, base_res)
+            assert np.array_equal(load_thermal_map(writer.file_path)[0], base_res)
+    nukedir(folder, True)
+
+
+def test_physiologic_equivalent_temperature_np():
+    """Test the physiologic_equivalent_temperature_np function against the scalar."""
+    ta = np.array([-10., 5., 18., 24., 30., 36.])
+    tr = np.array([-15., 10., 20., 45., 30., 60.])
+    vel = np.array([3., 1.5, 0.1, 0.5, 1.0, 2.5])
+    rh = np.array([80., 60., 30., 50., 70., 20.])
+    clo = np.array([2.0, 1.2, 0.7, 0.5, 0.5, 0.3])
+    result = physiologic_equivalent_temperature_np(ta, tr, vel, rh, 2.4, clo)
+
+    for i in range(6):
+        s_result = physiologic_equivalent_temperature(
+            ta[i], tr[i], vel[i], rh[i], 2.4, clo[i])
+        for key in ('pet', 't_core', 't_skin', 't_clo'):
+            assert result[key][i] == pytest.approx(s_result[key], abs=0.05)
+
+    pet = np.array([-5., 6., 15., 20., 26., 33., 39., 45.])
+    assert pet_category_np(pet).tolist() == [pet_category(p) for p in pet]
+    assert pet_category_np(pet, True).tolist() == \
+        [pet_category_humid(p) for p in pet]
+
+
+def test_universal_thermal_climate_index_np_chunked():
+    """Test the chunked evaluation of the universal_thermal_climate_index_np function."""
+    ta = np.linspace(-30, 40, 70).reshape(7, 10)
+    tr = ta + np.linspace(-5, 30, 10)
+    rh = np.linspace(20, 90, 10)
+    utci = universal_thermal_climate_index_np(ta, tr, 2., rh)
+
+    utci_chunk = universal_thermal_climate_index_np(ta, tr, 2., rh, chunk_size=3)
+    assert utci_chunk.shape == (7, 10)
+    assert np.allclose(utci_chunk, utci, atol=1e-9)
+
+    out = np.zeros((7, 10), dtype=np.float32)
+    result = universal_thermal_climate_index_np(
+        ta, tr, 2., rh, chunk_size=2, dtype=np.float32, out=out)
+    assert result is out
+    assert np.allclose(out, utci, atol=0.02)
+
+
+def test_universal_thermal_climate_index_lut_np():
+    """Test the universal_thermal_climate_index_lut_np function."""
+    ta = np.array([-40., -10., 5., 18., 24., 30., 36., 60.])
+    tr = np.array([-45., -15., 10., 20., 45., 30., 60., 60.])
+    vel = np.array([12., 3., 1.5, 0.1, 0.5, 1.0, 2.5, 1.0])
+    rh = np.array([80., 80., 60., 30., 50., 70., 20., 10.])
+    utci = universal_thermal_climate_index_np(ta, tr, vel, rh)
+    utci_lut = universal_thermal_climate_index_lut_np(ta, tr, vel, rh)
+
+    assert utci_lut.shape == utci.shape
+    assert np.abs(utci_lut[:-1] - utci[:-1]).max() < 0.2
+    assert utci_lut[-1] == pytest.approx(utci[-1], abs=1e-6)  # outside of the grid
+
+    grid = ((-50, 50, 5), (-30, 70, 10), (0.5, 17, 2), (0, 5, 1))
+    axes, table = utci_lookup_table(grid)
+    assert table.shape == tuple(len(axis) for axis in axes) == (21, 11, 10, 6)
+    assert axes[2][-1] == 17
+
+
+def test_ill_file_to_array():
+    """Test the ill_file_to_array method with text, NumPy and binary files."""
+    with open(sun_up_path) as soh_f:
+        sun_indices = [int(float(h)) for h in soh_f]
+    irr = ill_file_to_array(total_ill_path, sun_indices)
+    assert irr.shape == (4, 8760)
+    assert irr.dtype == np.float32
+    values = np.loadtxt(total_ill_path, dtype=np.float32)
+    assert np.array_equal(irr[:, sun_indices], values)
+    assert irr.sum() == pytest.approx(values.sum(), rel=1e-5)
+
+    irr_rows = ill_file_to_array(total_ill_path, sun_indices, start_row=1, end_row=3)
+    assert np.array_equal(irr_rows, irr[1:3])
+
+    npy_path = './tests/map/TestRoom_1_ill.npy'
+    np.save(npy_path, values)
+    assert np.array_equal(ill_file_to_array(npy_path, sun_indices, start_row=2), irr[2:])
+    os.remove(npy_path)
+
+    bin_path = './tests/map/TestRoom_1_bin.ill'
+    with open(bin_path, 'wb') as outf:
+        header = '#?RADIANCE\nNROWS={}\nNCOLS={}\nNCOMP=1\nFORMAT=float\n\n'.format(
+            *values.shape)
+        outf.write(header.encode('utf-8'))
+        outf.write(values.tobytes())
+    irr_bin = ill_file_to_array(bin_path, sun_indices, end_row=2, dtype=np.float64)
+    assert irr_bin.dtype == np.float64
+    assert np.array_equal(irr_bin, irr[:2])
+    del irr_bin
+    os.remove(bin_path)